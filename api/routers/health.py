@@ -0,0 +1,42 @@
+# app/api/routers/health.py
+from fastapi import APIRouter, Request, status
+from fastapi.responses import JSONResponse
+from repositories.rag_repositories import job_poasting_rag_repository as rag
+from utils.count_cache import count_cache
+from utils import where_rules
+
+router = APIRouter(tags=["health"])
+
+# 생존 확인: 프로세스가 응답만 하면 200 (모델 로드 여부와 무관)
+@router.get("/healthz", summary="프로세스 생존 확인")
+async def healthz():
+    return {"status": "ok"}
+
+# 준비 확인: Mongo 초기화 + 인코더 워밍업 + 벡터 저장소 연결이 모두 끝나야 200, 아니면 503
+@router.get("/readyz", summary="트래픽 받을 준비가 됐는지 확인")
+async def readyz(request: Request):
+    checks = dict(request.app.state.readiness)
+    ready = all(checks.values())
+    body = {"ready": ready, "checks": checks}
+    lexical = getattr(request.app.state, "lexical_index", None)
+    if lexical is not None:
+        body["lexical_index"] = lexical.ready   # 준비 전에는 벡터 검색만 사용 (준비 판정에는 미포함)
+    return JSONResponse(body, status_code=status.HTTP_200_OK if ready else status.HTTP_503_SERVICE_UNAVAILABLE)
+
+# 내부 지표: 임베딩 배처(배치 크기/큐 깊이 히스토그램), 쿼리 임베딩 캐시, 재정렬, 목록 개수 캐시, 동기화 워커,
+#           where 추출(규칙으로 해결 vs LLM 폴백), where 캐시(적중률/single-flight)
+@router.get("/stats", summary="검색 파이프라인 내부 지표 (튜닝용)")
+async def stats(request: Request):
+    cache = rag.query_embedding_cache
+    body = {
+        "embedding_batcher": rag.embedding_batcher.stats() if rag.embedding_batcher else None,
+        "query_embedding_cache": {"hits": cache.hits, "misses": cache.misses, "bytes": cache.bytes},
+        "reranker": rag.reranker.stats() if rag.reranker else None,
+        "list_counts": count_cache.stats(),
+        "where_rules": where_rules.stats.snapshot(),
+        "where_cache": rag.where_cache.stats(),
+    }
+    worker = getattr(request.app.state, "job_sync_worker", None)
+    if worker is not None:
+        body["job_sync"] = worker.stats()
+    return body
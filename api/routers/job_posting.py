@@ -1,8 +1,9 @@
 # app/api/routers/job_posting.py
 from typing import List, Optional, Dict, Any
 from fastapi import APIRouter, HTTPException, Query, Depends, status
+from pydantic import ValidationError
 from services.job_posting import JobPostingService
-from schemas.job_posting import JobPostingResponse, JobPostingListResponse
+from schemas.job_posting import JobPostingResponse, JobPostingListResponse, JobPostingSummaryResponse
 from deps.auth import get_current_user_id, get_optional_user_id
 
 router = APIRouter(prefix="/job-postings", tags=["jobs"])
@@ -19,15 +20,26 @@ async def get_job_postings(
     q: Optional[str] = Query(None, description="사용자 쿼리(AI가 전처리하여 전달)"),
     offset: int = Query(0, ge=0, description="페이지네이션 시작점"),
     limit: int = Query(20, ge=1, le=100, description="한 번에 가져올 개수"),
+    cursor: Optional[str] = Query(None, description="검색 시 이전 응답의 next_cursor (주면 offset 대신 사용)"),
+    after: Optional[str] = Query(None, description="목록(q 없음) 무한 스크롤: 이전 응답의 next_after (주면 offset 대신 사용)"),
+    include_total: bool = Query(False, description="after로 조회할 때도 total 포함"),
     user_id: Optional[str] = Depends(get_optional_user_id),
 ):
-
-    return await svc.list(q=q, offset=offset, limit=limit, user_id=user_id)
+    try:
+        return await svc.list(
+            q=q, offset=offset, limit=limit, user_id=user_id, cursor=cursor,
+            after=after, include_total=include_total,
+        )
+    except ValidationError:
+        # ValueError의 하위 클래스지만 요청이 아니라 저장된 문서 변환(from_raw) 문제 → 500
+        raise
+    except ValueError as e:
+        raise HTTPException(status_code=status.HTTP_400_BAD_REQUEST, detail=str(e))
 
 # 맞춤 추천: 로그인 필요 (bookmarked 포함)
 @router.get(
     "/recommendations",
-    response_model=List[JobPostingResponse],
+    response_model=List[JobPostingSummaryResponse],
     response_model_exclude_none=True,
     summary="사용자 맞춤 채용 공고 추천"
 )
@@ -36,7 +48,12 @@ async def recommendations_job_postings(
     limit: int = Query(20, ge=1, le=100, description="한 번에 가져올 개수"),
     user_id: str = Depends(get_current_user_id),
 ):
-    return await svc.recommendations(user_id=user_id, offset=offset, limit=limit)
+    try:
+        return await svc.recommendations(user_id=user_id, offset=offset, limit=limit)
+    except ValidationError:
+        raise
+    except ValueError as e:
+        raise HTTPException(status_code=404, detail=str(e))
 
 # 북마크한 공고만 반환
 @router.get(
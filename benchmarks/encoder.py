@@ -0,0 +1,120 @@
+# benchmarks/encoder.py
+# 인코더 백엔드(torch / onnx / onnx-int8) 정확도 동등성 + 처리량/메모리 측정
+# - 동등성: 고정 쿼리 세트에서 torch 임베딩과의 코사인 (평균/최소). 기준 미달이면 종료 코드 1
+# - 지연: 배치 1 (검색 쿼리 1건) p50/p95, 처리량: 배치 32 texts/s
+# - 메모리: 백엔드마다 별도 프로세스에서 로드해 최대 RSS 비교
+#
+# 실행: python -m benchmarks.encoder [--backends torch,onnx,onnx-int8] [--repeat 50]
+import argparse
+import json
+import os
+import resource
+import statistics
+import subprocess
+import sys
+import tempfile
+import time
+
+import numpy as np
+
+# 최소 코사인 기준 (torch 대비)
+PARITY_MIN_COS = {"onnx": 0.999, "onnx-int8": 0.98}
+
+QUERIES = [
+    "강남 백엔드 개발자", "판교 프론트엔드 React 경력 3년", "Kotlin Spring 서버 개발", "데이터 분석가 신입",
+    "머신러닝 엔지니어 연봉 6000 이상", "서울 마케팅 인턴", "UI/UX 디자이너 포트폴리오", "iOS Swift 앱 개발",
+    "DevOps Kubernetes AWS", "보안 관제 엔지니어", "영상 편집자 프리미어", "물류 관리 주니어",
+    "인사 담당자 채용", "법무팀 변호사", "생산 관리 제조", "전략 기획 컨설턴트",
+    "고객 상담 CS 재택", "영업 관리 B2B", "성수동 스타트업 PM", "Python Django 백엔드 연봉 4000",
+    "대용량 트래픽 결제 시스템", "LLM 파인튜닝 연구원", "게임 클라이언트 Unity", "QA 테스트 자동화",
+]
+
+def _percentile(xs, q):
+    xs = sorted(xs)
+    return xs[min(len(xs) - 1, int(round(q * (len(xs) - 1))))]
+
+def _rss_mb() -> float:
+    kb = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss     # Linux: KB
+    return kb / 1024.0
+
+def run_backend(backend: str, repeat: int, out_path: str) -> None:
+    """(하위 프로세스, ENCODER_BACKEND=backend) RAG 모듈이 쓰는 인코더 그대로 쿼리 임베딩과 측정값을 저장"""
+    from repositories.rag_repositories.encoder import OnnxEncoder
+
+    t = time.perf_counter()
+    from repositories.rag_repositories import job_poasting_rag_repository as rag
+    enc = rag.get_model()
+    load_s = time.perf_counter() - t
+    if backend != "torch" and not isinstance(enc, OnnxEncoder):
+        json.dump({"backend": backend, "missing": True}, open(out_path + ".json", "w"))
+        return
+
+    vecs = np.asarray(enc.encode(QUERIES, batch_size=32), dtype=np.float32)
+    for q in QUERIES[:5]:
+        enc.encode([q])                                             # 워밍업
+
+    lat = []
+    for i in range(repeat):
+        q = QUERIES[i % len(QUERIES)]
+        t = time.perf_counter()
+        enc.encode([q])
+        lat.append(time.perf_counter() - t)
+
+    texts = QUERIES * 8
+    t = time.perf_counter()
+    enc.encode(texts, batch_size=32)
+    tput = len(texts) / (time.perf_counter() - t)
+
+    np.save(out_path + ".npy", vecs)
+    json.dump({
+        "backend": backend,
+        "load_s": load_s,
+        "p50_ms": statistics.median(lat) * 1000,
+        "p95_ms": _percentile(lat, 0.95) * 1000,
+        "batch32_texts_per_s": tput,
+        "rss_mb": _rss_mb(),
+    }, open(out_path + ".json", "w"))
+
+def _cos(a: np.ndarray, b: np.ndarray) -> np.ndarray:
+    a = a / np.linalg.norm(a, axis=1, keepdims=True)
+    b = b / np.linalg.norm(b, axis=1, keepdims=True)
+    return (a * b).sum(axis=1)
+
+def main(backends, repeat: int) -> int:
+    tmp = tempfile.mkdtemp(prefix="encoder-bench-")
+    results = {}
+    for b in ["torch"] + [x for x in backends if x != "torch"]:
+        out = os.path.join(tmp, b)
+        subprocess.run([sys.executable, "-m", "benchmarks.encoder", "--_run", b, "--_out", out,
+                        "--repeat", str(repeat)], check=True, env={**os.environ, "ENCODER_BACKEND": b})
+        results[b] = json.load(open(out + ".json"))
+        if not results[b].get("missing"):
+            results[b]["vecs"] = np.load(out + ".npy")
+
+    ref = results["torch"]
+    ok = True
+    print(f"{'backend':<10} {'p50 ms':>7} {'p95 ms':>7} {'speedup':>8} {'b32/s':>7} {'RSS MB':>7} {'cos mean':>9} {'cos min':>8}")
+    for b, r in results.items():
+        if r.get("missing"):
+            print(f"{b:<10} (내보낸 모델 없음: python -m repositories.rag_repositories.encoder export --int8)")
+            continue
+        cos = _cos(ref["vecs"], r["vecs"])
+        speedup = ref["p50_ms"] / r["p50_ms"]
+        print(f"{b:<10} {r['p50_ms']:>7.2f} {r['p95_ms']:>7.2f} {speedup:>7.2f}x {r['batch32_texts_per_s']:>7.0f} "
+              f"{r['rss_mb']:>7.0f} {cos.mean():>9.5f} {cos.min():>8.5f}")
+        if b in PARITY_MIN_COS and cos.min() < PARITY_MIN_COS[b]:
+            print(f"  !! {b}: 최소 코사인 {cos.min():.5f} < 기준 {PARITY_MIN_COS[b]}")
+            ok = False
+    return 0 if ok else 1
+
+if __name__ == "__main__":
+    ap = argparse.ArgumentParser()
+    ap.add_argument("--backends", default="torch,onnx,onnx-int8")
+    ap.add_argument("--repeat", type=int, default=50)
+    ap.add_argument("--_run")
+    ap.add_argument("--_out")
+    args = ap.parse_args()
+    if args._run:
+        run_backend(args._run, args.repeat, args._out)
+    else:
+        sys.exit(main(args.backends.split(","), args.repeat))
@@ -0,0 +1,337 @@
+# benchmarks/job_search.py
+# 채용 공고 목록/검색 벤치마크: JobPostingService.list의 지연(p50/p95/p99)과 QPS
+# - 합성 공고 N건을 벤치마크 전용 DB에 넣고 JobPostingIndexer로 로컬 벡터 저장소(VECTOR_BACKEND=local)에 색인
+# - Gemini는 결정적인 가짜 응답으로 대체 (--llm-ms로 지연만 흉내), 인코더는 실제 모델(ENCODER_BACKEND)
+# - 코퍼스 크기 × (q 없음: offset / after(keyset) , q 있음) × 페이지 깊이 × 캐시(cold: 요청마다 검색 캐시 비움 / warm)
+# - 결과는 JSON으로 저장, --compare로 이전 커밋 결과와 비교 (p95 또는 QPS가 허용치 넘게 나빠지면 종료 코드 1)
+# - 크기마다 깊은 페이지 점검: 검색어별로 total 끝 근처 offset을 cold로 요청해 빈 페이지가 나오면 종료 코드 1
+#
+# 실행: python -m benchmarks.job_search [--sizes 1000,5000,20000] [--pages 0,4,19] [--mongo real|mock]
+#        [--requests 200] [--concurrency 8] [--out job_search.json] [--compare 이전.json]
+# --mongo real(기본): MONGO_URI의 BENCH_DB(기본 job_search_bench) 사용 후 삭제 (--keep이면 유지)
+# --mongo mock: mongomock-motor(별도 설치)로 프로세스 내 실행 (Mongo 쿼리 비용은 실제와 다름)
+import argparse
+import asyncio
+import json
+import os
+import platform
+import random
+import shutil
+import statistics
+import subprocess
+import sys
+import tempfile
+import time
+from datetime import datetime, timedelta, timezone
+
+# 레포 모듈 import 전에 로컬 벡터 저장소/임시 스냅샷 경로로 고정
+_SNAPSHOT_DIR = tempfile.mkdtemp(prefix="job-search-bench-")
+os.environ["VECTOR_BACKEND"] = "local"
+os.environ["VECTOR_SNAPSHOT_PATH"] = _SNAPSHOT_DIR
+os.environ["JOB_SYNC_MODE"] = "off"
+
+import numpy as np  # noqa: E402
+
+from database import DOCUMENT_MODELS, init_db  # noqa: E402
+from models.job_posting_document import JobPostingDocument  # noqa: E402
+from repositories.rag_repositories import job_poasting_rag_repository as rag  # noqa: E402
+from repositories.rag_repositories import vector_store  # noqa: E402
+from services.job_posting import JobPostingService  # noqa: E402
+from services.job_posting_indexer import JobPostingIndexer, build_lexical_index  # noqa: E402
+from settings import MONGO_URI, SEARCH_HYBRID, ENCODER_BACKEND  # noqa: E402
+from utils import where_minimal  # noqa: E402
+from utils.where_minimal import BUCKET_SET  # noqa: E402
+from utils.where_rules import BUCKET_LEXICON, DISTRICTS_BY_LOCATION  # noqa: E402
+
+BENCH_DB = os.getenv("BENCH_DB", "job_search_bench")
+SEED = 20240601
+
+QUERIES = [
+    "강남 백엔드 개발자", "판교 프론트엔드 React", "데이터 분석가 신입", "연봉 5000 이상 서버 개발",
+    "재택 가능한 디자인 일", "스타트업 마케팅 담당", "AI 연구 인턴", "보안 관제 엔지니어",
+    "물류 관리 주니어", "영상 편집 프리랜서", "성수동 PM", "Kotlin Spring 결제 시스템",
+]
+
+# ===== 합성 공고 =====
+_JOBS = {
+    "backend": ("개발", ["백엔드 개발자", "서버 개발자"], ["Java", "Kotlin", "Spring", "Python", "Django", "Go"]),
+    "frontend": ("개발", ["프론트엔드 개발자", "웹 퍼블리셔"], ["React", "TypeScript", "Vue", "Next.js"]),
+    "data": ("개발", ["데이터 분석가", "데이터 엔지니어"], ["SQL", "Python", "Spark", "Airflow"]),
+    "ai_ml": ("개발", ["머신러닝 엔지니어", "AI 연구원"], ["PyTorch", "LLM", "MLOps"]),
+    "security": ("개발", ["보안 엔지니어", "보안 관제"], ["SIEM", "ISMS", "침해대응"]),
+    "design": ("디자인", ["UI/UX 디자이너", "그래픽 디자이너"], ["Figma", "Photoshop"]),
+    "product": ("기획", ["PM", "서비스 기획자"], ["Jira", "데이터 분석"]),
+    "marketing": ("마케팅", ["퍼포먼스 마케터", "콘텐츠 마케터"], ["GA4", "SNS"]),
+    "sales": ("영업", ["B2B 영업", "영업 관리"], ["CRM"]),
+    "cs": ("고객지원", ["CS 상담원"], ["Zendesk"]),
+    "hr": ("인사", ["인사 담당자", "채용 담당자"], ["HRIS"]),
+    "legal": ("법무", ["사내 변호사", "법무 담당"], ["계약 검토"]),
+    "logistics": ("물류", ["물류 관리자", "SCM 담당"], ["WMS"]),
+    "manufacturing": ("생산", ["생산 관리", "품질 관리"], ["MES"]),
+    "strategy_exec": ("경영", ["전략 기획", "경영 지원"], ["Excel"]),
+    "video_editing": ("미디어", ["영상 편집자", "모션 그래픽"], ["Premiere", "After Effects"]),
+}
+assert set(_JOBS) <= BUCKET_SET
+
+def _salary_label(man: int) -> str:
+    floor = man // 200 * 200
+    return f"{floor:,}만~{floor + 200:,}만"
+
+def make_posting(i: int, rng: random.Random, now: datetime) -> dict:
+    bucket = rng.choice(sorted(_JOBS))
+    group, jobs, skills = _JOBS[bucket]
+    job = rng.choice(jobs)
+    location = rng.choice(sorted(DISTRICTS_BY_LOCATION))
+    district = rng.choice(DISTRICTS_BY_LOCATION[location])
+    years = rng.randint(0, 10)
+    tags = rng.sample(skills, k=min(len(skills), rng.randint(1, 3)))
+    salary = rng.randrange(3000, 9000, 100)
+    r = rng.random()
+    status = "closed" if r < 0.05 else "inactive" if r < 0.08 else "active"
+    due = None if rng.random() < 0.3 else now + timedelta(days=rng.randint(-30, 60))
+    return {
+        "metadata": {"source": "bench", "sourceUrl": f"https://example.com/jobs/{i}", "crawledAt": now},
+        "company": {
+            "name": f"회사{i % 5000:04d}",
+            "address": {"country": "한국", "location": location, "district": district,
+                        "full_location": f"{location} {district}"},
+            "features": [],
+            "avgSalary": salary,
+        },
+        "detail": {
+            "position": {"jobGroup": group, "job": [job]},
+            "intro": f"{location} {district}에 있는 {group} 조직에서 {job}를 채용합니다.",
+            "main_tasks": f"{', '.join(tags)} 기반 {job} 업무, 서비스 운영 및 개선, 협업 부서와의 커뮤니케이션",
+            "requirements": f"{job} 경력 {years}년 이상 또는 그에 준하는 역량, {tags[0]} 실무 경험",
+            "preferred_points": "대규모 서비스 경험, 문서화와 코드 리뷰 문화에 익숙한 분",
+            "benefits": rng.choice(["재택 근무 가능", "유연 근무, 식대 지원", "스톡옵션, 교육비 지원"]),
+        },
+        "due_time": due,
+        "skill_tags": tags,
+        "status": status,
+        "bucket": bucket,
+        "salary_bucket_2m_label": _salary_label(salary),
+    }
+
+# ===== 가짜 Gemini =====
+class FakeGemini:
+    """프롬프트 끝의 '사용자 문장'에서 직군 키워드만 보고 결정적으로 JSON을 돌려줌"""
+
+    def __init__(self, latency_ms: float = 0.0):
+        self.latency = latency_ms / 1000.0
+        self.calls = 0
+
+    async def __call__(self, prompt: str, *args, **kwargs) -> str:
+        self.calls += 1
+        if self.latency:
+            await asyncio.sleep(self.latency)
+        query = prompt.rsplit("사용자 문장:", 1)[-1].strip().lower()
+        buckets = sorted({b for w, bs in BUCKET_LEXICON.items() if w in query for b in bs})
+        obj = {"bucket": buckets[0]} if len(buckets) == 1 else {"buckets": buckets} if buckets else {}
+        return json.dumps(obj, ensure_ascii=False)
+
+# ===== 측정 =====
+def _pct(xs, q):
+    xs = sorted(xs)
+    return xs[min(len(xs) - 1, int(round(q * (len(xs) - 1))))]
+
+async def measure(svc: JobPostingService, *, q_kind: str, offset: int, limit: int, cache: str,
+                  requests: int, concurrency: int) -> dict:
+    lat = []
+    slots = asyncio.Semaphore(concurrency)
+    errors = 0
+    after = None
+    if q_kind == "after" and offset:
+        # 해당 깊이의 after 값은 next_after를 따라가서 구함 (측정 제외)
+        res = await svc.list(q=None, offset=0, limit=limit)
+        for _ in range(offset // limit - 1):
+            res = await svc.list(q=None, offset=0, limit=limit, after=res.next_after)
+        after = res.next_after
+
+    async def one(i: int):
+        nonlocal errors
+        q = QUERIES[i % len(QUERIES)] if q_kind == "search" else None
+        async with slots:
+            if cache == "cold":
+                rag.clear_search_caches()
+            t = time.perf_counter()
+            try:
+                if q_kind == "after":
+                    await svc.list(q=None, offset=0, limit=limit, after=after)
+                else:
+                    await svc.list(q=q, offset=offset, limit=limit)
+            except Exception:
+                errors += 1
+                return
+            lat.append(time.perf_counter() - t)
+
+    if cache == "warm" and q_kind == "search":
+        for q in QUERIES:                          # 캐시 채우기 (측정 제외)
+            await svc.list(q=q, offset=offset, limit=limit)
+    started = time.perf_counter()
+    await asyncio.gather(*[one(i) for i in range(requests)])
+    wall = time.perf_counter() - started
+    ms = [x * 1000 for x in lat] or [float("nan")]
+    return {
+        "requests": requests,
+        "errors": errors,
+        "p50_ms": round(statistics.median(ms), 3),
+        "p95_ms": round(_pct(ms, 0.95), 3),
+        "p99_ms": round(_pct(ms, 0.99), 3),
+        "qps": round(len(lat) / wall, 2) if wall else 0.0,
+    }
+
+async def check_deep_paging(svc: JobPostingService, *, limit: int) -> list:
+    """검색어마다 total 끝 근처(마지막 페이지)와 중간 offset을 cold로 요청 → 받은 개수가 min(limit, total - offset)인지"""
+    failures = []
+    for q in QUERIES:
+        rag.clear_search_caches()
+        total = (await svc.list(q=q, offset=0, limit=limit)).total
+        for offset in sorted({total // 2, max(0, total - limit)}):
+            rag.clear_search_caches()
+            got = len((await svc.list(q=q, offset=offset, limit=limit)).items)
+            want = min(limit, max(0, total - offset))
+            if got != want:
+                failures.append({"q": q, "offset": offset, "total": total, "items": got, "expected": want})
+    rag.clear_search_caches()
+    return failures
+
+async def grow_corpus(current: int, size: int, rng: random.Random, now: datetime) -> dict:
+    """코퍼스를 size건으로 늘리고 (증분) 색인 → 색인 리포트"""
+    coll = JobPostingDocument.get_pymongo_collection()
+    t = time.perf_counter()
+    for s in range(current, size, 5000):
+        await coll.insert_many([make_posting(i, rng, now) for i in range(s, min(size, s + 5000))])
+    insert_s = time.perf_counter() - t
+    store = await vector_store.get_vector_store()
+    report = await JobPostingIndexer(store).run()
+    if SEARCH_HYBRID:
+        await build_lexical_index()
+    rag.clear_search_caches()
+    return {"insert_s": round(insert_s, 2), "index_s": round(report.seconds, 2), "chunks": report.chunks}
+
+async def run(args) -> dict:
+    if args.mongo == "mock":
+        # mongomock은 UUID codec 옵션을 지원하지 않아 init_db 대신 Beanie만 바로 초기화
+        from beanie import init_beanie
+        from mongomock_motor import AsyncMongoMockClient
+        client = AsyncMongoMockClient()
+        await init_beanie(database=client[BENCH_DB], document_models=DOCUMENT_MODELS)
+    else:
+        import motor.motor_asyncio
+        client = motor.motor_asyncio.AsyncIOMotorClient(MONGO_URI)
+        await client.drop_database(BENCH_DB)
+        await init_db(client, db_name=BENCH_DB, index_mode="sync")
+
+    fake = FakeGemini(args.llm_ms)
+    where_minimal.get_gemini_response_async = fake
+    svc = JobPostingService()
+
+    t = time.perf_counter()
+    await asyncio.to_thread(rag.warm_up)
+    load_s = time.perf_counter() - t
+
+    rng = random.Random(SEED)
+    now = datetime.now(timezone.utc)
+    results, corpus, current = [], [], 0
+    try:
+        for size in sorted(args.sizes):
+            info = await grow_corpus(current, size, rng, now)
+            current = size
+            print(f"# size={size} {info}", file=sys.stderr)
+            info["deep_paging_failures"] = await check_deep_paging(svc, limit=args.limit)
+            corpus.append({"size": size, **info})
+            for f in info["deep_paging_failures"]:
+                print(f"!! deep page {f}", file=sys.stderr)
+            for q_kind in ("recent", "after", "search"):
+                for page in args.pages:
+                    for cache in (("cold", "warm") if q_kind == "search" else ("cold",)):
+                        llm_before = fake.calls
+                        row = {"size": size, "q": q_kind, "page": page, "cache": cache, "limit": args.limit,
+                               "concurrency": args.concurrency}
+                        row.update(await measure(svc, q_kind=q_kind, offset=page * args.limit, limit=args.limit,
+                                                 cache=cache, requests=args.requests,
+                                                 concurrency=args.concurrency))
+                        row["llm_calls"] = fake.calls - llm_before
+                        results.append(row)
+                        print(f"{size:>7} {q_kind:<6} page={page:<3} {cache:<4} p50={row['p50_ms']:>8.2f} "
+                              f"p95={row['p95_ms']:>8.2f} p99={row['p99_ms']:>8.2f} qps={row['qps']:>8.1f}",
+                              file=sys.stderr)
+    finally:
+        if args.mongo == "real" and not args.keep:
+            await client.drop_database(BENCH_DB)
+        client.close()
+
+    return {
+        "meta": {
+            "commit": _git_commit(),
+            "date": now.isoformat(),
+            "python": platform.python_version(),
+            "numpy": np.__version__,
+            "encoder_backend": ENCODER_BACKEND,
+            "search_hybrid": SEARCH_HYBRID,
+            "mongo": args.mongo,
+            "llm_ms": args.llm_ms,
+            "model_load_s": round(load_s, 2),
+        },
+        "corpus": corpus,
+        "results": results,
+    }
+
+def _git_commit():
+    try:
+        repo = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+        return subprocess.run(["git", "rev-parse", "--short", "HEAD"], capture_output=True, text=True,
+                              check=True, cwd=repo).stdout.strip()
+    except Exception:
+        return None
+
+def compare(base: dict, cur: dict, tolerance: float) -> int:
+    """같은 (size, q, page, cache) 행끼리 p95/QPS 비교. 허용치 넘게 나빠진 행이 있으면 1"""
+    key = lambda r: (r["size"], r["q"], r["page"], r["cache"])
+    old = {key(r): r for r in base["results"]}
+    bad = 0
+    print(f"\n{base['meta'].get('commit')} -> {cur['meta'].get('commit')}")
+    print(f"   {'size':>7} {'q':<6} {'page':>4} {'cache':<5} {'p95 old':>9} {'p95 new':>9} {'qps old':>8} {'qps new':>8}")
+    for r in cur["results"]:
+        o = old.get(key(r))
+        if o is None:
+            continue
+        worse = r["p95_ms"] > o["p95_ms"] * (1 + tolerance) or r["qps"] < o["qps"] * (1 - tolerance)
+        bad += worse
+        print(f"{'!!' if worse else '  '} {r['size']:>7} {r['q']:<6} {r['page']:>4} {r['cache']:<5} "
+              f"{o['p95_ms']:>9.2f} {r['p95_ms']:>9.2f} {o['qps']:>8.1f} {r['qps']:>8.1f}")
+    return 1 if bad else 0
+
+def main() -> int:
+    ap = argparse.ArgumentParser()
+    ap.add_argument("--sizes", default="1000,5000,20000")
+    ap.add_argument("--pages", default="0,4,19", help="페이지 번호 목록 (offset = page × limit)")
+    ap.add_argument("--limit", type=int, default=20)
+    ap.add_argument("--requests", type=int, default=200, help="행(시나리오)마다 요청 수")
+    ap.add_argument("--concurrency", type=int, default=8)
+    ap.add_argument("--llm-ms", type=float, default=0.0, help="가짜 Gemini 응답 지연")
+    ap.add_argument("--mongo", choices=("real", "mock"), default="real")
+    ap.add_argument("--keep", action="store_true", help="--mongo real일 때 벤치마크 DB 유지")
+    ap.add_argument("--out", default="job_search.json")
+    ap.add_argument("--compare", help="이전 결과 JSON")
+    ap.add_argument("--tolerance", type=float, default=0.2, help="--compare 허용 악화 비율")
+    args = ap.parse_args()
+    args.sizes = [int(x) for x in args.sizes.split(",")]
+    args.pages = [int(x) for x in args.pages.split(",")]
+
+    try:
+        out = asyncio.run(run(args))
+    finally:
+        shutil.rmtree(_SNAPSHOT_DIR, ignore_errors=True)
+    with open(args.out, "w", encoding="utf-8") as f:
+        json.dump(out, f, ensure_ascii=False, indent=2)
+    print(f"saved -> {args.out}", file=sys.stderr)
+    paging_failed = any(c["deep_paging_failures"] for c in out["corpus"])
+    if args.compare:
+        with open(args.compare, encoding="utf-8") as f:
+            return compare(json.load(f), out, args.tolerance) or int(paging_failed)
+    return int(paging_failed)
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,218 @@
+# benchmarks/read_path.py
+# 목록 읽기 경로의 문서당 CPU 비용: Beanie 모델 검증 → 응답 스키마 재검증 vs Motor raw dict → 응답 스키마 한 번 검증
+# - 100건 페이지를 Mongo에서 한 번 읽어 BSON으로 보관한 뒤, 디코드 → 응답 객체 생성 → FastAPI 응답 직렬화
+#   (response_model 검증, exclude_none)까지를 반복 측정 (네트워크/Mongo 쿼리 비용은 제외)
+# - 경로
+#   jobs/beanie-full    : 전체 JobPostingDocument → JobPostingResponse.from_doc (요약 projection 이전)
+#   jobs/beanie-summary : JobPostingSummary projection 모델 → 응답 스키마 재검증
+#   jobs/raw            : projection raw dict → JobPostingSummaryResponse.from_raw (현재 리포지토리 경로)
+#   cover/beanie        : CoverLetterDocument → CoverLetterResponse.from_doc
+#   cover/raw           : projection raw dict → CoverLetterResponse.from_raw (현재 리포지토리 경로)
+# - 동등성: raw 경로의 응답 JSON이 Beanie 경로와 다르면 종료 코드 1
+#
+# 실행: python -m benchmarks.read_path [--page 100] [--repeat 50] [--body-chars 1500] [--mongo real|mock] [--out read_path.json]
+# --mongo real(기본): MONGO_URI의 BENCH_DB(기본 read_path_bench) 사용 후 삭제
+# --mongo mock: mongomock-motor(별도 설치)로 프로세스 내 실행
+import argparse
+import asyncio
+import json
+import os
+import random
+import statistics
+import sys
+import time
+from datetime import datetime, timedelta, timezone
+from typing import List
+from uuid import uuid4
+
+import bson
+from bson.binary import Binary
+from bson.codec_options import CodecOptions, UuidRepresentation
+from beanie.odm.utils.parsing import parse_obj
+from fastapi.routing import serialize_response
+from fastapi.utils import create_model_field
+
+from database import DOCUMENT_MODELS, init_db
+from models.cover_letter_document import CoverLetterDocument
+from models.job_posting_document import JobPostingDocument, JobPostingSummary
+from repositories.mongo_repositories.cover_letter_mongodb_repository import LIST_PROJECTION
+from repositories.mongo_repositories.job_posting_mongodb_repository import SUMMARY_PROJECTION
+from schemas.cover_letter import CoverLetterResponse
+from schemas.job_posting import JobPostingResponse, JobPostingSummaryResponse
+from settings import MONGO_URI
+
+BENCH_DB = os.getenv("BENCH_DB", "read_path_bench")
+BENCH_USER = "bench-user"
+CODEC = CodecOptions(uuid_representation=UuidRepresentation.STANDARD)
+
+_LOCATIONS = [("서울", "강남구"), ("경기", "성남시"), ("부산", "해운대구"), ("대전", "유성구")]
+_POSITIONS = [("개발", "백엔드 개발자", ["Python", "Kafka"]), ("디자인", "UI/UX 디자이너", ["Figma"]),
+              ("데이터", "데이터 분석가", ["SQL", "Tableau"]), ("마케팅", "퍼포먼스 마케터", ["GA4"])]
+
+def _text(rng: random.Random, n: int) -> str:
+    words = ["서비스", "운영", "개선", "협업", "데이터", "고객", "설계", "개발", "경험", "우대", "플랫폼", "문서화"]
+    out, size = [], 0
+    while size < n:
+        w = rng.choice(words)
+        out.append(w)
+        size += len(w) + 1
+    return " ".join(out)
+
+def make_posting(i: int, rng: random.Random, now: datetime, body_chars: int) -> dict:
+    location, district = rng.choice(_LOCATIONS)
+    group, job, tags = rng.choice(_POSITIONS)
+    return {
+        "metadata": {"source": "bench", "sourceUrl": f"https://example.com/jobs/{i}", "crawledAt": now},
+        "company": {
+            "name": f"회사{i:04d}", "logo_img": f"https://example.com/logo/{i}.png",
+            "address": {"country": "한국", "location": location, "district": district,
+                        "full_location": f"{location} {district}"},
+            "features": ["재택", "유연근무"], "avgSalary": rng.randrange(3000, 9000, 100),
+        },
+        "detail": {
+            "position": {"jobGroup": group, "job": [job]},
+            "intro": _text(rng, body_chars), "main_tasks": _text(rng, body_chars),
+            "requirements": _text(rng, body_chars), "preferred_points": _text(rng, body_chars // 2),
+            "benefits": _text(rng, body_chars // 2), "hire_rounds": "서류 → 면접 → 처우 협의",
+        },
+        "due_time": now + timedelta(days=rng.randint(1, 60)),
+        "externalUrl": f"https://example.com/apply/{i}",
+        "skill_tags": tags,
+        "sourceData": _text(rng, body_chars * 3),
+        "status": "active",
+        "title_images": [f"https://example.com/img/{i}/{k}.png" for k in range(3)],
+        "bucket": group,
+        "salary_bucket_2m_label": "4,000만~4,200만",
+    }
+
+def make_cover_letter(i: int, rng: random.Random, now: datetime, body_chars: int) -> dict:
+    return {
+        "user_id": BENCH_USER, "title": f"자기소개서 {i}", "type": "job_posting", "job_posting_id": None,
+        "strength": ["협업", "문제 해결"], "weakness": ["발표"],
+        # UUID는 STANDARD 표현으로 직접 인코딩 (mongomock은 클라이언트 UUID codec 옵션 미지원)
+        "qnas": [{"id": Binary.from_uuid(uuid4()), "question": f"문항 {k}", "answer": _text(rng, body_chars),
+                  "created_at": now, "updated_at": now} for k in range(3)],
+        "created_at": now, "updated_at": now - timedelta(minutes=i),
+    }
+
+# ===== 경로별 변환 =====
+def _jobs_beanie_full(raw):
+    return JobPostingResponse.from_doc(parse_obj(JobPostingDocument, raw))
+
+def _jobs_beanie_summary(raw):
+    doc = parse_obj(JobPostingSummary, raw)
+    return JobPostingSummaryResponse(**{**doc.model_dump(), "id": str(doc.id)})
+
+def _cover_beanie(raw):
+    return CoverLetterResponse.from_doc(parse_obj(CoverLetterDocument, raw))
+
+async def _measure(blobs: List[bytes], build, field, repeat: int):
+    """디코드 / 생성 / 응답 직렬화 각각의 문서당 µs (repeat회 중 중앙값)"""
+    decode, construct, respond = [], [], []
+    out = None
+    for _ in range(repeat):
+        t0 = time.perf_counter()
+        raws = [bson.decode(b, codec_options=CODEC) for b in blobs]
+        t1 = time.perf_counter()
+        items = [build(r) for r in raws]
+        t2 = time.perf_counter()
+        out = await serialize_response(field=field, response_content=items, exclude_none=True)
+        t3 = time.perf_counter()
+        decode.append(t1 - t0)
+        construct.append(t2 - t1)
+        respond.append(t3 - t2)
+    per_doc = lambda xs: statistics.median(xs) / len(blobs) * 1e6
+    return {
+        "decode_us": per_doc(decode), "build_us": per_doc(construct), "response_us": per_doc(respond),
+        "total_us": per_doc([a + b + c for a, b, c in zip(decode, construct, respond)]),
+    }, out
+
+async def _page(coll, query, projection, sort, n):
+    docs = await coll.find(query, projection).sort(sort).limit(n).to_list(length=None)
+    return [bson.encode(d, codec_options=CODEC) for d in docs]
+
+async def run(page: int, repeat: int, body_chars: int, mongo: str) -> dict:
+    if mongo == "mock":
+        # mongomock은 UUID codec 옵션을 지원하지 않아 init_db 대신 Beanie만 바로 초기화
+        from beanie import init_beanie
+        from mongomock_motor import AsyncMongoMockClient
+        client = AsyncMongoMockClient()
+        await init_beanie(database=client[BENCH_DB], document_models=DOCUMENT_MODELS, skip_indexes=True)
+    else:
+        from motor.motor_asyncio import AsyncIOMotorClient
+        client = AsyncIOMotorClient(MONGO_URI)
+        await init_db(client, db_name=BENCH_DB, index_mode="sync")
+
+    try:
+        rng = random.Random(0)
+        now = datetime.now(timezone.utc).replace(microsecond=0)
+        jobs = JobPostingDocument.get_pymongo_collection()
+        letters = CoverLetterDocument.get_pymongo_collection()
+        await jobs.delete_many({})
+        await letters.delete_many({})
+        await jobs.insert_many([make_posting(i, rng, now, body_chars) for i in range(page)])
+        await letters.insert_many([make_cover_letter(i, rng, now, body_chars) for i in range(page)])
+
+        live = {"status": "active"}
+        full = await _page(jobs, live, None, [("_id", -1)], page)
+        summary = await _page(jobs, live, SUMMARY_PROJECTION, [("_id", -1)], page)
+        cover_full = await _page(letters, {"user_id": BENCH_USER}, None, [("updated_at", -1), ("_id", -1)], page)
+        cover_proj = await _page(letters, {"user_id": BENCH_USER}, LIST_PROJECTION,
+                                 [("updated_at", -1), ("_id", -1)], page)
+
+        f_full = create_model_field(name="Response", type_=List[JobPostingResponse], mode="serialization")
+        f_summary = create_model_field(name="Response", type_=List[JobPostingSummaryResponse], mode="serialization")
+        f_cover = create_model_field(name="Response", type_=List[CoverLetterResponse], mode="serialization")
+
+        scenarios = [
+            ("jobs/beanie-full", full, _jobs_beanie_full, f_full),
+            ("jobs/beanie-summary", summary, _jobs_beanie_summary, f_summary),
+            ("jobs/raw", summary, JobPostingSummaryResponse.from_raw, f_summary),
+            ("cover/beanie", cover_full, _cover_beanie, f_cover),
+            ("cover/raw", cover_proj, CoverLetterResponse.from_raw, f_cover),
+        ]
+        results, outputs = {}, {}
+        for name, blobs, build, field in scenarios:
+            await _measure(blobs, build, field, 3)                  # 워밍업
+            results[name], outputs[name] = await _measure(blobs, build, field, repeat)
+            results[name]["bson_bytes_per_doc"] = sum(map(len, blobs)) / len(blobs)
+
+        parity = {
+            "jobs": json.dumps(outputs["jobs/raw"], default=str) == json.dumps(outputs["jobs/beanie-summary"], default=str),
+            "cover": json.dumps(outputs["cover/raw"], default=str) == json.dumps(outputs["cover/beanie"], default=str),
+        }
+        return {"page": page, "repeat": repeat, "body_chars": body_chars, "mongo": mongo,
+                "results": results, "parity": parity}
+    finally:
+        if mongo != "mock":
+            await client.drop_database(BENCH_DB)
+        client.close()
+
+def report(r: dict) -> None:
+    print(f"page={r['page']} repeat={r['repeat']} body_chars={r['body_chars']} mongo={r['mongo']}  (µs/doc)")
+    print(f"{'path':<20} {'BSON B':>8} {'decode':>8} {'build':>8} {'response':>9} {'total':>8}")
+    for name, m in r["results"].items():
+        print(f"{name:<20} {m['bson_bytes_per_doc']:>8.0f} {m['decode_us']:>8.1f} {m['build_us']:>8.1f} "
+              f"{m['response_us']:>9.1f} {m['total_us']:>8.1f}")
+    res = r["results"]
+    print(f"jobs:  raw vs beanie-full {res['jobs/beanie-full']['total_us'] / res['jobs/raw']['total_us']:.1f}x, "
+          f"vs beanie-summary {res['jobs/beanie-summary']['total_us'] / res['jobs/raw']['total_us']:.1f}x")
+    print(f"cover: raw vs beanie {res['cover/beanie']['total_us'] / res['cover/raw']['total_us']:.1f}x")
+    for k, ok in r["parity"].items():
+        if not ok:
+            print(f"  !! {k}: raw 경로 응답이 Beanie 경로와 다름")
+
+if __name__ == "__main__":
+    ap = argparse.ArgumentParser()
+    ap.add_argument("--page", type=int, default=100)
+    ap.add_argument("--repeat", type=int, default=50)
+    ap.add_argument("--body-chars", type=int, default=1500)
+    ap.add_argument("--mongo", choices=["real", "mock"], default="real")
+    ap.add_argument("--out")
+    args = ap.parse_args()
+    result = asyncio.run(run(args.page, args.repeat, args.body_chars, args.mongo))
+    report(result)
+    if args.out:
+        with open(args.out, "w") as f:
+            json.dump(result, f, ensure_ascii=False, indent=2)
+    sys.exit(0 if all(result["parity"].values()) else 1)
@@ -0,0 +1,63 @@
+# benchmarks/rerank.py
+# 크로스 인코더 재정렬 지연 측정: 후보 수(N)별 배치 forward 1회 비용과 점수 캐시 적중 시 비용
+#
+# 실행: python -m benchmarks.rerank [모델명] [--n 10,20,30,50,100] [--repeat 5]
+# (모델명 생략 시 RERANK_MODEL, 그것도 없으면 cross-encoder/mmarco-mMiniLMv2-L12-H384-v1)
+import argparse
+import asyncio
+import statistics
+import time
+
+from repositories.rag_repositories.reranker import CrossEncoderReranker
+from settings import RERANK_MODEL
+
+DEFAULT_MODEL = "cross-encoder/mmarco-mMiniLMv2-L12-H384-v1"
+
+QUERIES = ["강남 백엔드 개발자 연봉 5000 이상", "Kotlin Spring 서버 개발", "데이터 분석 신입", "프론트엔드 React 판교"]
+
+# 인덱서 청크와 비슷한 길이(~1000자)의 합성 본문
+_BODY = (
+    "[회사{i}] 개발 백엔드 개발자\n"
+    "주요 업무: 대용량 트래픽 API 서버 설계 및 개발, 결제/정산 시스템 운영, 데이터 파이프라인 구축\n"
+    "자격 요건: Java/Kotlin 또는 Python 기반 서버 개발 경력 {y}년 이상, RDBMS와 캐시 설계 경험\n"
+    "우대 사항: Kubernetes 운영 경험, 메시지 큐(Kafka) 사용 경험, 오픈소스 기여\n"
+    "혜택 및 복지: 유연 근무, 식대 지원, 장비 지원, 교육비 지원\n"
+) * 3
+
+def _passages(n: int, salt: str):
+    return [(f"{salt}-{i}", "h", _BODY.format(i=i, y=i % 7 + 1)) for i in range(n)]
+
+def _ms(samples):
+    samples = sorted(samples)
+    p95 = samples[min(len(samples) - 1, int(round(0.95 * (len(samples) - 1))))]
+    return statistics.median(samples) * 1000, p95 * 1000
+
+async def main(model_name: str, ns, repeat: int) -> None:
+    rr = CrossEncoderReranker(model_name, top_n=max(ns), budget_ms=60_000, cache_size=1_000_000)
+    t = time.perf_counter()
+    rr.score_sync("warmup", _passages(4, "warmup"))
+    print(f"model={model_name} load+warmup={time.perf_counter() - t:.1f}s")
+    print(f"{'N':>5} {'cold p50':>10} {'cold p95':>10} {'ms/pair':>8} {'cached p50':>11}")
+
+    for n in ns:
+        cold, warm = [], []
+        for r in range(repeat):
+            q = QUERIES[r % len(QUERIES)]
+            ps = _passages(n, f"{n}-{r}")          # 매번 새 후보 → 캐시 미스
+            t = time.perf_counter()
+            await rr.rerank(q, ps)
+            cold.append(time.perf_counter() - t)
+            t = time.perf_counter()
+            await rr.rerank(q, ps)                 # 같은 쌍 → 캐시 적중
+            warm.append(time.perf_counter() - t)
+        c50, c95 = _ms(cold)
+        w50, _ = _ms(warm)
+        print(f"{n:>5} {c50:>10.1f} {c95:>10.1f} {c50 / n:>8.2f} {w50:>11.3f}")
+
+if __name__ == "__main__":
+    ap = argparse.ArgumentParser()
+    ap.add_argument("model", nargs="?", default=RERANK_MODEL or DEFAULT_MODEL)
+    ap.add_argument("--n", default="10,20,30,50,100")
+    ap.add_argument("--repeat", type=int, default=5)
+    args = ap.parse_args()
+    asyncio.run(main(args.model, [int(x) for x in args.n.split(",")], args.repeat))
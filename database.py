@@ -1,4 +1,5 @@
 # app/database.py
+import asyncio
 import os
 import motor.motor_asyncio
 from beanie import init_beanie
@@ -7,33 +8,72 @@ from models.refresh_token_document import RefreshTokenDocument
 from models.job_posting_document import JobPostingDocument
 from models.user_job_bookmark_document import UserJobBookmarkDocument
 from models.cover_letter_document import CoverLetterDocument
-from settings import MONGO_URI, DB_NAME, VC_HOST, VC_PORT
+from models.where_cache_document import WhereCacheDocument
+from models.user_recommendation_document import UserRecommendationDocument
+from settings import MONGO_URI, DB_NAME, VC_HOST, VC_PORT, MONGO_INDEX_MODE
 from bson.codec_options import CodecOptions, UuidRepresentation
-from chromadb import HttpClient
 
-async def init_db():
-    client = motor.motor_asyncio.AsyncIOMotorClient(MONGO_URI)
+# Beanie에 등록하는 Document 모델 전체
+DOCUMENT_MODELS = [
+    UserDocument,
+    RefreshTokenDocument,
+    JobPostingDocument,
+    UserJobBookmarkDocument,
+    CoverLetterDocument,
+    WhereCacheDocument,
+    UserRecommendationDocument,
+]
+
+# 백그라운드 인덱스 생성/점검 태스크 (index_mode="background"일 때, 종료 시 lifespan이 취소)
+index_task = None
+
+async def init_db(client=None, db_name: str = DB_NAME, index_mode: str = MONGO_INDEX_MODE):
+    # client를 주면 그 클라이언트로 초기화 (벤치마크 등에서 별도 DB/mock 클라이언트 사용)
+    # index_mode: background | sync | off (utils/mongo_indexes.py)
+    global index_task
+    from utils.mongo_indexes import build_and_report, ensure_indexes
+    client = client or motor.motor_asyncio.AsyncIOMotorClient(MONGO_URI)
 
     codec_opts = CodecOptions(uuid_representation=UuidRepresentation.STANDARD)
-    db = client.get_database(DB_NAME, codec_options=codec_opts)
-
-    # Beanie 초기화 (모든 Document 모델 등록)
-    await init_beanie(
-        database=db,
-        document_models=[
-            UserDocument,
-            RefreshTokenDocument,
-            JobPostingDocument,
-            UserJobBookmarkDocument,
-            CoverLetterDocument
-        ],
-    )
+    db = client.get_database(db_name, codec_options=codec_opts)
+
+    # Beanie 초기화 (모든 Document 모델 등록). 인덱스는 Beanie가 만들지 않고 아래에서 따로
+    # (큰 컬렉션의 인덱스 생성이 시작을 막지 않도록, 기존 인덱스는 지우지 않음)
+    await init_beanie(database=db, document_models=DOCUMENT_MODELS, skip_indexes=True)
+
+    if index_mode == "sync":
+        await ensure_indexes(DOCUMENT_MODELS)
+    elif index_mode == "background":
+        index_task = asyncio.create_task(build_and_report(DOCUMENT_MODELS))
 
     # 종료 시 close를 위해 client도 함께 반환
     return db, client
 
-vc_client = HttpClient(host=VC_HOST, port=VC_PORT) 
-vc_collection = vc_client.get_or_create_collection(
-    "master_job_postings",
-    metadata={"hnsw:space": "cosine"}
-)
+# 동기 Chroma 클라이언트 (스크립트용, 최초 사용 시 생성 → import만으로는 네트워크 연결 안 함)
+_vc_collection = None
+
+def get_vc_collection():
+    global _vc_collection
+    if _vc_collection is None:
+        from chromadb import HttpClient
+        vc_client = HttpClient(host=VC_HOST, port=VC_PORT)
+        _vc_collection = vc_client.get_or_create_collection(
+            "master_job_postings",
+            metadata={"hnsw:space": "cosine"}
+        )
+    return _vc_collection
+
+
+# 비동기 Chroma 클라이언트 (검색 API 경로용, 최초 사용 시 생성)
+_vc_collection_async = None
+
+async def get_vc_collection_async():
+    global _vc_collection_async
+    if _vc_collection_async is None:
+        from chromadb import AsyncHttpClient
+        client = await AsyncHttpClient(host=VC_HOST, port=VC_PORT)
+        _vc_collection_async = await client.get_or_create_collection(
+            "master_job_postings",
+            metadata={"hnsw:space": "cosine"}
+        )
+    return _vc_collection_async
@@ -1,11 +1,29 @@
+import asyncio
+import logging
 from contextlib import asynccontextmanager
 from fastapi import FastAPI
 from fastapi.middleware.cors import CORSMiddleware
 
 from services.user import UserService
 from services.auth import AuthService
-from api.routers import user, cover_letter, auth, job_posting
+from api.routers import user, cover_letter, auth, job_posting, health
+import database
 from database import init_db
+from services.job_posting_sync import build_sync_worker
+from services.job_posting_indexer import build_lexical_index
+from repositories.rag_repositories.job_poasting_rag_repository import get_model, warm_up
+from repositories.rag_repositories.encoder import shared_authkey
+from repositories.rag_repositories.lexical_index import lexical_index
+from repositories.rag_repositories.vector_store import get_vector_store
+from settings import SEARCH_HYBRID, ENCODER_MODE, ENCODER_PRELOAD
+
+logger = logging.getLogger(__name__)
+
+# fork 전에 인코더 로드: gunicorn main:app --preload -k uvicorn.workers.UvicornWorker -w N 으로 띄우면
+# 마스터가 import할 때 한 번 올리고 워커들은 copy-on-write로 같은 가중치 페이지를 공유한다.
+# (uvicorn --workers는 spawn이라 공유되지 않음 → ENCODER_MODE=shared 사용)
+if ENCODER_PRELOAD and ENCODER_MODE == "local":
+    get_model()
 
 
 
@@ -27,21 +45,62 @@ ALLOWED_ORIGINS = [
     "http://34.173.199.135:3000",
 ]
 
+async def _until_ready(app: FastAPI, name: str, step, retry_seconds: float = 5.0):
+    """step이 성공할 때까지 재시도하고 readiness[name]을 켬 (실패해도 앱은 뜬 상태로 /readyz만 503)"""
+    while True:
+        try:
+            await step()
+            app.state.readiness[name] = True
+            return
+        except Exception:
+            logger.exception("%s 준비 실패, %.0f초 후 재시도", name, retry_seconds)
+            await asyncio.sleep(retry_seconds)
+
 @asynccontextmanager
 async def lifespan(app: FastAPI):
     # --- startup ---
+    # 설정 오류는 재시도해도 안 풀리므로 바로 실패 (encoder 준비 재시도 루프로 넘기지 않음)
+    if ENCODER_MODE == "shared":
+        shared_authkey()
+    app.state.readiness = {"mongo": False, "encoder": False, "vector_store": False}
+
     # Mongo/Motor + Beanie 초기화
     db, client = await init_db()
+    index_task = database.index_task
     app.state.mongo_client = client
     app.state.mongo_db = db
+    app.state.readiness["mongo"] = True
+
+    # 모델 로드/벡터 저장소 연결은 import가 아니라 여기서 백그라운드로 (끝나면 /readyz가 200)
+    warmup_tasks = [
+        asyncio.create_task(_until_ready(app, "encoder", lambda: asyncio.to_thread(warm_up))),
+        asyncio.create_task(_until_ready(app, "vector_store", get_vector_store)),
+    ]
 
     # 서비스 인스턴스 준비(필요한 것만)
     app.state.user_service = UserService()
     app.state.auth_service = AuthService()
 
+    # 하이브리드 검색용 키워드 색인 (준비되기 전 검색은 벡터만 사용)
+    lexical_task = asyncio.create_task(build_lexical_index()) if SEARCH_HYBRID else None
+    app.state.lexical_index = lexical_index if SEARCH_HYBRID else None
+
+    # Mongo → 벡터 저장소 동기화 워커 (JOB_SYNC_MODE=off면 실행 안 함)
+    app.state.job_sync_worker = build_sync_worker()
+    sync_task = None
+    if app.state.job_sync_worker:
+        sync_task = asyncio.create_task(app.state.job_sync_worker.run())
+
     yield
 
     # --- shutdown ---
+    for task in (sync_task, lexical_task, index_task, *warmup_tasks):
+        if task:
+            task.cancel()
+            try:
+                await task
+            except asyncio.CancelledError:
+                pass
     client = getattr(app.state, "mongo_client", None)
     if client:
         client.close()
@@ -63,3 +122,4 @@ app.include_router(user.router)
 app.include_router(auth.router)
 app.include_router(job_posting.router)
 app.include_router(cover_letter.router)
+app.include_router(health.router)
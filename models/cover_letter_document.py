@@ -32,7 +32,9 @@ class CoverLetterDocument(Document):
     class Settings:
         name = "cover_letters"
         indexes = [
-            [("user_id", 1), ("updated_at", -1)],
-            [("user_id", 1), ("type", 1), ("updated_at", -1)],
+            # list_by_user: updated_at, _id 내림차순 정렬까지 인덱스로 (메모리 정렬 없음)
+            [("user_id", 1), ("updated_at", -1), ("_id", -1)],
+            [("user_id", 1), ("type", 1), ("updated_at", -1), ("_id", -1)],
+            [("user_id", 1), ("job_posting_id", 1), ("updated_at", -1), ("_id", -1)],
         ]
 
@@ -1,8 +1,24 @@
 # app/models/job_posting_document.py
 from typing import Any, Dict, List, Optional
 from datetime import datetime
-from beanie import Document, Indexed
-from pydantic import BaseModel, Field, field_validator
+from beanie import Document, Indexed, PydanticObjectId
+from pydantic import BaseModel, ConfigDict, Field, field_validator
+
+# 마감/비활성 공고 상태 (검색·목록·벡터 인덱스에서 제외)
+INACTIVE_STATUSES = ("inactive", "closed")
+
+def normalize_str_list(v):
+    # None -> []
+    if v is None:
+        return []
+    # set/tuple -> list
+    if isinstance(v, (set, tuple)):
+        v = list(v)
+    # 리스트라면 내부의 None/공백 제거
+    if isinstance(v, list):
+        return [s for s in v if isinstance(s, str) and s.strip()]
+    # 그 외 타입이면 방어적으로 빈 리스트
+    return []
 
 # 회사 주소
 class CompanyAddress(BaseModel):
@@ -60,20 +76,15 @@ class JobPostingDocument(Document):
     @field_validator("skill_tags", "title_images", mode="before")
     @classmethod
     def _normalize_str_list(cls, v):
-        # None -> []
-        if v is None:
-            return []
-        # set/tuple -> list
-        if isinstance(v, (set, tuple)):
-            v = list(v)
-        # 리스트라면 내부의 None/공백 제거
-        if isinstance(v, list):
-            return [s for s in v if isinstance(s, str) and s.strip()]
-        # 그 외 타입이면 방어적으로 빈 리스트
-        return []
+        return normalize_str_list(v)
     
     class Settings:
         name = "master_job_postings"  # 컬렉션명
+        indexes = [
+            [("status", 1), ("_id", -1)],  # 진행 중 공고 최신순 목록
+            [("status", 1), ("due_time", 1)],  # 진행 중 공고 수 (status/마감일 필터)
+            [("metadata.crawledAt", 1)],  # 동기화 poll 모드: 재크롤링 워터마크
+        ]
         # 크롤링 중복 방지용
         # indexes = [
         #     Indexed("metadata.sourceUrl", unique=True),
@@ -81,4 +92,33 @@ class JobPostingDocument(Document):
         #     Indexed("company.name"),
         #     Indexed("detail.position.jobGroup"),
         #     Indexed("detail.position.job"),
-        # ]
\ No newline at end of file
+        # ]
+
+# ===== 목록 조회용 projection =====
+# 목록 화면(카드)에 필요한 필드만 Mongo에서 읽음: 긴 본문(detail.intro, main_tasks 등)/sourceData는 제외
+# (상세 본문은 단건 조회에서만 JobPostingDocument로)
+class SummaryDetail(BaseModel):
+    position: Optional[Position] = None
+
+class JobPostingSummary(BaseModel):
+    model_config = ConfigDict(populate_by_name=True)
+
+    id: PydanticObjectId = Field(alias="_id")
+    company: Company
+    detail: SummaryDetail = Field(default_factory=SummaryDetail)
+    due_time: Optional[datetime] = None
+    status: Optional[str] = "active"
+    skill_tags: List[str] = Field(default_factory=list)
+    bucket: Optional[str] = None
+    salary_bucket_2m_label: Optional[str] = None
+
+    @field_validator("skill_tags", mode="before")
+    @classmethod
+    def _normalize_str_list(cls, v):
+        return normalize_str_list(v)
+
+    class Settings:
+        projection = {
+            "_id": 1, "company": 1, "detail.position": 1, "due_time": 1, "status": 1,
+            "skill_tags": 1, "bucket": 1, "salary_bucket_2m_label": 1,
+        }
@@ -2,6 +2,7 @@
 from datetime import datetime, timezone
 from beanie import Document, Indexed
 from pydantic import Field
+from pymongo import IndexModel
 
 
 class UserJobBookmarkDocument(Document):
@@ -12,5 +13,8 @@ class UserJobBookmarkDocument(Document):
     class Settings:
         name = "user_job_bookmarks"
         indexes = [
-            [("user_id", 1), ("job_id", 1)],  # 복합 키로 조회/유니크 관리 (유니크는 애플리케이션 레벨로 보완)
+            # 북마크 여부/삭제/ids 중 북마크한 것 조회, 같은 공고 중복 북마크 방지
+            IndexModel([("user_id", 1), ("job_id", 1)], name="user_job_unique", unique=True),
+            # 내 북마크 목록(created_at 오름차순) / 최근 북마크(역방향 스캔)
+            IndexModel([("user_id", 1), ("created_at", 1), ("_id", 1)], name="user_created"),
         ]
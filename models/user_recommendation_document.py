@@ -0,0 +1,16 @@
+# app/models/user_recommendation_document.py
+# 야간 배치로 미리 계산한 사용자별 추천 공고 (services/recommendation_batch.py가 기록)
+from datetime import datetime, timezone
+from typing import List
+from beanie import Document, Indexed
+from pydantic import Field
+
+class UserRecommendationDocument(Document):
+    user_id: Indexed(str, unique=True)
+    job_ids: List[str] = Field(default_factory=list)     # score 내림차순
+    scores: List[float] = Field(default_factory=list)
+    fingerprint: str                                      # 계산 당시 프로필/북마크 지문 (다르면 온라인 추천으로 대체)
+    generated_at: datetime = Field(default_factory=lambda: datetime.now(timezone.utc))
+
+    class Settings:
+        name = "user_recommendations"
@@ -0,0 +1,15 @@
+# app/models/where_cache_document.py
+# 여러 워커/노드가 공유하는 where 절 캐시 (WHERE_CACHE_BACKEND=mongo 일 때만 사용)
+from datetime import datetime, timezone
+from beanie import Document, Indexed
+from pydantic import Field
+
+class WhereCacheDocument(Document):
+    key: Indexed(str, unique=True)        # 정규화된 검색어
+    where_json: str                       # Chroma where 절 (키가 $로 시작하므로 JSON 문자열로 저장)
+    expires_at: Indexed(datetime, expireAfterSeconds=0) = Field(
+        default_factory=lambda: datetime.now(timezone.utc)
+    )
+
+    class Settings:
+        name = "where_cache"
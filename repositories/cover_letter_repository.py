@@ -16,6 +16,9 @@ class CoverLetterRepository:
     async def get_by_id(self, cl_id: str):
         return await self.mongo.get_by_id(cl_id)
 
+    async def latest_by_user(self, user_id: str, type_filter: Optional[str] = None):
+        return await self.mongo.latest_by_user(user_id, type_filter=type_filter)
+
     async def list_by_user(
         self, user_id: str, skip: int, limit: int,
         *, type_filter: Optional[str] = None, job_posting_id: Optional[str] = None
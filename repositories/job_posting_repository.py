@@ -1,4 +1,5 @@
 # app/repositories/job_posting_repository.py
+import asyncio
 from typing import Optional, List
 from repositories.mongo_repositories.job_posting_mongodb_repository import JobPostingMongoDBRepository
 from repositories.rag_repositories.job_poasting_rag_repository import JobPostingRagRepository
@@ -21,16 +22,50 @@ class JobPostingRepository:
     async def list_recent(self, offset: int, limit: int):
         return await self.mongo.list_recent_with_total(skip=offset, limit=limit)
 
-    async def list(self, q: Optional[str], offset: int, limit: int):
+    async def list_recent_after(self, after: Optional[str], limit: int):
+        return await self.mongo.list_recent_after(after, limit)
+
+    async def recommend_ids(self, profile_text: str, liked_ids: List[str], n: int) -> List[str]:
+        return await self.rag.recommend(profile_text, liked_ids, n=n)
+
+    async def list(
+        self,
+        q: Optional[str],
+        offset: int,
+        limit: int,
+        cursor: Optional[str] = None,
+        after: Optional[str] = None,
+        include_total: bool = False,
+    ):
+        """
+        (docs, total, next_cursor, next_after) 반환.
+        - next_cursor는 검색(q)일 때만, next_after는 최신순 목록일 때만 채워진다.
+        - 최신순 목록은 offset=0 또는 after가 있으면 keyset(_id 범위) 조회, offset>0이면 기존 skip 조회.
+        - total은 after 없이 조회할 때(기존 동작) 또는 include_total일 때만 센다 (그 외 None).
+        """
         q_norm = (q or "").strip().lower()
 
         if q_norm in ("", "null", "undefined"):
-            return await self.list_recent(offset=offset, limit=limit)
+            if after is not None or offset == 0:
+                total = None
+                if after is None or include_total:
+                    (docs, next_after), total = await asyncio.gather(
+                        self.list_recent_after(after, limit), self.mongo.count_live(),
+                    )
+                else:
+                    docs, next_after = await self.list_recent_after(after, limit)
+                return docs, total, None, next_after
+            # limit+1개를 읽어 다음 페이지 유무 판단 (마지막 페이지가 딱 limit개여도 빈 페이지로 가는 next_after를 주지 않음)
+            docs, total = await self.list_recent(offset=offset, limit=limit + 1)
+            next_after = str(docs[limit - 1]["_id"]) if len(docs) > limit else None
+            return docs[:limit], total, None, next_after
         else: # query가 존재하는 경우 RAG repository 요청
-            job_ids = self.rag.search(q, offset=offset, limit=limit)
-            if job_ids == [] or job_ids == None:
-                return [], 0
-            return await self.get_by_ids_preserve_order(job_ids), len(job_ids)
+            if after is not None:
+                raise ValueError("after는 검색어(q) 없는 목록 조회에서만 사용할 수 있습니다. 검색은 cursor를 사용하세요.")
+            page = await self.rag.search(q, offset=offset, limit=limit, cursor=cursor)
+            if not page.job_ids:
+                return [], 0, None, None
+            return await self.get_by_ids_preserve_order(page.job_ids), page.total, page.next_cursor, None
 
         
 
@@ -1,11 +1,19 @@
 # app/repositories/mongo_repositories/cover_letter_mongodb_repository.py
+import asyncio
 from typing import Optional, Tuple, List, Dict, Any
 from bson import ObjectId
 from beanie import SortDirection
 from models.cover_letter_document import CoverLetterDocument
+from utils.count_cache import count_cache
 from datetime import datetime, timezone
 from uuid import UUID, uuid4
 
+# 목록 응답에 쓰는 필드만 (CoverLetterResponse.from_raw로 변환)
+LIST_PROJECTION = {
+    "user_id": 1, "title": 1, "type": 1, "job_posting_id": 1, "qnas": 1,
+    "strength": 1, "weakness": 1, "created_at": 1, "updated_at": 1,
+}
+
 class CoverLetterMongoDBRepository:
     # id로 자기소개서 조회
     async def get_by_id(self, cl_id: str) -> Optional[CoverLetterDocument]:
@@ -13,7 +21,20 @@ class CoverLetterMongoDBRepository:
             return None
         return await CoverLetterDocument.get(ObjectId(cl_id))
 
-    # 타입(프로필, 공고 기반)으로 자기소개서 조회
+    # 가장 최근에 수정한 자기소개서 (타입 지정 가능)
+    async def latest_by_user(self, user_id: str, type_filter: Optional[str] = None) -> Optional[CoverLetterDocument]:
+        q: Dict[str, Any] = {"user_id": user_id}
+        if type_filter:
+            q["type"] = type_filter
+        docs = await (
+            CoverLetterDocument.find(q)
+            .sort([("updated_at", SortDirection.DESCENDING), ("_id", SortDirection.DESCENDING)])
+            .limit(1)
+            .to_list()
+        )
+        return docs[0] if docs else None
+
+    # 타입(프로필, 공고 기반)으로 자기소개서 목록 조회 (Beanie 모델 없이 raw dict)
     async def list_by_user(
         self,
         user_id: str,
@@ -22,20 +43,21 @@ class CoverLetterMongoDBRepository:
         *,
         type_filter: Optional[str] = None,
         job_posting_id: Optional[str] = None,
-    ) -> Tuple[List[CoverLetterDocument], int]:
+    ) -> Tuple[List[Dict[str, Any]], int]:
         q: Dict[str, Any] = {"user_id": user_id}
         if type_filter:
             q["type"] = type_filter
         if job_posting_id:
             q["job_posting_id"] = job_posting_id
 
-        total = await CoverLetterDocument.find(q).count()
-        docs = await (
-            CoverLetterDocument.find(q)
-            .sort([("updated_at", SortDirection.DESCENDING), ("_id", SortDirection.DESCENDING)])
+        # 페이지 조회와 개수(캐시 미스 시 count)를 동시에
+        docs, total = await asyncio.gather(
+            CoverLetterDocument.get_pymongo_collection().find(q, LIST_PROJECTION)
+            .sort([("updated_at", -1), ("_id", -1)])
             .skip(skip)
             .limit(limit)
-            .to_list()
+            .to_list(length=None),
+            count_cache.count(CoverLetterDocument, q, scope=user_id),
         )
         return docs, total
 
@@ -43,6 +65,7 @@ class CoverLetterMongoDBRepository:
     async def create(self, doc: Dict[str, Any]) -> CoverLetterDocument:
         cover_letter = CoverLetterDocument(**doc)
         await cover_letter.insert()
+        count_cache.invalidate(CoverLetterDocument, scope=cover_letter.user_id)
         return cover_letter
 
     # 자기소개서 수정
@@ -55,6 +78,7 @@ class CoverLetterMongoDBRepository:
         to_set["updated_at"] = datetime.now(timezone.utc)
 
         await doc.update({"$set": to_set})
+        count_cache.invalidate(CoverLetterDocument, scope=doc.user_id)   # type/job_posting_id가 바뀌었을 수 있음
         return await self.get_by_id(cl_id)
 
     # 자기소개서 삭제
@@ -63,6 +87,7 @@ class CoverLetterMongoDBRepository:
         if not doc:
             return False
         await doc.delete()
+        count_cache.invalidate(CoverLetterDocument, scope=doc.user_id)
         return True
 
     # === QnA(qna 생성 관련은 rag에서 진행, 각 질문에 대한 답변) ===
@@ -1,9 +1,23 @@
 # app/repositories/mongo_repositories/job_posting_mongodb_repository.py
-from typing import Optional, List, Dict, Tuple
+import asyncio
+from datetime import datetime, timezone
+from typing import Any, Optional, List, Dict, Tuple
 from bson import ObjectId
-from beanie import SortDirection
-from beanie.operators import In
-from models.job_posting_document import JobPostingDocument
+from models.job_posting_document import INACTIVE_STATUSES, JobPostingDocument, JobPostingSummary
+from utils.count_cache import count_cache
+from utils.where_minimal import where_to_mongo
+from settings import JOB_LIST_TOTAL_MODE
+
+def live_filter(now: Optional[datetime] = None) -> Dict[str, Any]:
+    """진행 중 공고 조건: 마감/비활성 상태가 아니고, 마감일이 없거나 지나지 않음"""
+    now = now or datetime.now(timezone.utc)
+    return {
+        "status": {"$nin": list(INACTIVE_STATUSES)},
+        "$or": [{"due_time": None}, {"due_time": {"$gte": now}}],
+    }
+
+# 목록 조회는 Beanie 모델을 거치지 않고 Motor raw dict로 (JobPostingSummaryResponse.from_raw로 변환)
+SUMMARY_PROJECTION = JobPostingSummary.Settings.projection
 
 class JobPostingMongoDBRepository:
     async def get_by_id(self, job_id: str) -> Optional[JobPostingDocument]:
@@ -11,31 +25,72 @@ class JobPostingMongoDBRepository:
             return None
         return await JobPostingDocument.get(ObjectId(job_id))
 
-    async def get_by_ids_preserve_order(self, job_ids: List[str]) -> List[JobPostingDocument]:
+    async def get_by_ids_preserve_order(self, job_ids: List[str]) -> List[Dict[str, Any]]:
         """
-        주어진 문자열 id 목록 순서를 유지하여 Document 목록 반환.
+        주어진 문자열 id 목록 순서를 유지하여 목록용 요약(SUMMARY_PROJECTION raw dict) 반환.
         """
         valid_oids = [ObjectId(j) for j in job_ids if ObjectId.is_valid(j)]
         if not valid_oids:
             return []
 
-        docs = await JobPostingDocument.find(
-            In(JobPostingDocument.id, valid_oids)
-        ).to_list()
+        docs = await JobPostingDocument.get_pymongo_collection().find(
+            {"_id": {"$in": valid_oids}}, SUMMARY_PROJECTION
+        ).to_list(length=None)
 
-        doc_map: Dict[str, JobPostingDocument] = {str(d.id): d for d in docs}
-        return [doc_map[str(oid)] for oid in valid_oids if str(oid) in doc_map]
+        doc_map: Dict[ObjectId, Dict[str, Any]] = {d["_id"]: d for d in docs}
+        return [doc_map[oid] for oid in valid_oids if oid in doc_map]
 
-    async def list_recent_with_total(self, skip: int, limit: int) -> Tuple[List[JobPostingDocument], int]:
+    async def list_recent_with_total(self, skip: int, limit: int) -> Tuple[List[Dict[str, Any]], int]:
         """
-        ObjectId 생성 시간 기준 최신순으로 채용 공고 리스트 조회
+        ObjectId 생성 시간 기준 최신순으로 진행 중인 채용 공고 요약 리스트 조회
+        ((status, _id) 인덱스 사용, 개수는 count_live와 동시에 조회)
         """
-        total = await JobPostingDocument.find({}).count()
-        docs = await (
-            JobPostingDocument.find({})
-            .sort([("_id", SortDirection.DESCENDING)])
+        live = live_filter()
+        docs, total = await asyncio.gather(
+            JobPostingDocument.get_pymongo_collection().find(live, SUMMARY_PROJECTION)
+            .sort("_id", -1)
             .skip(skip)
             .limit(limit)
-            .to_list()
+            .to_list(length=None),
+            self.count_live(),
         )
         return docs, total
+
+    async def list_recent_after(
+        self, after: Optional[str], limit: int
+    ) -> Tuple[List[Dict[str, Any]], Optional[str]]:
+        """
+        keyset 페이지네이션: after(이전 페이지 마지막 공고 id)보다 오래된 진행 중 공고를 최신순으로 limit개.
+        _id 인덱스를 after부터 역방향으로 범위 스캔하므로 페이지 깊이와 상관없이 O(limit).
+        limit+1개를 읽어 다음 페이지 유무를 판단하고, 없으면 next_after=None.
+        """
+        cond = live_filter()
+        if after is not None:
+            if not ObjectId.is_valid(after):
+                raise ValueError("after 값이 올바른 공고 id가 아닙니다.")
+            cond["_id"] = {"$lt": ObjectId(after)}
+        docs = await (
+            JobPostingDocument.get_pymongo_collection().find(cond, SUMMARY_PROJECTION)
+            .sort("_id", -1)
+            .limit(limit + 1)
+            .to_list(length=None)
+        )
+        next_after = str(docs[limit - 1]["_id"]) if len(docs) > limit else None
+        return docs[:limit], next_after
+
+    async def count_matching(self, where: Optional[dict]) -> int:
+        """
+        검색 where 절(Chroma 메타데이터 기준)에 맞는 공고 수 (COUNT_CACHE_TTL_SECONDS 캐시). 바꿀 수 없는 where면 ValueError
+        - 마감/비활성 공고는 색인하지 않으므로(is_indexable) 항상 빼고 센다 → 페이징으로 닿을 수 있는 수와 맞춤
+        - SEARCH_LIVE_ONLY면 where에 이미 live_where(마감일 조건)가 붙어 있음
+        """
+        indexed = {"status": {"$nin": list(INACTIVE_STATUSES)}}
+        cond = where_to_mongo(where)
+        return await count_cache.count(JobPostingDocument, {"$and": [cond, indexed]} if cond else indexed)
+
+    async def count_live(self) -> int:
+        """진행 중 공고 수 (COUNT_CACHE_TTL_SECONDS 캐시). JOB_LIST_TOTAL_MODE=estimated면 컬렉션 추정치"""
+        if JOB_LIST_TOTAL_MODE == "estimated":
+            return await count_cache.count(JobPostingDocument)
+        # live_filter에는 현재 시각이 들어가므로 키를 고정
+        return await count_cache.count(JobPostingDocument, live_filter(), key="live")
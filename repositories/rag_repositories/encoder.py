@@ -0,0 +1,208 @@
+# repositories/rag_repositories/encoder.py
+# 검색 임베딩 인코더 선택 (ENCODER_BACKEND)
+# - torch    : SentenceTransformer (fp32 PyTorch, 기존)
+# - onnx     : 같은 모델을 ONNX로 내보낸 것을 onnxruntime으로 실행 (mean pooling 동일)
+# - onnx-int8: 위 ONNX를 동적 int8 양자화한 것 (메모리/지연 최소, 코사인 오차 약간)
+# 모든 구현은 encode(texts, batch_size=...) -> np.ndarray[float32] 를 제공한다.
+#
+# ENCODER_MODE=shared면 위 인코더를 별도 프로세스 하나에만 올리고, API 워커들은 SharedEncoder(프록시)로 호출
+# → 워커 N개여도 가중치는 한 벌
+# manager 연결은 pickle을 주고받으므로 authkey를 아는 쪽은 서버에서 임의 코드를 실행할 수 있다
+# → ENCODER_SHARED_AUTHKEY 필수(없으면 시작 실패), ENCODER_SHARED_ADDRESS는 내부망/localhost에만 열 것
+#
+# 내보내기: python -m repositories.rag_repositories.encoder export [--int8]
+# 공유 서버: python -m repositories.rag_repositories.encoder serve
+# 검증/측정: python -m benchmarks.encoder
+from __future__ import annotations
+
+import logging
+import os
+import sys
+import threading
+from multiprocessing.managers import BaseManager
+from typing import List, Protocol, Sequence, Tuple, Union
+
+import numpy as np
+
+from settings import (
+    ENCODER_BACKEND, ENCODER_ONNX_DIR, ENCODER_THREADS, ENCODER_MODE, ENCODER_SHARED_ADDRESS, ENCODER_SHARED_AUTHKEY,
+)
+
+logger = logging.getLogger(__name__)
+
+ONNX_FILE = "model.onnx"
+ONNX_INT8_FILE = "model.int8.onnx"
+
+class Encoder(Protocol):
+    def encode(self, sentences: Union[str, Sequence[str]], batch_size: int = 32, **kwargs) -> np.ndarray: ...
+
+def onnx_dir(model_name: str) -> str:
+    return os.path.join(ENCODER_ONNX_DIR, model_name.replace("/", "__"))
+
+class OnnxEncoder:
+    """onnxruntime + HF 토크나이저. 출력은 SentenceTransformer와 같은 mean pooling 임베딩 (정규화 전)"""
+
+    def __init__(self, path: str, *, file: str = ONNX_FILE, max_length: int = 128, threads: int = ENCODER_THREADS):
+        import onnxruntime as ort
+        from transformers import AutoTokenizer
+
+        self.path = path
+        self.max_length = max_length
+        self.tokenizer = AutoTokenizer.from_pretrained(path)
+        opts = ort.SessionOptions()
+        opts.graph_optimization_level = ort.GraphOptimizationLevel.ORT_ENABLE_ALL
+        if threads:
+            opts.intra_op_num_threads = threads
+        self.session = ort.InferenceSession(os.path.join(path, file), opts, providers=["CPUExecutionProvider"])
+        self._inputs = {i.name for i in self.session.get_inputs()}
+
+    def encode(self, sentences: Union[str, Sequence[str]], batch_size: int = 32, **kwargs) -> np.ndarray:
+        single = isinstance(sentences, str)
+        texts: List[str] = [sentences] if single else list(sentences)
+        if not texts:
+            return np.zeros((0, 0), dtype=np.float32)
+        # 길이순으로 묶어 패딩 낭비를 줄이고 마지막에 원래 순서로 되돌림
+        order = np.argsort([len(t) for t in texts])
+        out: List[np.ndarray] = []
+        for s in range(0, len(texts), batch_size):
+            batch = [texts[i] for i in order[s:s + batch_size]]
+            enc = self.tokenizer(batch, padding=True, truncation=True, max_length=self.max_length, return_tensors="np")
+            feeds = {k: v.astype(np.int64) for k, v in enc.items() if k in self._inputs}
+            tok = self.session.run(None, feeds)[0]                       # [b, t, d]
+            mask = enc["attention_mask"][..., None].astype(np.float32)
+            out.append((tok * mask).sum(axis=1) / np.clip(mask.sum(axis=1), 1e-9, None))
+        emb = np.empty((len(texts), out[0].shape[1]), dtype=np.float32)
+        emb[order] = np.concatenate(out)
+        return emb[0] if single else emb
+
+def load_encoder(model_name: str, backend: str = ENCODER_BACKEND) -> Encoder:
+    if backend in ("onnx", "onnx-int8"):
+        path = onnx_dir(model_name)
+        file = ONNX_INT8_FILE if backend == "onnx-int8" else ONNX_FILE
+        if os.path.exists(os.path.join(path, file)):
+            return OnnxEncoder(path, file=file)
+        logger.warning("%s 없음 → torch 인코더 사용 (먼저 encoder export 실행 필요)", os.path.join(path, file))
+    elif backend != "torch":
+        raise ValueError(f"지원하지 않는 ENCODER_BACKEND입니다: {backend}")
+    from sentence_transformers import SentenceTransformer
+    return SentenceTransformer(model_name)
+
+# ===== 공유 인코더 프로세스 =====
+class _EncoderManager(BaseManager):
+    pass
+
+def _address(address: str) -> Tuple[str, int]:
+    host, _, port = address.rpartition(":")
+    return host or "127.0.0.1", int(port)
+
+def _drop_thread_connection(proxy) -> None:
+    """
+    BaseProxy는 같은 주소의 프록시끼리 스레드 로컬 연결(_tls.connection)을 공유한다.
+    끊긴 연결을 이 스레드에서 지워야 새 프록시가 다시 연결한다.
+    """
+    conn = getattr(proxy._tls, "connection", None)
+    if conn is not None:
+        del proxy._tls.connection
+        try:
+            conn.close()
+        except OSError:
+            pass
+
+def shared_authkey() -> bytes:
+    """ENCODER_SHARED_AUTHKEY (비어 있으면 RuntimeError: 추측 가능한 기본 키로 서버를 열지 않도록)"""
+    if not ENCODER_SHARED_AUTHKEY:
+        raise RuntimeError("ENCODER_MODE=shared에는 ENCODER_SHARED_AUTHKEY가 필요합니다 (encoder serve와 API 워커에 같은 값)")
+    return ENCODER_SHARED_AUTHKEY.encode()
+
+def serve_encoder(model_name: str, address: str = ENCODER_SHARED_ADDRESS, backend: str = ENCODER_BACKEND) -> None:
+    """인코더를 한 번 로드해 address에서 서비스 (연결마다 스레드, 블로킹)"""
+    authkey = shared_authkey()
+    enc = load_encoder(model_name, backend)
+    enc.encode(["워밍업"])
+    _EncoderManager.register("encoder", callable=lambda: enc)
+    manager = _EncoderManager(address=_address(address), authkey=authkey)
+    logger.info("encoder 서버 시작: %s (%s)", address, backend)
+    manager.get_server().serve_forever()
+
+class SharedEncoder:
+    """
+    encoder 서버 프록시. 호출 스레드마다 연결이 따로 열리므로 스레드풀에서 그대로 써도 된다.
+    서버가 재시작되어 연결이 끊기면(EOFError/ConnectionError) 한 번 다시 연결해서 재시도한다.
+    """
+
+    def __init__(self, address: str = ENCODER_SHARED_ADDRESS):
+        _EncoderManager.register("encoder")
+        self.address = address
+        self._authkey = shared_authkey()
+        self._lock = threading.Lock()
+        self._remote = self._connect()
+
+    def _connect(self):
+        manager = _EncoderManager(address=_address(self.address), authkey=self._authkey)
+        manager.connect()
+        return manager.encoder()
+
+    def encode(self, sentences: Union[str, Sequence[str]], batch_size: int = 32, **kwargs) -> np.ndarray:
+        if not isinstance(sentences, str):
+            sentences = list(sentences)
+        remote = self._remote
+        try:
+            out = remote.encode(sentences, batch_size=batch_size, **kwargs)
+        except (EOFError, ConnectionError):
+            _drop_thread_connection(remote)
+            with self._lock:
+                if self._remote is remote:      # 다른 스레드가 이미 다시 연결했으면 그대로 사용
+                    logger.warning("encoder 서버 연결 끊김, 다시 연결: %s", self.address)
+                    self._remote = self._connect()
+                remote = self._remote
+            out = remote.encode(sentences, batch_size=batch_size, **kwargs)
+        return np.asarray(out, dtype=np.float32)
+
+def get_encoder(model_name: str, mode: str = ENCODER_MODE) -> Encoder:
+    """ENCODER_MODE에 맞는 인코더 (local: 이 프로세스에 로드, shared: 서버에 연결)"""
+    if mode == "shared":
+        return SharedEncoder()
+    if mode != "local":
+        raise ValueError(f"지원하지 않는 ENCODER_MODE입니다: {mode}")
+    return load_encoder(model_name)
+
+# ===== ONNX 내보내기 / int8 양자화 =====
+def export_onnx(model_name: str, *, int8: bool = False, opset: int = 17) -> str:
+    import torch
+    from sentence_transformers import SentenceTransformer
+
+    out_dir = onnx_dir(model_name)
+    os.makedirs(out_dir, exist_ok=True)
+    st = SentenceTransformer(model_name, device="cpu")
+    hf = st[0].auto_model.eval()
+    tokenizer = st.tokenizer
+    dummy = tokenizer(["채용 공고 검색 예시 문장"], return_tensors="pt")
+    path = os.path.join(out_dir, ONNX_FILE)
+    with torch.no_grad():
+        torch.onnx.export(
+            hf,
+            (dummy["input_ids"], dummy["attention_mask"]),
+            path,
+            input_names=["input_ids", "attention_mask"],
+            output_names=["token_embeddings"],
+            dynamic_axes={
+                "input_ids": {0: "batch", 1: "seq"},
+                "attention_mask": {0: "batch", 1: "seq"},
+                "token_embeddings": {0: "batch", 1: "seq"},
+            },
+            opset_version=opset,
+        )
+    tokenizer.save_pretrained(out_dir)
+    if int8:
+        from onnxruntime.quantization import QuantType, quantize_dynamic
+        quantize_dynamic(path, os.path.join(out_dir, ONNX_INT8_FILE), weight_type=QuantType.QInt8)
+    return out_dir
+
+if __name__ == "__main__":
+    from repositories.rag_repositories.job_poasting_rag_repository import MODEL_NAME
+    cmd = sys.argv[1] if len(sys.argv) > 1 else ""
+    if cmd == "export":
+        print(f"exported -> {export_onnx(MODEL_NAME, int8='--int8' in sys.argv[2:])}")
+    elif cmd == "serve":
+        logging.basicConfig(level=logging.INFO)
+        serve_encoder(MODEL_NAME)
@@ -2,17 +2,99 @@
 # 백엔드 AI 부분에 들어가야하는 부분
 from __future__ import annotations
 
-from typing import List, Dict, Any, Tuple
-from sentence_transformers import SentenceTransformer
+import asyncio
+import logging
+import threading
+from concurrent.futures import ThreadPoolExecutor
+from dataclasses import dataclass
+from typing import List, Dict, Any, Optional, Tuple
 import numpy as np
-from utils.where_minimal import build_where_from_llm
-from database import vc_collection
+from utils.where_rules import build_where
+from utils.where_minimal import live_where
+from utils.where_cache import build_where_cache, normalize_query
+from utils.embedding_cache import QueryEmbeddingCache
+from utils.embedding_batcher import EmbeddingBatcher
+from utils.search_result_cache import (
+    SearchResultCache, RankedResult, encode_cursor, decode_cursor,
+)
+from repositories.rag_repositories.vector_store import get_vector_store
+from repositories.rag_repositories.encoder import Encoder, get_encoder
+from repositories.rag_repositories.lexical_index import INLINE_MAX_POSTINGS, lexical_index, rrf_fuse
+from repositories.rag_repositories.reranker import build_reranker
+from repositories.mongo_repositories.job_posting_mongodb_repository import JobPostingMongoDBRepository
+from settings import (
+    RAG_ENCODE_WORKERS, RAG_SEARCH_CONCURRENCY, EMBED_CACHE_MAX_MB,
+    SEARCH_RESULT_CACHE_SIZE, SEARCH_RESULT_CACHE_TTL_SECONDS, SEARCH_RESULT_POOL,
+    RAG_SCORE_MODE, SEARCH_LIVE_ONLY, RECO_PROFILE_WEIGHT,
+    SEARCH_HYBRID, SEARCH_HYBRID_POOL, SEARCH_RRF_K,
+    EMBED_BATCH_ENABLED, EMBED_BATCH_MAX_SIZE, EMBED_BATCH_MAX_WAIT_MS,
+)
+
+logger = logging.getLogger(__name__)
 
 # ── 설정(전역 상수) ──
 MAX_CHARS = 1100
 OVERLAP_CHARS = 150
 INDEX_IF_EMPTY_ONLY = True  # True면 컬렉션 비어있을 때만 인덱싱, False면 매 실행마다 add
-model = SentenceTransformer("paraphrase-multilingual-MiniLM-L12-v2")
+MAX_EXTEND_ROUNDS = 4       # 캐시된 랭킹이 요청 구간보다 짧을 때 한 요청에서 후보를 늘려 다시 만드는 최대 횟수
+MODEL_NAME = "paraphrase-multilingual-MiniLM-L12-v2"
+
+# ── 인코더: import 시점이 아니라 처음 쓸 때 로드 (ENCODER_BACKEND: torch | onnx | onnx-int8, ENCODER_MODE: local | shared) ──
+_model: Optional[Encoder] = None
+_model_lock = threading.Lock()
+
+def get_model() -> Encoder:
+    """블로킹(수 초) 가능 → 이벤트 루프에서는 스레드풀 안에서 호출"""
+    global _model
+    if _model is None:
+        with _model_lock:
+            if _model is None:
+                _model = get_encoder(MODEL_NAME)
+    return _model
+
+def model_loaded() -> bool:
+    return _model is not None
+
+def encode_texts(texts: List[str], **kwargs) -> np.ndarray:
+    return get_model().encode(texts, **kwargs)
+
+# ── 이벤트 루프 보호: 인코딩(CPU)은 전용 스레드풀, 검색 전체는 동시성 상한 ──
+_encode_executor = ThreadPoolExecutor(max_workers=RAG_ENCODE_WORKERS, thread_name_prefix="rag-encode")
+_search_slots = asyncio.Semaphore(RAG_SEARCH_CONCURRENCY)
+
+# ── 검색어 → where 절 캐시 (같은 검색어는 LLM 재호출 없음) ──
+where_cache = build_where_cache()
+
+# ── 쿼리 임베딩 캐시 (재검색/페이지 이동 시 인코딩 생략) ──
+query_embedding_cache = QueryEmbeddingCache(max_bytes=EMBED_CACHE_MAX_MB * 1024 * 1024)
+
+# ── 쿼리 임베딩 마이크로배처 (캐시 미스끼리 모아 배치 인코딩, 인코딩 스레드 수만큼 동시 실행) ──
+embedding_batcher = EmbeddingBatcher(
+    lambda texts: encode_texts(texts, batch_size=len(texts)),
+    executor=_encode_executor,
+    max_batch=EMBED_BATCH_MAX_SIZE,
+    max_wait_ms=EMBED_BATCH_MAX_WAIT_MS,
+    max_inflight=RAG_ENCODE_WORKERS,
+) if EMBED_BATCH_ENABLED else None
+
+# ── 검색 랭킹 캐시 (페이지 이동 시 재검색 없이 슬라이스) ──
+search_result_cache = SearchResultCache(
+    maxsize=SEARCH_RESULT_CACHE_SIZE, ttl_seconds=SEARCH_RESULT_CACHE_TTL_SECONDS,
+)
+
+# ── 크로스 인코더 재정렬 (RERANK_MODEL 설정 시에만) ──
+reranker = build_reranker()
+
+def warm_up() -> None:
+    """(블로킹) 인코더/재정렬 모델 로드 + 한 번 실행해 첫 검색 지연을 없앰. 앱 시작 시 백그라운드에서 호출"""
+    encode_texts(["워밍업"])
+    if reranker is not None:
+        reranker.load()
+
+def clear_search_caches() -> None:
+    """랭킹/쿼리 임베딩 캐시 비우기 (전체 재인덱싱 직후, 벤치마크의 cold 측정용). where 캐시는 유지"""
+    search_result_cache.clear()
+    query_embedding_cache.clear()
 
 # ── 페이징을 위해 후보 넉넉히 가져오는 n_results 계산 ──
 def _calc_n_results_for_paging(offset: int, limit: int, *, dup_factor: int = 5, floor: int = 100, ceil: int = 2000) -> int:
@@ -24,11 +106,53 @@ def _l2norm(v: np.ndarray) -> np.ndarray:
     n = np.linalg.norm(v, ord=2, axis=-1, keepdims=True) + 1e-12
     return v / n
 
+# ── 추천용 사용자 벡터: 정규화(w·프로필 + (1-w)·좋아한 공고 평균), w=RECO_PROFILE_WEIGHT ──
+def blend_user_vector(profile_vec: Optional[np.ndarray], liked_vecs: Optional[np.ndarray]) -> Optional[np.ndarray]:
+    parts = []
+    if profile_vec is not None:
+        parts.append((RECO_PROFILE_WEIGHT, _l2norm(profile_vec)))
+    if liked_vecs is not None and len(liked_vecs):
+        parts.append((1.0 - RECO_PROFILE_WEIGHT, _l2norm(_l2norm(liked_vecs).mean(axis=0))))
+    if not parts:
+        return None
+    total_w = sum(w for w, _ in parts) or 1.0
+    return _l2norm(sum(w * v for w, v in parts) / total_w).astype(np.float32)
+
+# ── score 계산 방식 ──
+# - distance: 컬렉션이 hnsw:space=cosine 이므로 score = 1 - distance (documents/embeddings 미수신)
+# - embedding: 임베딩을 받아 코사인을 직접 재계산 (기존 방식, 검증용)
+def _include_for(score_mode: str) -> List[str]:
+    if score_mode == "distance":
+        return ["metadatas", "distances"]
+    return ["documents", "metadatas", "embeddings"]
+
+# ── Chroma 응답 → score 내림차순 item 리스트 ──
+def _items_from_raw(raw: dict, q: np.ndarray) -> list:
+    metas  = (raw.get("metadatas") or [[]])[0]
+    if not metas:
+        return []
+    ids = (raw.get("ids") or [[None] * len(metas)])[0]
+
+    dists = (raw.get("distances") or [[]])[0]
+    if dists:
+        docs = (raw.get("documents") or [[None] * len(metas)])[0]
+        scores = 1.0 - np.asarray(dists, dtype=np.float32)
+    else:
+        docs = (raw.get("documents") or [[]])[0]
+        embs = (raw.get("embeddings") or [[]])[0]
+        E = _l2norm(np.asarray(embs))
+        scores = (E @ q)
+
+    items = [{"id": i, "doc": d, "meta": m, "score": float(s)}
+             for i, d, m, s in zip(ids, docs, metas, scores)]
+    items.sort(key=lambda x: x["score"], reverse=True)
+    return items
+
 # ── score 기반 통일 쿼리 (코사인 유사도 직접 계산) ──
 def query_with_scores(
     collection,
     query_text: str,
-    encoder,                      # SentenceTransformer
+    encoder,                      # Encoder (torch/onnx, encode 제공)
     where: dict | None = None,
     n_results: int = 50,
 ) -> list:
@@ -38,73 +162,329 @@ def query_with_scores(
     raw = collection.query(
         query_embeddings=q.reshape(1, -1).tolist(),
         n_results=n_results,
-        include=["documents", "metadatas", "embeddings"],
+        include=_include_for(RAG_SCORE_MODE),
         **({"where": where} if where else {})
     )
 
-    docs   = raw.get("documents", [[]])[0]
-    metas  = raw.get("metadatas", [[]])[0]
-    embs   = raw.get("embeddings", [[]])[0]
-    if not docs:
-        return []
+    return _items_from_raw(raw, q)
 
-    E = _l2norm(np.asarray(embs))
-    scores = (E @ q)
+# ── 쿼리 임베딩(비동기): 캐시 우선, 미스일 때만 인코딩 ──
+# encoder 생략 시 기본 모델 + 마이크로배처(동시 요청과 묶어서), 지정 시 전용 스레드풀에서 단건 인코딩
+async def encode_query_async(query_text: str, encoder=None, *, model_name: str = MODEL_NAME) -> np.ndarray:
+    cached = query_embedding_cache.get(query_text, model_name)
+    if cached is not None:
+        return cached
+    if encoder is None and embedding_batcher is not None:
+        q = await embedding_batcher.encode(query_text)
+    else:
+        loop = asyncio.get_running_loop()
+        encode = encoder.encode if encoder is not None else encode_texts
+        q = (await loop.run_in_executor(_encode_executor, encode, [query_text]))[0]
+    return query_embedding_cache.put(query_text, model_name, _l2norm(np.asarray(q)))
 
-    items = [{"doc": d, "meta": m, "score": float(s)}
-             for d, m, s in zip(docs, metas, scores)]
-    items.sort(key=lambda x: x["score"], reverse=True)
-    return items
+# ── 이미 인코딩된 쿼리 벡터로 Chroma(AsyncHttpClient) 조회 ──
+async def query_by_vector_async(
+    collection,                   # AsyncCollection
+    q: np.ndarray,                # L2 정규화된 쿼리 벡터
+    where: dict | None = None,
+    n_results: int = 50,
+) -> list:
+    raw = await collection.query(
+        query_embeddings=q.reshape(1, -1).tolist(),
+        n_results=n_results,
+        include=_include_for(RAG_SCORE_MODE),
+        **({"where": where} if where else {})
+    )
+
+    return _items_from_raw(raw, q)
+
+# ── query_with_scores의 비동기 버전 ──
+async def query_with_scores_async(
+    collection,                   # AsyncCollection
+    query_text: str,
+    encoder,                      # Encoder (torch/onnx, encode 제공)
+    where: dict | None = None,
+    n_results: int = 50,
+) -> list:
+    q = await encode_query_async(query_text, encoder)
+    return await query_by_vector_async(collection, q, where=where, n_results=n_results)
+
+# ── 재정렬 입력: 공고별 (source_id, content_hash, 최고 점수 청크 본문) ──
+async def _passages(
+    collection,
+    source_ids: List[str],
+    best_by_source: Dict[str, Tuple[float, Dict[str, Any]]],
+) -> List[Tuple[str, str, str]]:
+    texts: Dict[str, Tuple[str, str]] = {}
+    need_ids: Dict[str, str] = {}     # 청크 id → source_id (본문 미수신)
+    by_source: List[str] = []         # 키워드 검색으로만 들어온 공고 (청크 모름)
+    for sid in source_ids:
+        hit = best_by_source.get(sid)
+        if hit is None:
+            by_source.append(sid)
+            continue
+        it = hit[1]
+        h = (it["meta"] or {}).get("content_hash", "")
+        if it.get("doc"):
+            texts[sid] = (h, it["doc"])
+        elif it.get("id"):
+            need_ids[it["id"]] = sid
+
+    if need_ids:
+        raw = await collection.get(ids=list(need_ids), include=["documents", "metadatas"])
+        for cid, doc, meta in zip(raw.get("ids") or [], raw.get("documents") or [], raw.get("metadatas") or []):
+            if doc:
+                texts[need_ids[cid]] = ((meta or {}).get("content_hash", ""), doc)
+    if by_source:
+        raw = await collection.get(where={"source_id": {"$in": by_source}}, include=["documents", "metadatas"])
+        first: Dict[str, int] = {}
+        for doc, meta in zip(raw.get("documents") or [], raw.get("metadatas") or []):
+            sid = (meta or {}).get("source_id")
+            ci = meta.get("chunk_index", 0) if sid else 0
+            if doc and sid and ci < first.get(sid, 1 << 30):   # 공고당 첫 청크(회사/직무 머리말 포함)
+                first[sid] = ci
+                texts[sid] = (meta.get("content_hash", ""), doc)
+    return [(sid, *texts[sid]) for sid in source_ids if sid in texts]
+
+@dataclass
+class SearchPage:
+    job_ids: List[str]
+    total: int = 0                      # where 조건에 맞는 전체 공고 수 (페이지 크기가 아님)
+    next_cursor: Optional[str] = None   # 다음 페이지가 없으면 None
 
 class JobPostingRagRepository:
+    def __init__(self, mongo_repo: Optional[JobPostingMongoDBRepository] = None):
+        # 검색 결과 전체 개수는 벡터 저장소를 훑지 않고 Mongo count로 (캐시됨)
+        self.mongo = mongo_repo or JobPostingMongoDBRepository()
+
     # ── 검색: 랭킹 전체에서 offset/limit 구간의 job_id(source_id)만 반환 ──
-    def search(
+    async def search(
         self,
         query: str,
         *,
         offset: int,
         limit: int,
-    ) -> List[str]:
+        cursor: Optional[str] = None,
+    ) -> SearchPage:
         """
         입력 query로 검색하고, score 기준으로 랭킹된 문서의 job_id(source_id)를
         offset/limit 페이지네이션으로 잘라 반환한다.
+        - LLM/Chroma 호출은 비동기, 인코딩은 스레드풀에서 실행되어 이벤트 루프를 막지 않는다.
+        - 워커당 동시 검색 수는 RAG_SEARCH_CONCURRENCY로 제한한다.
+        - dedup된 전체 랭킹은 잠깐 캐시되어 다음 페이지는 캐시를 잘라서 응답한다.
+        - cursor(이전 응답의 next_cursor)를 주면 offset 대신 cursor의 스냅샷/위치를 사용한다.
+          다른 검색어로 만든 cursor면 ValueError.
+        """
+        key = search_result_cache.make_key(normalize_query(query), MODEL_NAME)
+        if cursor:
+            snapshot_id, offset = decode_cursor(cursor)
+            if not search_result_cache.snapshot_belongs_to(snapshot_id, key):
+                raise ValueError("다른 검색어의 cursor입니다.")
+            ranked = search_result_cache.get_snapshot(snapshot_id)
+        else:
+            ranked = search_result_cache.get(key)
+
+        if ranked is None or not ranked.covers(offset, limit):
+            async with _search_slots:
+                # 공고당 청크 수가 많으면 한 번 늘려서는 깊은 페이지에 못 미칠 수 있음 → 구간을 덮거나 후보가 바닥날 때까지
+                for _ in range(MAX_EXTEND_ROUNDS):
+                    ranked = await self._rank(query, key, offset=offset, limit=limit, prev=ranked)
+                    if ranked.covers(offset, limit):
+                        break
+        return self._page(ranked, offset, limit)
+
+    @staticmethod
+    def _page(ranked: RankedResult, offset: int, limit: int) -> SearchPage:
+        job_ids = ranked.page(offset, limit)
+        end = max(0, offset) + len(job_ids)
+        has_more = end < len(ranked.source_ids) or not ranked.exhausted
+        next_cursor = encode_cursor(ranked.snapshot_id, end) if job_ids and has_more else None
+        return SearchPage(job_ids=job_ids, total=ranked.total, next_cursor=next_cursor)
+
+    async def _rank(
+        self,
+        query: str,
+        key: str,
+        *,
+        offset: int,
+        limit: int,
+        prev: Optional[RankedResult] = None,
+    ) -> RankedResult:
+        """
+        Chroma에서 후보를 받아 source_id 단위로 dedup한 전체 랭킹을 만들어 캐시에 넣는다.
+        - prev가 있으면(캐시된 랭킹이 요청 구간보다 짧으면) 후보 수를 늘려 같은 스냅샷 id로 다시 만든다.
+          늘리는 양은 prev에서 본 공고당 청크 수로 요청 구간을 덮도록 잡고(최소 2배), 상한(ceil)은 두지 않는다.
+          prev 구간은 그대로 두고 새 공고만 뒤에 붙인다.
+        - 요청한 후보 수보다 적게 받으면 랭킹이 완전(exhausted)해져 이후 모든 페이지는 캐시에서 응답한다.
+        - 전체 개수(total): 랭킹이 완전하면 그 길이, 아니면 같은 조건의 Mongo count(캐시)를
+          랭킹과 동시에 세어 둔 값 (확장할 때는 처음 센 값을 재사용).
+        - 키워드 색인이 준비돼 있으면(SEARCH_HYBRID) BM25 상위와 벡터 랭킹을 RRF로 합친다.
+          키워드가 정확히 맞는 공고를 끌어올리므로 벡터 후보는 더 적게(SEARCH_HYBRID_POOL) 받는다.
         """
-        where_cond = build_where_from_llm(query) or None
+        collection = await get_vector_store()
+
+        async def resolve_where():
+            where = await where_cache.get_or_build(query, build_where) or None
+            if SEARCH_LIVE_ONLY:
+                # 마감/비활성 공고는 후보에서 빼서 n_results를 진행 중 공고에만 쓴다 (캐시된 where는 그대로 둠)
+                where = live_where(where)
+            return where
+
+        # where 추출(규칙 → 필요 시 LLM)과 쿼리 임베딩은 서로 독립 → 동시에 시작해서 둘 다 끝나면 조인
+        where_cond, q_vec = await asyncio.gather(resolve_where(), encode_query_async(query))
 
-        # 청크 중복을 감안해 후보를 넉넉히 가져옴
-        n_results = _calc_n_results_for_paging(offset, limit)
+        # 전체 개수는 랭킹과 동시에 (랭킹이 완전하면 쓰지 않고 취소)
+        count_task = asyncio.create_task(self._count(where_cond)) if prev is None else None
+        try:
+            hybrid = SEARCH_HYBRID and lexical_index.ready
 
-        items = query_with_scores(
-            collection=vc_collection,
-            query_text=query,
-            encoder=model,
+            # 청크 중복을 감안해 후보를 넉넉히 가져옴 (캐시해서 여러 페이지에 재사용하므로 최소 SEARCH_RESULT_POOL)
+            pool = SEARCH_HYBRID_POOL if hybrid else SEARCH_RESULT_POOL
+            n_results = _calc_n_results_for_paging(offset, limit, floor=pool)
+            if prev is not None:
+                chunks_per_source = prev.n_results / max(1, len(prev.source_ids))
+                n_results = max(n_results, prev.n_results * 2,
+                                int((offset + limit) * chunks_per_source * 1.25))
+
+            items = await query_by_vector_async(
+                collection=collection,
+                q=q_vec,
+                where=where_cond,
+                n_results=n_results,
+            )
+
+            # 문서(source_id) 단위로 dedup하면서 최고 점수만 유지
+            best_by_source: Dict[str, Tuple[float, Dict[str, Any]]] = {}   # source_id → (score, 최고 점수 청크 item)
+            for it in items:
+                meta = it["meta"] or {}
+                sid = meta.get("source_id")  # == job_id (Mongo _id 문자열)
+                if not sid:
+                    continue
+                sc = it["score"]
+                if (sid not in best_by_source) or (sc > best_by_source[sid][0]):
+                    best_by_source[sid] = (sc, it)
+
+            ranked_all = [(sid, sc) for sid, (sc, _) in
+                          sorted(best_by_source.items(), key=lambda x: x[1][0], reverse=True)]
+            if hybrid:
+                lex = await self._lexical(query, where_cond, k=n_results)
+                ranked_all = rrf_fuse([[sid for sid, _ in ranked_all], [sid for sid, _ in lex]], k=SEARCH_RRF_K)
+            if prev is not None:
+                # 이미 응답한 구간은 순서를 고정하고 새로 나온 공고만 뒤에 붙인다
+                # (후보가 늘면 RRF/재정렬 순서가 바뀌어 페이지 사이에 중복/누락이 생기므로)
+                served = set(prev.source_ids)
+                ranked_all = list(zip(prev.source_ids, prev.scores.tolist())) + \
+                    [(sid, sc) for sid, sc in ranked_all if sid not in served]
+                reusable = prev.reusable
+            else:
+                # 재정렬이 빠진 랭킹(예산 초과/백로그/오류)은 이 cursor의 페이징에만 쓰고 검색어 캐시에는 안 넣는다
+                # → 같은 검색어의 다음 요청은 채워진 점수 캐시로 다시 재정렬
+                reusable = True
+                if reranker is not None and ranked_all:
+                    reordered = await self._rerank(collection, query, ranked_all, best_by_source)
+                    reusable = reordered is not None
+                    if reordered is not None:
+                        ranked_all = reordered
+
+            exhausted = len(items) < n_results
+            if exhausted:
+                total = len(ranked_all)
+            elif count_task is not None:
+                total = max(await count_task, len(ranked_all))
+            else:
+                total = max(prev.total, len(ranked_all))
+        finally:
+            if count_task is not None and not count_task.done():
+                count_task.cancel()
+
+        ranked = RankedResult(
+            snapshot_id=prev.snapshot_id if prev is not None else search_result_cache.new_snapshot_id(key),
             where=where_cond,
+            source_ids=[sid for sid, _ in ranked_all],
+            scores=np.asarray([sc for _, sc in ranked_all], dtype=np.float32),
             n_results=n_results,
+            exhausted=exhausted,
+            total=total,
+            reusable=reusable,
         )
-        if not items:
-            return []
+        search_result_cache.put(key, ranked)
+        return ranked
 
-        # 문서(source_id) 단위로 dedup하면서 최고 점수만 유지
-        best_by_source: Dict[str, Tuple[float, Dict[str, Any]]] = {}
-        for it in items:
-            meta = it["meta"] or {}
-            sid = meta.get("source_id")  # == job_id (Mongo _id 문자열)
-            if not sid:
-                continue
-            sc = it["score"]
-            if (sid not in best_by_source) or (sc > best_by_source[sid][0]):
-                best_by_source[sid] = (sc, meta)
-
-        ranked_all = sorted(best_by_source.items(), key=lambda x: x[1][0], reverse=True)
-        total = len(ranked_all)
-        if total == 0:
-            return []
+    async def _count(self, where: Optional[dict]) -> int:
+        # 개수는 응답의 total에만 쓰이므로 실패해도 검색은 계속 (랭킹 길이로 대신함)
+        try:
+            return await self.mongo.count_matching(where)
+        except Exception:
+            logger.exception("검색 결과 개수 조회 실패")
+            return 0
+
+    @staticmethod
+    async def _rerank(
+        collection,
+        query: str,
+        ranked_all: List[Tuple[str, float]],
+        best_by_source: Dict[str, Tuple[float, Dict[str, Any]]],
+    ) -> Optional[List[Tuple[str, float]]]:
+        """
+        상위 RERANK_TOP_N개만 크로스 인코더 순서로 바꾸고 나머지는 그대로 둔다.
+        재정렬하지 못하면(시간 예산 초과 등) None. scores는 1차 점수를 그대로 둔다.
+        """
+        head = ranked_all[:reranker.top_n]
+        passages = await _passages(collection, [sid for sid, _ in head], best_by_source)
+        order = await reranker.rerank(normalize_query(query), passages)
+        if order is None:
+            return None
+        first = dict(head)
+        reordered = [(sid, first[sid]) for sid in order]
+        seen = set(order)
+        reordered += [x for x in head if x[0] not in seen]   # 본문을 못 찾은 공고는 뒤로
+        return reordered + ranked_all[reranker.top_n:]
+
+    @staticmethod
+    async def _lexical(query: str, where: Optional[dict], k: int) -> List[Tuple[str, float]]:
+        # 색인이 작으면 바로, 크면 스레드에서 (BM25 누적이 공고 수에 비례, 동기화 워커의 변경과는 색인 락으로 직렬화)
+        if len(lexical_index) <= INLINE_MAX_POSTINGS:
+            return lexical_index.search(query, where, k)
+        return await asyncio.to_thread(lexical_index.search, query, where, k)
 
-        # 페이지 슬라이스
-        start = max(0, offset)
-        end = min(total, offset + limit)
-        if start >= total:
+    # ── 추천: 프로필 텍스트 + 좋아한 공고 벡터로 사용자 벡터를 만들어 진행 중 공고를 랭킹 ──
+    async def recommend(self, profile_text: str, liked_ids: List[str], *, n: int) -> List[str]:
+        """
+        사용자 벡터는 blend_user_vector (프로필 임베딩 + 좋아한 공고 청크 평균 벡터).
+        둘 다 없으면 빈 리스트. 좋아한 공고 자체는 결과에서 뺀다.
+        """
+        collection = await get_vector_store()
+        profile_vec = liked_vecs = None
+
+        if profile_text:
+            # 프로필은 검색어가 아니므로 쿼리 임베딩 캐시에 넣지 않음 (추천 결과 자체가 캐시됨)
+            loop = asyncio.get_running_loop()
+            p = await loop.run_in_executor(_encode_executor, encode_texts, [profile_text])
+            profile_vec = np.asarray(p, dtype=np.float32)[0]
+
+        if liked_ids:
+            raw = await collection.get(where={"source_id": {"$in": liked_ids}}, include=["embeddings"])
+            embs = raw.get("embeddings")
+            if embs is not None and len(embs):
+                liked_vecs = np.asarray(embs, dtype=np.float32)
+
+        u = blend_user_vector(profile_vec, liked_vecs)
+        if u is None:
             return []
 
-        job_ids = [sid for sid, _ in ranked_all[start:end]]
-        return job_ids
+        items = await query_by_vector_async(
+            collection=collection,
+            q=u,
+            where=live_where(None) if SEARCH_LIVE_ONLY else None,
+            n_results=n * 3,   # 공고당 청크 중복 감안
+        )
+        exclude = set(liked_ids)
+        out: List[str] = []
+        for it in items:   # score 내림차순 → 처음 나온 청크가 공고의 최고 점수
+            sid = (it["meta"] or {}).get("source_id")
+            if sid and sid not in exclude:
+                exclude.add(sid)
+                out.append(sid)
+                if len(out) >= n:
+                    break
+        return out
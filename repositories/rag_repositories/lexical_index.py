@@ -0,0 +1,213 @@
+# repositories/rag_repositories/lexical_index.py
+# 프로세스 내 BM25 역색인 (하이브리드 검색의 키워드 쪽)
+# - 토큰: 영문/숫자 단어(kotlin, c++, node.js) + 한글은 음절 bigram (조사/띄어쓰기 차이에 강함)
+# - 필드 가중치: 회사명·skill_tags ×3, 직무 ×2, 상세 본문 ×1 (토큰 반복으로 반영)
+# - where 절은 벡터 저장소와 같은 MetadataColumns로 평가 (status/due_ts 포함)
+# - 공고 단위 upsert/delete로 증분 갱신 (동기화 워커가 호출)
+# - 변경과 검색은 락으로 직렬화: 색인이 크면(INLINE_MAX_POSTINGS 초과) 둘 다 스레드에서 돌므로
+#   검색 중에 dict/배열이 바뀌지 않도록 (작을 때는 둘 다 이벤트 루프라 경합 없음)
+from __future__ import annotations
+
+import math
+import re
+import threading
+from collections import Counter
+from typing import Any, Dict, List, Optional, Sequence, Tuple
+
+import numpy as np
+
+from repositories.rag_repositories.vector_store import MetadataColumns
+
+_TOKEN_RE = re.compile(r"[a-z0-9][a-z0-9+#.]*|[가-힣]+")
+
+INLINE_MAX_POSTINGS = 20_000   # 이 이하면 검색/변경을 이벤트 루프에서 바로 (BM25 누적이 공고 수에 비례)
+
+_BM25_K1 = 1.2
+_BM25_B = 0.75
+
+# (필드 경로, 가중치)
+FIELD_WEIGHTS: List[Tuple[str, int]] = [
+    ("company.name", 3),
+    ("skill_tags", 3),
+    ("detail.position.job", 2),
+    ("detail.position.jobGroup", 2),
+    ("detail.intro", 1),
+    ("detail.main_tasks", 1),
+    ("detail.requirements", 1),
+    ("detail.preferred_points", 1),
+    ("detail.benefits", 1),
+]
+
+def tokenize(text: str) -> List[str]:
+    out: List[str] = []
+    for t in _TOKEN_RE.findall((text or "").lower()):
+        if "가" <= t[0] <= "힣":
+            if len(t) == 1:
+                out.append(t)
+            else:
+                out.extend(t[i:i + 2] for i in range(len(t) - 1))
+        else:
+            t = t.rstrip(".")
+            if t:
+                out.append(t)
+    return out
+
+def _field(doc: Dict[str, Any], path: str) -> str:
+    v: Any = doc
+    for part in path.split("."):
+        v = v.get(part) if isinstance(v, dict) else None
+        if v is None:
+            return ""
+    if isinstance(v, (list, tuple)):
+        return " ".join(str(x) for x in v if x)
+    return str(v)
+
+def doc_terms(doc: Dict[str, Any]) -> Counter:
+    tf: Counter = Counter()
+    for path, weight in FIELD_WEIGHTS:
+        for t in tokenize(_field(doc, path)):
+            tf[t] += weight
+    return tf
+
+def rrf_fuse(rankings: Sequence[Sequence[str]], k: int = 60) -> List[Tuple[str, float]]:
+    """Reciprocal Rank Fusion: score = Σ 1 / (k + rank), rank는 1부터"""
+    scores: Dict[str, float] = {}
+    for ranking in rankings:
+        for r, sid in enumerate(ranking, start=1):
+            scores[sid] = scores.get(sid, 0.0) + 1.0 / (k + r)
+    return sorted(scores.items(), key=lambda x: x[1], reverse=True)
+
+class LexicalIndex:
+    def __init__(self):
+        self._ids: List[str] = []
+        self._pos: Dict[str, int] = {}
+        self._metas: List[Optional[Dict[str, Any]]] = []
+        self._lens: List[int] = []
+        self._terms: List[Dict[str, int]] = []            # 문서별 term → tf (삭제/갱신용)
+        self._postings: Dict[str, Dict[int, int]] = {}    # term → {문서 번호: tf}
+        self._alive: List[bool] = []
+        self._n_alive = 0
+        self._total_len = 0
+        self.ready = False
+        self._cols = MetadataColumns()  # where 필터 (변경된 행만 갱신)
+        # 검색 시 지연 생성 (변경되면 무효화)
+        self._arrays: Dict[str, Tuple[np.ndarray, np.ndarray]] = {}
+        self._lock = threading.Lock()
+
+    def __len__(self) -> int:
+        return self._n_alive
+
+    # ── 변경 ──
+    def upsert(self, doc: Dict[str, Any], meta: Dict[str, Any]) -> None:
+        """공고 원본(dict)과 벡터 저장소에 쓰는 것과 같은 메타데이터로 색인"""
+        with self._lock:
+            self._upsert(doc, meta)
+
+    def delete(self, source_id: str) -> None:
+        with self._lock:
+            self._delete(source_id)
+
+    def apply(self, upserts: Sequence[Tuple[Dict[str, Any], Dict[str, Any]]], deletes: Sequence[str]) -> None:
+        """동기화 배치 하나를 락 한 번으로 반영 (upserts: (공고 원본, 메타데이터))"""
+        with self._lock:
+            for doc, meta in upserts:
+                self._upsert(doc, meta)
+            for sid in deletes:
+                self._delete(sid)
+
+    def _upsert(self, doc: Dict[str, Any], meta: Dict[str, Any]) -> None:
+        sid = meta["source_id"]
+        tf = doc_terms(doc)
+        i = self._pos.get(sid)
+        if i is None:
+            i = len(self._ids)
+            self._pos[sid] = i
+            self._ids.append(sid)
+            self._metas.append(None)
+            self._lens.append(0)
+            self._terms.append({})
+            self._alive.append(False)
+        else:
+            self._unlink(i)
+        for t, c in tf.items():
+            self._postings.setdefault(t, {})[i] = c
+            self._arrays.pop(t, None)
+        self._terms[i] = dict(tf)
+        self._metas[i] = meta
+        self._lens[i] = sum(tf.values())
+        self._alive[i] = True
+        self._n_alive += 1
+        self._total_len += self._lens[i]
+        self._cols.set_rows({i: meta}, len(self._ids))
+
+    def _delete(self, source_id: str) -> None:
+        i = self._pos.get(source_id)
+        if i is not None and self._alive[i]:
+            self._unlink(i)
+            self._metas[i] = None
+            self._cols.set_rows({i: None})
+
+    def _unlink(self, i: int) -> None:
+        if not self._alive[i]:
+            return
+        for t in self._terms[i]:
+            plist = self._postings.get(t)
+            if plist is not None:
+                plist.pop(i, None)
+                if not plist:
+                    del self._postings[t]
+            self._arrays.pop(t, None)
+        self._terms[i] = {}
+        self._alive[i] = False
+        self._n_alive -= 1
+        self._total_len -= self._lens[i]
+
+    # ── 검색 ──
+    def _term_arrays(self, t: str) -> Optional[Tuple[np.ndarray, np.ndarray]]:
+        arr = self._arrays.get(t)
+        if arr is None:
+            plist = self._postings.get(t)
+            if not plist:
+                return None
+            arr = (np.fromiter(plist.keys(), dtype=np.int64, count=len(plist)),
+                   np.fromiter(plist.values(), dtype=np.float32, count=len(plist)))
+            self._arrays[t] = arr
+        return arr
+
+    def search(self, query: str, where: Optional[dict] = None, k: int = 100) -> List[Tuple[str, float]]:
+        """BM25 점수 상위 k개 (source_id, score). 키워드가 하나도 안 맞는 공고는 제외"""
+        terms = set(tokenize(query))
+        if not terms:
+            return []
+        with self._lock:
+            return self._search(terms, where, k)
+
+    def _search(self, terms: set, where: Optional[dict], k: int) -> List[Tuple[str, float]]:
+        if not self._n_alive:
+            return []
+        n = len(self._ids)
+        avgdl = self._total_len / self._n_alive
+        lens = np.asarray(self._lens, dtype=np.float32)
+        scores = np.zeros(n, dtype=np.float32)
+        for t in terms:
+            arr = self._term_arrays(t)
+            if arr is None:
+                continue
+            idx, tf = arr
+            df = len(idx)
+            idf = math.log(1.0 + (self._n_alive - df + 0.5) / (df + 0.5))
+            denom = tf + _BM25_K1 * (1.0 - _BM25_B + _BM25_B * lens[idx] / avgdl)
+            scores[idx] += idf * tf * (_BM25_K1 + 1.0) / denom
+
+        if where:
+            scores[~self._cols.mask(where)] = 0.0
+        scores[~np.asarray(self._alive, dtype=bool)] = 0.0
+
+        cand = np.flatnonzero(scores > 0)
+        if len(cand) > k:
+            cand = cand[np.argpartition(-scores[cand], k - 1)[:k]]
+        cand = cand[np.argsort(-scores[cand])]
+        return [(self._ids[i], float(scores[i])) for i in cand]
+
+# 프로세스 공용 인스턴스 (services.job_posting_indexer.build_lexical_index가 채움)
+lexical_index = LexicalIndex()
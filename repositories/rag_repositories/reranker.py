@@ -0,0 +1,129 @@
+# repositories/rag_repositories/reranker.py
+# 크로스 인코더 재정렬 (선택): 1차 랭킹 상위 N개를 (검색어, 공고 본문) 쌍으로 한 번에 점수화
+# - RERANK_MODEL이 비어 있으면 비활성
+# - 시간 예산(RERANK_BUDGET_MS)을 넘기면 1차(바이 인코더/RRF) 순서를 그대로 사용
+#   (넘겨도 계산은 끝까지 돌아 점수 캐시를 채우므로 다음 요청부터는 빨라짐)
+# - 실행/대기 중인 배치가 RERANK_MAX_PENDING개면 새 배치를 넣지 않고 1차 순서 사용 (느린 모델에서 백로그 누적 방지)
+# - 모델 로드/추론 오류도 1차 순서로 대체 (로그만 남김)
+# - 점수 캐시 키: (정규화된 검색어, source_id, content_hash) → 공고 내용이 바뀌면 자동 무효화
+#   (LRUCache는 스레드 안전하지 않으므로 읽기/쓰기 모두 이벤트 루프에서만, 추론 스레드는 점수만 반환)
+from __future__ import annotations
+
+import asyncio
+import functools
+import logging
+from concurrent.futures import ThreadPoolExecutor
+from typing import Dict, List, Optional, Sequence, Tuple
+
+from cachetools import LRUCache
+
+from settings import RERANK_MODEL, RERANK_TOP_N, RERANK_BUDGET_MS, RERANK_MAX_PENDING, RERANK_CACHE_SIZE
+
+logger = logging.getLogger(__name__)
+
+# (source_id, content_hash, 본문)
+Passage = Tuple[str, str, str]
+
+class CrossEncoderReranker:
+    def __init__(self, model_name: str, *, top_n: int, budget_ms: int, cache_size: int,
+                 max_pending: int = RERANK_MAX_PENDING):
+        self.model_name = model_name
+        self.top_n = top_n
+        self.budget = budget_ms / 1000.0
+        self.max_pending = max_pending
+        self._model = None
+        self._executor = ThreadPoolExecutor(max_workers=1, thread_name_prefix="rag-rerank")
+        self._pending = 0
+        self._scores: LRUCache = LRUCache(maxsize=cache_size)
+        self.calls = 0
+        self.timeouts = 0
+        self.skipped = 0
+        self.errors = 0
+        self.cached_pairs = 0
+        self.scored_pairs = 0
+
+    def load(self):
+        if self._model is None:
+            from sentence_transformers import CrossEncoder
+            self._model = CrossEncoder(self.model_name, max_length=512)
+        return self._model
+
+    def _predict(self, query_norm: str, passages: Sequence[Passage]) -> List[float]:
+        """한 번의 배치 forward로 점수 계산 (전용 스레드에서 실행, 캐시 기록은 _done에서)"""
+        model = self.load()
+        scores = model.predict([(query_norm, text) for _, _, text in passages],
+                               batch_size=len(passages), show_progress_bar=False)
+        return [float(s) for s in scores]
+
+    def score_sync(self, query_norm: str, passages: Sequence[Passage]) -> List[float]:
+        """캐시 없이 바로 점수 계산 (벤치마크용)"""
+        return self._predict(query_norm, passages)
+
+    async def rerank(self, query_norm: str, passages: Sequence[Passage]) -> Optional[List[str]]:
+        """
+        passages를 크로스 인코더 점수 내림차순 source_id 목록으로 반환.
+        시간 예산 초과 / 백로그가 참 / 오류면 None (호출자는 1차 순서 유지).
+        """
+        self.calls += 1
+        scores: Dict[str, float] = {}
+        missing: List[Passage] = []
+        for sid, h, text in passages:
+            s = self._scores.get((query_norm, sid, h))
+            if s is None:
+                missing.append((sid, h, text))
+            else:
+                scores[sid] = s
+        self.cached_pairs += len(passages) - len(missing)
+
+        if missing:
+            if self._pending >= self.max_pending:
+                self.skipped += 1
+                return None
+            loop = asyncio.get_running_loop()
+            fut = loop.run_in_executor(self._executor, self._predict, query_norm, missing)
+            self._pending += 1
+            fut.add_done_callback(functools.partial(self._done, query_norm, missing))
+            try:
+                # shield: 예산 초과로 기다림을 멈춰도 계산은 끝까지 돌아 캐시를 채운다
+                new = await asyncio.wait_for(asyncio.shield(fut), timeout=self.budget)
+            except asyncio.TimeoutError:
+                self.timeouts += 1
+                return None
+            except Exception:
+                return None             # 로그는 _done에서
+            scores.update({sid: s for (sid, _, _), s in zip(missing, new)})
+
+        order = {sid: i for i, (sid, _, _) in enumerate(passages)}
+        return sorted(scores, key=lambda sid: (-scores[sid], order[sid]))
+
+    def _done(self, query_norm: str, passages: Sequence[Passage], fut: "asyncio.Future") -> None:
+        """(이벤트 루프) 배치가 끝나면 예산 초과로 응답에 못 쓴 경우에도 점수 캐시를 채운다"""
+        self._pending -= 1
+        if fut.cancelled():
+            return
+        if fut.exception() is not None:
+            self.errors += 1
+            logger.error("rerank 실패", exc_info=fut.exception())
+            return
+        for (sid, h, _), s in zip(passages, fut.result()):
+            self._scores[(query_norm, sid, h)] = s
+        self.scored_pairs += len(passages)
+
+    def stats(self) -> Dict[str, int]:
+        return {
+            "calls": self.calls,
+            "timeouts": self.timeouts,
+            "skipped": self.skipped,
+            "errors": self.errors,
+            "pending": self._pending,
+            "cached_pairs": self.cached_pairs,
+            "scored_pairs": self.scored_pairs,
+            "cache_entries": len(self._scores),
+        }
+
+def build_reranker() -> Optional[CrossEncoderReranker]:
+    if not RERANK_MODEL:
+        return None
+    return CrossEncoderReranker(
+        RERANK_MODEL, top_n=RERANK_TOP_N, budget_ms=RERANK_BUDGET_MS, cache_size=RERANK_CACHE_SIZE,
+    )
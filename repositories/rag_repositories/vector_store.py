@@ -0,0 +1,535 @@
+# repositories/rag_repositories/vector_store.py
+# 벡터 저장소 선택 (VECTOR_BACKEND)
+# - chroma: 원격 Chroma HttpClient (기존)
+# - local : 프로세스 내 인덱스 (메모리 맵 스냅샷 로드, 네트워크 없음)
+# 두 구현 모두 Chroma AsyncCollection과 같은 메서드(query/get/upsert/delete/count)를 제공한다.
+from __future__ import annotations
+
+import asyncio
+import json
+import os
+import shutil
+import sys
+import threading
+from contextlib import contextmanager
+from typing import Any, Dict, List, Optional, Sequence
+
+import numpy as np
+
+from settings import VECTOR_BACKEND, VECTOR_SNAPSHOT_PATH, VECTOR_HNSW_MIN_ROWS
+
+try:  # 대규모 인덱스용 (선택 의존성, 없으면 브루트포스만 사용)
+    import hnswlib
+except ImportError:
+    hnswlib = None
+
+_INLINE_MAX_ROWS = 20_000   # 이 이하면 이벤트 루프에서 바로 계산 (< 1ms)
+
+# ===== where 평가 (Chroma 메타데이터 필터와 같은 의미) =====
+class MetadataColumns:
+    """메타데이터를 키별 범주형 코드(int32) + 숫자(float64) 컬럼으로 들고 있는 필터 인덱스"""
+    def __init__(self, metadatas: Sequence[Optional[Dict[str, Any]]] = ()):
+        self.n = 0
+        self._cap = 0           # 컬럼 배열 길이 (행을 하나씩 붙여도 재할당이 O(log n)번이 되도록 두 배씩)
+        self.codes: Dict[str, np.ndarray] = {}
+        self.vocab: Dict[str, Dict[Any, int]] = {}
+        self.nums: Dict[str, np.ndarray] = {}
+        self.set_rows(dict(enumerate(metadatas)), len(metadatas))
+
+    # ── 증분 갱신 (전체 재구성 없이 바뀐 행만) ──
+    def set_rows(self, rows: Dict[int, Optional[Dict[str, Any]]], n: Optional[int] = None) -> None:
+        """행 수를 n으로 늘리고(새 행은 빈 값) rows의 행 메타데이터를 통째로 교체"""
+        n = self.n if n is None else n
+        if n > self._cap:
+            cap = max(n, self._cap * 2)
+            grow = cap - self._cap
+            for k in self.codes:
+                self.codes[k] = np.concatenate([self.codes[k], np.full(grow, -1, dtype=np.int32)])
+                self.nums[k] = np.concatenate([self.nums[k], np.full(grow, np.nan)])
+            self._cap = cap
+        self.n = max(self.n, n)
+        for i, m in rows.items():
+            for k in self.codes:
+                self.codes[k][i] = -1
+                self.nums[k][i] = np.nan
+            for k, v in (m or {}).items():
+                if v is None:
+                    continue
+                if k not in self.codes:
+                    self.codes[k] = np.full(self._cap, -1, dtype=np.int32)
+                    self.nums[k] = np.full(self._cap, np.nan)
+                    self.vocab[k] = {}
+                vocab = self.vocab[k]
+                self.codes[k][i] = vocab.setdefault(v, len(vocab))
+                if isinstance(v, (int, float)) and not isinstance(v, bool):
+                    self.nums[k][i] = v
+
+    def copy(self) -> "MetadataColumns":
+        out = MetadataColumns()
+        out.n = out._cap = self.n
+        out.codes = {k: v[:self.n].copy() for k, v in self.codes.items()}
+        out.nums = {k: v[:self.n].copy() for k, v in self.nums.items()}
+        out.vocab = {k: dict(v) for k, v in self.vocab.items()}
+        return out
+
+    def take(self, keep: np.ndarray) -> "MetadataColumns":
+        """keep 행만 남긴 새 인덱스 (삭제 후 행 번호 압축)"""
+        out = MetadataColumns()
+        out.n = out._cap = len(keep)
+        out.codes = {k: v[keep] for k, v in self.codes.items()}
+        out.nums = {k: v[keep] for k, v in self.nums.items()}
+        out.vocab = {k: dict(v) for k, v in self.vocab.items()}
+        return out
+
+    def _code(self, key: str, value: Any) -> int:
+        return self.vocab.get(key, {}).get(value, -2)     # -2: 어떤 행과도 안 맞음
+
+    def _col(self, key: str) -> np.ndarray:
+        col = self.codes.get(key)
+        return col[:self.n] if col is not None else np.full(self.n, -1, dtype=np.int32)
+
+    def _num(self, key: str) -> np.ndarray:
+        col = self.nums.get(key)
+        return col[:self.n] if col is not None else np.full(self.n, np.nan)
+
+    def mask(self, where: Optional[dict]) -> np.ndarray:
+        if not where:
+            return np.ones(self.n, dtype=bool)
+        out = np.ones(self.n, dtype=bool)
+        for key, cond in where.items():
+            if key == "$and":
+                for sub in cond:
+                    out &= self.mask(sub)
+            elif key == "$or":
+                acc = np.zeros(self.n, dtype=bool)
+                for sub in cond:
+                    acc |= self.mask(sub)
+                out &= acc
+            elif isinstance(cond, dict):
+                for op, val in cond.items():
+                    out &= self._op(key, op, val)
+            else:
+                out &= self._op(key, "$eq", cond)
+        return out
+
+    def _op(self, key: str, op: str, val: Any) -> np.ndarray:
+        if op == "$eq":
+            return self._col(key) == self._code(key, val)
+        if op == "$ne":
+            return self._col(key) != self._code(key, val)
+        if op in ("$in", "$nin"):
+            m = np.isin(self._col(key), [self._code(key, v) for v in val])
+            return m if op == "$in" else ~m
+        with np.errstate(invalid="ignore"):
+            x = self._num(key)
+            if op == "$gt":
+                return x > val
+            if op == "$gte":
+                return x >= val
+            if op == "$lt":
+                return x < val
+            if op == "$lte":
+                return x <= val
+        raise ValueError(f"지원하지 않는 where 연산자입니다: {op}")
+
+# ===== 프로세스 내 벡터 인덱스 =====
+_HNSW_SLACK = 0.25   # 빈 자리(추가용)/삭제 표시 비율. 이를 넘으면 HNSW를 새로 만들며 압축
+
+class _RWLock:
+    """검색(읽기)끼리는 동시에, 변경(쓰기)은 단독으로. 기다리는 쓰기가 있으면 새 읽기는 뒤로"""
+    def __init__(self):
+        self._cond = threading.Condition()
+        self._readers = 0
+        self._writing = False
+        self._writers_waiting = 0
+
+    @contextmanager
+    def read(self):
+        with self._cond:
+            while self._writing or self._writers_waiting:
+                self._cond.wait()
+            self._readers += 1
+        try:
+            yield
+        finally:
+            with self._cond:
+                self._readers -= 1
+                if not self._readers:
+                    self._cond.notify_all()
+
+    @contextmanager
+    def write(self):
+        with self._cond:
+            self._writers_waiting += 1
+            while self._writing or self._readers:
+                self._cond.wait()
+            self._writers_waiting -= 1
+            self._writing = True
+        try:
+            yield
+        finally:
+            with self._cond:
+                self._writing = False
+                self._cond.notify_all()
+
+class _Hnsw:
+    """
+    hnswlib 인덱스 하나를 여러 _State가 공유 (행 번호가 아니라 라벨로 저장, 라벨 ↔ 행 매핑은 _State마다).
+    - upsert는 add_items(같은 라벨이면 벡터 교체), 삭제는 mark_deleted로 제자리 갱신
+    - hnswlib의 add_items/mark_deleted는 knn_query와 동시에 돌 수 없으므로 읽기/쓰기 락
+    """
+    def __init__(self, emb: np.ndarray):
+        n = len(emb)
+        self.index = hnswlib.Index(space="cosine", dim=emb.shape[1])
+        self.index.init_index(max_elements=int(n * (1 + _HNSW_SLACK)) + 1, ef_construction=200, M=16)
+        self.index.add_items(np.asarray(emb), np.arange(n))
+        self.index.set_ef(128)
+        self.n_labels = n           # 지금까지 쓴 라벨 수 (삭제 표시 포함)
+        self._lock = _RWLock()
+
+    def room(self, extra: int) -> bool:
+        return self.n_labels + extra <= self.index.get_max_elements()
+
+    def add(self, vecs: np.ndarray, labels: np.ndarray) -> None:
+        with self._lock.write():
+            self.index.add_items(vecs, labels)
+            self.n_labels = max(self.n_labels, int(labels.max()) + 1)
+
+    def delete(self, labels: np.ndarray) -> None:
+        with self._lock.write():
+            for label in labels.tolist():
+                self.index.mark_deleted(label)
+
+    def query(self, q: np.ndarray, k: int, filter=None):
+        with self._lock.read():
+            self.index.set_ef(max(128, k))
+            return self.index.knn_query(q.reshape(1, -1), k=k, filter=filter)
+
+def _build_hnsw(emb: np.ndarray) -> Optional[_Hnsw]:
+    if hnswlib is None or len(emb) < VECTOR_HNSW_MIN_ROWS:
+        return None
+    return _Hnsw(emb)
+
+class _State:
+    """
+    검색 한 번이 처음부터 끝까지 보는 불변 스냅샷 (ids/임베딩/메타데이터/필터가 항상 같은 행 번호).
+    변경은 기존 상태를 건드리지 않고 새 _State를 만든 뒤 참조만 교체한다.
+    HNSW는 공유해서 제자리 갱신하고, 각 상태는 자기 행 ↔ 라벨 매핑(labels, label_rows)만 들고 있어
+    이전 상태로 진행 중인 검색은 나중에 붙은 라벨을 결과에서 뺀다.
+    """
+    __slots__ = ("ids", "emb", "metas", "docs", "pos", "cols", "hnsw", "labels", "label_rows")
+
+    def __init__(self, ids, emb, metas, docs, cols: Optional[MetadataColumns] = None,
+                 hnsw: Optional[_Hnsw] = None, labels: Optional[np.ndarray] = None, *, build_hnsw=True):
+        self.ids: List[str] = ids
+        self.emb: np.ndarray = emb
+        self.metas: List[Dict[str, Any]] = metas
+        self.docs: List[Optional[str]] = docs
+        self.pos: Dict[str, int] = {i: k for k, i in enumerate(ids)}
+        self.cols = cols if cols is not None else MetadataColumns(metas)
+        if build_hnsw:
+            hnsw, labels = _build_hnsw(emb), np.arange(len(ids))
+        self.hnsw = hnsw
+        self.labels: Optional[np.ndarray] = labels if hnsw is not None else None          # 행 → 라벨
+        self.label_rows: Optional[np.ndarray] = None                                     # 라벨 → 행 (-1: 이 상태에 없음)
+        if hnsw is not None:
+            self.label_rows = np.full(int(labels.max()) + 1 if len(labels) else 0, -1, dtype=np.int64)
+            self.label_rows[labels] = np.arange(len(labels))
+
+    def _hnsw_reusable(self, extra: int, n: int) -> bool:
+        # 추가할 자리가 있고, 삭제 표시된 라벨이 너무 많지 않으면 제자리 갱신 (아니면 새로 만들어 압축)
+        h = self.hnsw
+        return h is not None and h.room(extra) and h.n_labels + extra - n <= _HNSW_SLACK * n
+
+    # ── 변경본 생성 (스레드에서 실행 가능, self는 읽기만 / 공유 HNSW는 제자리 갱신) ──
+    def upserted(self, ids, vecs: np.ndarray, metadatas, documents) -> "_State":
+        n = len(self.ids)
+        new_ids, metas, docs = list(self.ids), list(self.metas), list(self.docs)
+        rows: Dict[int, Dict[str, Any]] = {}
+        updated: Dict[int, int] = {}                # 기존 행 → vecs 행
+        appended: List[int] = []
+        pos = dict(self.pos)
+        for j, cid in enumerate(ids):
+            doc = documents[j] if documents is not None else None
+            k = pos.get(cid)
+            if k is None:
+                k = pos[cid] = len(new_ids)
+                new_ids.append(cid)
+                metas.append(metadatas[j])
+                docs.append(doc)
+                appended.append(j)
+            else:
+                metas[k] = metadatas[j]
+                docs[k] = doc
+                updated[k] = j
+            rows[k] = metadatas[j]
+        if n:
+            emb = np.array(self.emb, dtype=np.float32)       # mmap 스냅샷은 복사본에만 쓴다
+            if updated:
+                emb[list(updated)] = vecs[list(updated.values())]
+        else:
+            emb = np.zeros((0, vecs.shape[1]), np.float32)
+        if appended:
+            emb = np.vstack([emb, vecs[appended]])
+        cols = self.cols.copy()
+        cols.set_rows(rows, len(new_ids))
+        if not self._hnsw_reusable(len(appended), len(new_ids)):
+            return _State(new_ids, emb, metas, docs, cols)
+        h = self.hnsw
+        labels = self.labels
+        if updated:
+            h.add(vecs[list(updated.values())], labels[list(updated)])
+        if appended:
+            new_labels = np.arange(h.n_labels, h.n_labels + len(appended))
+            h.add(vecs[appended], new_labels)
+            labels = np.concatenate([labels, new_labels])
+        return _State(new_ids, emb, metas, docs, cols, h, labels, build_hnsw=False)
+
+    def without(self, drop: np.ndarray) -> "_State":
+        keep = np.flatnonzero(~drop)
+        ids, emb = [self.ids[i] for i in keep], np.asarray(self.emb)[keep]
+        metas, docs, cols = [self.metas[i] for i in keep], [self.docs[i] for i in keep], self.cols.take(keep)
+        if not self._hnsw_reusable(0, len(keep)):
+            return _State(ids, emb, metas, docs, cols)
+        self.hnsw.delete(self.labels[drop])
+        return _State(ids, emb, metas, docs, cols, self.hnsw, self.labels[keep], build_hnsw=False)
+
+    def drop_mask(self, ids: Optional[List[str]], where: Optional[dict]) -> np.ndarray:
+        drop = np.zeros(len(self.ids), dtype=bool)
+        if ids is not None:
+            drop[[self.pos[i] for i in ids if i in self.pos]] = True
+        if where is not None:
+            drop |= self.cols.mask(where)
+        return drop
+
+class LocalVectorStore:
+    """
+    L2 정규화된 float32 행렬 + 메타데이터 필터 인덱스.
+    - 행 수가 적으면 (필터 후) 브루트포스 내적, 많으면 hnswlib(설치 시)로 근사 검색.
+    - 스냅샷 디렉터리: embeddings.npy (np.load mmap) + rows.json (ids/metadatas/documents)
+    - 변경(upsert/delete)은 새 _State를 (행이 많으면 스레드에서) 만든 뒤 교체 → 진행 중인 검색은 이전 상태를 끝까지 사용
+      HNSW는 다시 만들지 않고 제자리 갱신 (빈 자리/삭제 표시가 _HNSW_SLACK을 넘을 때만 새로 만들어 압축)
+    """
+    def __init__(
+        self,
+        ids: List[str],
+        embeddings: np.ndarray,
+        metadatas: List[Dict[str, Any]],
+        documents: Optional[List[Optional[str]]] = None,
+    ):
+        docs = list(documents) if documents is not None else [None] * len(ids)
+        self._state = _State(list(ids), embeddings, list(metadatas), docs)
+        self._write_lock = asyncio.Lock()     # 변경끼리는 순서대로 (마지막 교체가 앞선 변경을 덮어쓰지 않도록)
+
+    # ── 스냅샷 ──
+    @classmethod
+    def load(cls, path: str, *, mmap: bool = True) -> "LocalVectorStore":
+        emb_path = os.path.join(path, "embeddings.npy")
+        rows_path = os.path.join(path, "rows.json")
+        if not os.path.exists(emb_path):
+            return cls([], np.zeros((0, 0), dtype=np.float32), [])
+        emb = np.load(emb_path, mmap_mode="r" if mmap else None)
+        with open(rows_path, encoding="utf-8") as f:
+            rows = json.load(f)
+        return cls(rows["ids"], emb, rows["metadatas"], rows.get("documents"))
+
+    def save(self, path: str) -> None:
+        """임시 디렉터리에 쓴 뒤 교체 (읽는 쪽이 반쯤 쓴 스냅샷을 보지 않도록)"""
+        st = self._state
+        tmp = path.rstrip("/") + ".tmp"
+        shutil.rmtree(tmp, ignore_errors=True)
+        os.makedirs(tmp)
+        np.save(os.path.join(tmp, "embeddings.npy"), np.ascontiguousarray(st.emb, dtype=np.float32))
+        with open(os.path.join(tmp, "rows.json"), "w", encoding="utf-8") as f:
+            json.dump({"ids": st.ids, "metadatas": st.metas, "documents": st.docs}, f, ensure_ascii=False)
+        old = path.rstrip("/") + ".old"
+        shutil.rmtree(old, ignore_errors=True)
+        if os.path.exists(path):
+            os.rename(path, old)
+        os.rename(tmp, path)
+        shutil.rmtree(old, ignore_errors=True)
+
+    # ── 검색 (모두 호출 시점의 _State 하나만 사용) ──
+    @staticmethod
+    def _query(st: _State, q: np.ndarray, n_results: int, where: Optional[dict]):
+        n = len(st.ids)
+        if n == 0 or n_results <= 0:
+            return np.zeros(0, dtype=np.int64), np.zeros(0, dtype=np.float32)
+        mask = st.cols.mask(where)
+        allowed = int(mask.sum())
+        k = min(n_results, allowed)
+        if k == 0:
+            return np.zeros(0, dtype=np.int64), np.zeros(0, dtype=np.float32)
+
+        # 후보가 적으면(필터가 강하면) 부분집합 브루트포스가 HNSW+필터보다 빠르고 정확함
+        if st.hnsw is not None and allowed > max(VECTOR_HNSW_MIN_ROWS // 10, 4 * k):
+            lr = st.label_rows
+            if allowed == n:
+                flt = None
+            else:
+                allowed_labels = np.zeros(len(lr), dtype=bool)
+                allowed_labels[st.labels[mask]] = True
+                flt = lambda label: label < len(allowed_labels) and bool(allowed_labels[label])
+            try:
+                labels, dists = st.hnsw.query(q, k, flt)
+            except RuntimeError:
+                # 검색 중 새 상태가 이 상태의 행을 삭제 표시해 k개를 못 채움 → 브루트포스로
+                pass
+            else:
+                labels = labels[0].astype(np.int64)
+                # 이 상태 이후에 붙은 라벨(검색 중 교체된 새 상태의 행)은 뺀다
+                ok = labels < len(lr)
+                rows = np.where(ok, lr[np.minimum(labels, len(lr) - 1)], -1)
+                ok &= rows >= 0
+                return rows[ok], (1.0 - dists[0][ok]).astype(np.float32)
+
+        idx = np.flatnonzero(mask)
+        scores = np.asarray(st.emb[idx] @ q, dtype=np.float32)
+        if k < len(idx):
+            part = np.argpartition(-scores, k - 1)[:k]
+        else:
+            part = np.arange(len(idx))
+        order = part[np.argsort(-scores[part])]
+        return idx[order], scores[order]
+
+    @staticmethod
+    def _rows(st: _State, idx: Sequence[int], include: Sequence[str]) -> Dict[str, list]:
+        out: Dict[str, list] = {"ids": [st.ids[i] for i in idx]}
+        if "metadatas" in include:
+            out["metadatas"] = [st.metas[i] for i in idx]
+        if "documents" in include:
+            out["documents"] = [st.docs[i] for i in idx]
+        if "embeddings" in include:
+            out["embeddings"] = [np.asarray(st.emb[i]).tolist() for i in idx]
+        return out
+
+    async def query(
+        self,
+        query_embeddings: List[List[float]],
+        n_results: int = 10,
+        include: Sequence[str] = ("metadatas", "distances"),
+        where: Optional[dict] = None,
+    ) -> Dict[str, list]:
+        q = np.asarray(query_embeddings[0], dtype=np.float32)
+        q = q / (np.linalg.norm(q) + 1e-12)
+        st = self._state
+        if len(st.ids) > _INLINE_MAX_ROWS:
+            idx, scores = await asyncio.to_thread(self._query, st, q, n_results, where)
+        else:
+            idx, scores = self._query(st, q, n_results, where)
+        rows = self._rows(st, idx, include)
+        out: Dict[str, list] = {k: [v] for k, v in rows.items()}
+        if "distances" in include:
+            out["distances"] = [(1.0 - scores).tolist()]
+        return out
+
+    async def get(
+        self,
+        ids: Optional[List[str]] = None,
+        where: Optional[dict] = None,
+        include: Sequence[str] = ("metadatas",),
+        limit: Optional[int] = None,
+        offset: int = 0,
+    ) -> Dict[str, list]:
+        st = self._state
+        mask = st.cols.mask(where)
+        if ids is not None:
+            sel = np.zeros(len(st.ids), dtype=bool)
+            sel[[st.pos[i] for i in ids if i in st.pos]] = True
+            mask &= sel
+        idx = np.flatnonzero(mask)[offset:(offset + limit) if limit is not None else None]
+        return self._rows(st, idx.tolist(), include)
+
+    async def count(self) -> int:
+        return len(self._state.ids)
+
+    # ── 변경 (인덱서/동기화 워커용): 새 상태를 만들어 교체 ──
+    async def _swap(self, build, *args) -> None:
+        async with self._write_lock:
+            st = self._state
+            if len(st.ids) > _INLINE_MAX_ROWS or st.hnsw is not None:
+                new = await asyncio.to_thread(build, st, *args)
+            else:
+                new = build(st, *args)
+            if new is not None:
+                self._state = new
+
+    async def upsert(
+        self,
+        ids: List[str],
+        embeddings: List[List[float]],
+        metadatas: List[Dict[str, Any]],
+        documents: Optional[List[str]] = None,
+    ) -> None:
+        vecs = np.asarray(embeddings, dtype=np.float32)
+        vecs = vecs / (np.linalg.norm(vecs, axis=1, keepdims=True) + 1e-12)
+        await self._swap(_State.upserted, list(ids), vecs, list(metadatas), documents)
+
+    async def delete(self, ids: Optional[List[str]] = None, where: Optional[dict] = None) -> None:
+        def build(st: _State) -> Optional[_State]:
+            drop = st.drop_mask(ids, where)
+            return st.without(drop) if drop.any() else None
+        await self._swap(build)
+
+    async def replace(
+        self,
+        where: Optional[dict],
+        ids: List[str],
+        embeddings: List[List[float]],
+        metadatas: List[Dict[str, Any]],
+        documents: Optional[List[str]] = None,
+    ) -> None:
+        """where에 맞는 행 삭제 + upsert를 한 번의 교체로 (필터 갱신/HNSW 반영도 한 번)"""
+        vecs = np.asarray(embeddings, dtype=np.float32)
+        if len(ids):
+            vecs = vecs / (np.linalg.norm(vecs, axis=1, keepdims=True) + 1e-12)
+
+        def build(st: _State) -> Optional[_State]:
+            drop = st.drop_mask(None, where) if where is not None else np.zeros(len(st.ids), dtype=bool)
+            if not ids:
+                return st.without(drop) if drop.any() else None
+            base = st.without(drop) if drop.any() else st
+            return base.upserted(list(ids), vecs, list(metadatas), documents)
+        await self._swap(build)
+
+# ===== 선택 =====
+_local_store: Optional[LocalVectorStore] = None
+
+async def get_vector_store():
+    """VECTOR_BACKEND에 맞는 벡터 저장소 (Chroma AsyncCollection 또는 LocalVectorStore)"""
+    global _local_store
+    if VECTOR_BACKEND == "local":
+        if _local_store is None:
+            _local_store = await asyncio.to_thread(LocalVectorStore.load, VECTOR_SNAPSHOT_PATH)
+        return _local_store
+    from database import get_vc_collection_async
+    return await get_vc_collection_async()
+
+# ===== 원격 Chroma 컬렉션 → 로컬 스냅샷 내보내기 =====
+# python -m repositories.rag_repositories.vector_store export [경로]
+async def export_chroma_snapshot(path: str, page_size: int = 5000) -> int:
+    from database import get_vc_collection_async
+    collection = await get_vc_collection_async()
+    ids, embs, metas, docs, offset = [], [], [], [], 0
+    while True:
+        raw = await collection.get(
+            include=["embeddings", "metadatas", "documents"], limit=page_size, offset=offset,
+        )
+        got = raw.get("ids") or []
+        ids += got
+        embs += list(raw.get("embeddings") if raw.get("embeddings") is not None else [])
+        metas += list(raw.get("metadatas") or [])
+        docs += list(raw.get("documents") or [None] * len(got))
+        if len(got) < page_size:
+            break
+        offset += page_size
+    emb = np.asarray(embs, dtype=np.float32).reshape(len(ids), -1)
+    emb = emb / (np.linalg.norm(emb, axis=1, keepdims=True) + 1e-12)
+    LocalVectorStore(ids, emb, metas, docs).save(path)
+    return len(ids)
+
+if __name__ == "__main__":
+    if len(sys.argv) >= 2 and sys.argv[1] == "export":
+        target = sys.argv[2] if len(sys.argv) > 2 else VECTOR_SNAPSHOT_PATH
+        n = asyncio.run(export_chroma_snapshot(target))
+        print(f"exported {n} chunks -> {target}")
@@ -1,8 +1,11 @@
 # app/repositories/user_job_bookmark_repository.py
+import asyncio
 from typing import Iterable, Set, List, Tuple
 from models.user_job_bookmark_document import UserJobBookmarkDocument
 from beanie import SortDirection
 from beanie.operators import In
+from pymongo.errors import DuplicateKeyError
+from utils.count_cache import count_cache
 
 
 class UserJobBookmarkRepository:
@@ -35,23 +38,35 @@ class UserJobBookmarkRepository:
     async def list_user_bookmark_ids(
             self, user_id: str, skip: int, limit: int
     ) -> Tuple[List[str], int]:
-        total = await UserJobBookmarkDocument.find(
-            UserJobBookmarkDocument.user_id == user_id
-        ).count()
-
-        docs = await (
+        # 페이지 조회와 개수(캐시 미스 시 count)를 동시에
+        docs, total = await asyncio.gather(
             UserJobBookmarkDocument.find(UserJobBookmarkDocument.user_id == user_id)
             .sort([("created_at", SortDirection.ASCENDING), ("_id", SortDirection.ASCENDING)])
             .skip(skip)
             .limit(limit)
-            .to_list()
+            .to_list(),
+            count_cache.count(UserJobBookmarkDocument, {"user_id": user_id}, scope=user_id),
         )
         return [d.job_id for d in docs], total
 
+    # 최근 북마크한 공고 id (추천용 사용자 벡터 입력)
+    async def list_recent_job_ids(self, user_id: str, limit: int) -> List[str]:
+        docs = await (
+            UserJobBookmarkDocument.find(UserJobBookmarkDocument.user_id == user_id)
+            .sort([("created_at", SortDirection.DESCENDING)])
+            .limit(limit)
+            .to_list()
+        )
+        return [d.job_id for d in docs]
+
     # 북마크 추가
     async def add(self, user_id: str, job_id: str) -> None:
         if not await self.is_bookmarked(user_id, job_id):
-            await UserJobBookmarkDocument(user_id=user_id, job_id=job_id).insert()
+            try:
+                await UserJobBookmarkDocument(user_id=user_id, job_id=job_id).insert()
+            except DuplicateKeyError:
+                return  # 동시에 들어온 같은 북마크 요청 (user_job_unique 인덱스)
+            count_cache.invalidate(UserJobBookmarkDocument, scope=user_id)
 
     # 북마크 삭제
     async def remove(self, user_id: str, job_id: str) -> None:
@@ -61,3 +76,4 @@ class UserJobBookmarkRepository:
         )
         if doc:
             await doc.delete()
+            count_cache.invalidate(UserJobBookmarkDocument, scope=user_id)
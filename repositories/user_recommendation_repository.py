@@ -0,0 +1,17 @@
+# app/repositories/user_recommendation_repository.py
+from typing import Any, Dict, List, Optional
+from pymongo import ReplaceOne
+from models.user_recommendation_document import UserRecommendationDocument
+
+class UserRecommendationRepository:
+    # 사용자별 배치 추천 조회 (user_id 유니크 인덱스)
+    async def get_by_user_id(self, user_id: str) -> Optional[UserRecommendationDocument]:
+        return await UserRecommendationDocument.find_one(UserRecommendationDocument.user_id == user_id)
+
+    # 배치 결과 일괄 저장 (user_id 기준 교체/삽입)
+    async def bulk_replace(self, docs: List[Dict[str, Any]]) -> int:
+        if not docs:
+            return 0
+        ops = [ReplaceOne({"user_id": d["user_id"]}, d, upsert=True) for d in docs]
+        res = await UserRecommendationDocument.get_pymongo_collection().bulk_write(ops, ordered=False)
+        return res.upserted_count + res.modified_count
@@ -54,6 +54,12 @@ class CoverLetterResponse(BaseModel):
         d.pop("_id", None)
         return cls(**d)
 
+    @classmethod
+    def from_raw(cls, d) -> "CoverLetterResponse":
+        """Mongo raw dict를 응답 스키마로 (Beanie 모델 없이 한 번만 검증, 빠진 필드는 Document 기본값)"""
+        d = {"qnas": [], "strength": [], "weakness": [], **d, "id": str(d["_id"])}
+        return cls.model_validate(d)
+
 class CoverLetterListResponse(BaseModel):
     total: int = Field(..., description="전체 개수")
     items: List[CoverLetterResponse] = Field(..., description="자기소개서 목록")
@@ -2,6 +2,7 @@
 from typing import List, Optional, Literal
 from pydantic import BaseModel, HttpUrl, Field, ConfigDict
 from datetime import datetime
+from models.job_posting_document import normalize_str_list
 
 class JobPostingMetadata(BaseModel):
     source: Optional[str] = None
@@ -69,7 +70,36 @@ class JobPostingResponse(BaseModel):
         
         return cls(**d)
 
+class JobPostingSummaryDetail(BaseModel):
+    position: Optional[JobPostingPosition] = None
+
+class JobPostingSummaryResponse(BaseModel):
+    """목록용 요약 (회사/직무/위치/연봉 구간/스킬 태그). 상세 본문은 단건 조회(JobPostingResponse)에서만"""
+    id: str
+    company: JobPostingCompany
+    detail: JobPostingSummaryDetail = Field(default_factory=JobPostingSummaryDetail)
+
+    due_time: Optional[datetime] = None
+    status: Optional[Literal["active", "inactive", "closed"]] = "active"
+    skill_tags: List[str] = Field(default_factory=list)
+
+    bucket: Optional[str] = None
+    salary_bucket_2m_label: Optional[str] = None
+
+    bookmarked: Optional[bool] = None
+
+    @classmethod
+    def from_raw(cls, d) -> "JobPostingSummaryResponse":
+        """
+        JobPostingSummary projection으로 읽은 raw dict를 응답 스키마로 (Beanie 모델 없이 한 번만 검증).
+        pydantic-core 검증이 model_construct(파이썬 루프)보다 빨라 검증을 그대로 사용
+        """
+        d = {**d, "id": str(d["_id"]), "skill_tags": normalize_str_list(d.get("skill_tags"))}
+        return cls.model_validate(d)
+
 class JobPostingListResponse(BaseModel):
     """채용 공고 목록과 전체 개수를 함께 반환하는 모델"""
-    total: int = Field(..., description="조건에 맞는 전체 공고 수")
-    items: List[JobPostingResponse] = Field(..., description="조회된 공고 목록")
\ No newline at end of file
+    total: Optional[int] = Field(None, description="조건에 맞는 전체 공고 수 (after로 조회하면 include_total일 때만)")
+    items: List[JobPostingSummaryResponse] = Field(..., description="조회된 공고 목록 (요약)")
+    next_cursor: Optional[str] = Field(None, description="검색 결과 다음 페이지 cursor (없으면 마지막 페이지)")
+    next_after: Optional[str] = Field(None, description="최신순 목록 다음 페이지의 after 값 (없으면 마지막 페이지)")
\ No newline at end of file
@@ -49,11 +49,10 @@ class CoverLetterService:
             payload["strength"] = strength.split(',')
 
         elif req.type == 'job_posting':
-            profile_cover_letter = await self.repo.list_by_user(user_id, 0, 1, type_filter='profile')
+            profile_cover_letter = await self.repo.latest_by_user(user_id, type_filter='profile')
             
-            if profile_cover_letter[1] <= 0:
+            if profile_cover_letter is None:
                 raise ValueError('프로필 기반 자기소개서를 먼저 만들어야 합니다.')
-            profile_cover_letter = profile_cover_letter[0][0]
             job = await self.jobs.get_by_id(req.job_posting_id)
             
             strength = get_gemini_response(prompts.get_job_cover_letter_strength_prompt(profile_cover_letter, job.detail.position.job, 
@@ -96,7 +95,7 @@ class CoverLetterService:
             user_id, skip=offset, limit=limit,
             type_filter=type_filter, job_posting_id=job_posting_id
         )
-        items = [CoverLetterResponse.from_doc(d) for d in docs]
+        items = [CoverLetterResponse.from_raw(d) for d in docs]
         return CoverLetterListResponse(total=total, items=items)
 
     async def update(self, user_id: str, cl_id: str, req: CoverLetterUpdate) -> CoverLetterResponse:
@@ -5,12 +5,19 @@ from google.cloud import storage
 from google.oauth2 import service_account
 from settings import BUCKET, GCP_SA_KEY, GCP_PROJECT_ID
 
-if GCP_SA_KEY:
-    creds_dict = json.loads(GCP_SA_KEY)
-    credentials = service_account.Credentials.from_service_account_info(creds_dict)
-    client = storage.Client(credentials=credentials, project=GCP_PROJECT_ID)
-else:
-    client = storage.Client()
+# GCS 클라이언트는 처음 업로드/다운로드할 때 생성 (import 시 인증/네트워크 없음)
+_client = None
+
+def get_client() -> storage.Client:
+    global _client
+    if _client is None:
+        if GCP_SA_KEY:
+            creds_dict = json.loads(GCP_SA_KEY)
+            credentials = service_account.Credentials.from_service_account_info(creds_dict)
+            _client = storage.Client(credentials=credentials, project=GCP_PROJECT_ID)
+        else:
+            _client = storage.Client()
+    return _client
 
 ALLOWED_EXTENSIONS = {"image/jpeg", "image/png", "image/jpg"}
 MAX_MB = 10
@@ -29,13 +36,13 @@ def choose_file_extension(content_type: str) -> str:
     return "none"
 
 def upload_file(key: str, raw: bytes, content_type: str):
-    bucket = client.get_bucket(BUCKET)
+    bucket = get_client().get_bucket(BUCKET)
     blob = bucket.blob(key)
     blob.cache_control = "public, max-age=31536000, immutable"
     blob.upload_from_string(raw, content_type=content_type)
 
 def download_file(key: str) -> Tuple[bytes, str]:
-    bucket = client.get_bucket(BUCKET)
+    bucket = get_client().get_bucket(BUCKET)
     blob = bucket.blob(key)
     if not blob.exists():
         raise ValueError("파일이 존재하지 않습니다.")
@@ -44,6 +51,6 @@ def download_file(key: str) -> Tuple[bytes, str]:
     return data, content_type
 
 def delete_file(key: str):
-    bucket = client.get_bucket(BUCKET)
+    bucket = get_client().get_bucket(BUCKET)
     blob = bucket.blob(key)
     blob.delete(if_generation_match=None)
@@ -3,16 +3,24 @@ from __future__ import annotations
 from typing import Optional, List, Dict, Any, Set
 from repositories.job_posting_repository import JobPostingRepository
 from repositories.user_job_bookmark_repository import UserJobBookmarkRepository
-from schemas.job_posting import JobPostingResponse, JobPostingListResponse
+from repositories.user_repository import UserRepository
+from repositories.user_recommendation_repository import UserRecommendationRepository
+from schemas.job_posting import JobPostingResponse, JobPostingListResponse, JobPostingSummaryResponse
+from utils.recommendation import recommendation_cache, user_profile_text, fingerprint
+from settings import RECO_POOL, RECO_MAX_BOOKMARKS
 
 class JobPostingService:
     def __init__(
         self,
         posting_repo: Optional[JobPostingRepository] = None,
         bookmark_repo: Optional[UserJobBookmarkRepository] = None,
+        user_repo: Optional[UserRepository] = None,
+        reco_repo: Optional[UserRecommendationRepository] = None,
     ):
         self.repo = posting_repo or JobPostingRepository()
         self.bookmarks = bookmark_repo or UserJobBookmarkRepository()
+        self.users = user_repo or UserRepository()
+        self.recos = reco_repo or UserRecommendationRepository()
 
     async def get(self, job_id: str, user_id: Optional[str] = None) -> JobPostingResponse:
         doc = await self.repo.get_by_id(job_id)
@@ -29,14 +37,19 @@ class JobPostingService:
         offset: int,
         limit: int,
         user_id: Optional[str] = None,
+        cursor: Optional[str] = None,
+        after: Optional[str] = None,
+        include_total: bool = False,
     ) -> JobPostingListResponse:
         """
-        q가 비었으면 전체 최신순(ObjectId desc) 반환.
-        q가 있으면 검색(파사드: RAG→Mongo).
+        q가 비었으면 전체 최신순(ObjectId desc) 반환, 다음 페이지용 next_after 포함 (after로 넘기면 keyset 조회).
+        q가 있으면 검색(파사드: RAG→Mongo), 다음 페이지용 next_cursor 포함.
         로그인 했을 때는 북마크 정보도 추가해서 반환.
         """
-        docs, total = await self.repo.list(q=q, offset=offset, limit=limit)
-        items = [JobPostingResponse.from_doc(d) for d in docs]
+        docs, total, next_cursor, next_after = await self.repo.list(
+            q=q, offset=offset, limit=limit, cursor=cursor, after=after, include_total=include_total,
+        )
+        items = [JobPostingSummaryResponse.from_raw(d) for d in docs]
 
         if user_id and items:
             ids = [i.id for i in items]
@@ -44,17 +57,53 @@ class JobPostingService:
             for i in items:
                 i.bookmarked = i.id in bookmarked_ids
 
-        return JobPostingListResponse(total=total, items=items)
+        return JobPostingListResponse(total=total, items=items, next_cursor=next_cursor, next_after=next_after)
 
     async def recommendations(
         self,
         user_id: str,
         offset: int,
         limit: int,
-    ) -> List[JobPostingResponse]:
+    ) -> List[JobPostingSummaryResponse]:
         """
-        사용자 맞춤 추천, AI 연결 필요
+        사용자 맞춤 추천.
+        프로필(희망 포지션/역량/경력/관심 공고)과 최근 북마크로 만든 사용자 벡터로 진행 중 공고를 랭킹하고,
+        랭킹은 사용자별로 캐시한다 (프로필/북마크가 바뀔 때만 다시 계산).
+        야간 배치(services/recommendation_batch.py) 결과가 같은 지문으로 있으면 그것을 그대로 쓴다.
+        프로필/북마크 정보가 전혀 없으면 최신 공고를 반환한다.
         """
+        job_ids = await self._recommended_ids(user_id)
+        if job_ids:
+            docs = await self.repo.get_by_ids_preserve_order(job_ids[offset:offset + limit])
+        else:
+            docs, _ = await self.repo.list_recent(offset=offset, limit=limit)
+        items = [JobPostingSummaryResponse.from_raw(d) for d in docs]
+
+        if items:
+            bookmarked_ids = await self.bookmarks.list_bookmarked_job_ids(user_id, [i.id for i in items])
+            for i in items:
+                i.bookmarked = i.id in bookmarked_ids
+        return items
+
+    async def _recommended_ids(self, user_id: str) -> List[str]:
+        user = await self.users.get_by_id(user_id)
+        if not user:
+            raise ValueError("사용자를 찾을 수 없습니다.")
+        profile_text, interest_ids = user_profile_text(user)
+        liked_ids = await self.bookmarks.list_recent_job_ids(user_id, limit=RECO_MAX_BOOKMARKS)
+        liked_ids = list(dict.fromkeys(liked_ids + interest_ids))
+
+        fp = fingerprint(profile_text, liked_ids)
+        cached = recommendation_cache.get(user_id, fp)
+        if cached is not None:
+            return cached
+        batch = await self.recos.get_by_user_id(user_id)
+        if batch is not None and batch.fingerprint == fp:
+            job_ids = batch.job_ids
+        else:
+            job_ids = await self.repo.recommend_ids(profile_text, liked_ids, n=RECO_POOL)
+        recommendation_cache.put(user_id, fp, job_ids)
+        return job_ids
 
     async def add_bookmark(self, user_id: str, job_id: str) -> Dict[str, Any]:
         # 존재 확인 (없으면 404)
@@ -62,6 +111,7 @@ class JobPostingService:
         if not doc:
             raise ValueError("공고를 찾을 수 없습니다.")
         await self.bookmarks.add(user_id, job_id)
+        recommendation_cache.invalidate(user_id)
         return {"job_id": job_id, "bookmarked": True}
 
     async def remove_bookmark(self, user_id: str, job_id: str) -> Dict[str, Any]:
@@ -70,13 +120,14 @@ class JobPostingService:
         if not doc:
             raise ValueError("공고를 찾을 수 없습니다.")
         await self.bookmarks.remove(user_id, job_id)
+        recommendation_cache.invalidate(user_id)
         return {"job_id": job_id, "bookmarked": False}
 
     async def list_bookmarks(
         self, user_id: str, offset: int, limit: int
     ) -> JobPostingListResponse:
         """
-        유저의 북마크 목록을 created_at DESC로 가져와 상세 붙여 반환.
+        유저의 북마크 목록을 created_at DESC로 가져와 요약 붙여 반환.
         """
         job_ids, total = await self.bookmarks.list_user_bookmark_ids(
             user_id, skip=offset, limit=limit
@@ -85,7 +136,7 @@ class JobPostingService:
             return JobPostingListResponse(total=total, items=[])
 
         docs = await self.repo.get_by_ids_preserve_order(job_ids)
-        items = [JobPostingResponse.from_doc(d) for d in docs]
+        items = [JobPostingSummaryResponse.from_raw(d) for d in docs]
         for i in items:
             i.bookmarked = True  # 북마크 목록이므로 모두 True
         return JobPostingListResponse(total=total, items=items)
@@ -0,0 +1,282 @@
+# services/job_posting_indexer.py
+# master_job_postings(Mongo) → 벡터 저장소(master_job_postings 컬렉션) 인덱서
+# - Mongo 커서로 공고를 스트리밍하고 detail.* 텍스트를 MAX_CHARS/OVERLAP_CHARS로 청크
+# - 공고별 content_hash가 같으면 건너뛰는 증분 인덱싱
+# - 청크를 큰 배치로 모아 한 번에 인코딩 후 upsert
+#
+# 실행: python -m services.job_posting_indexer [--full]
+from __future__ import annotations
+
+import asyncio
+import hashlib
+import json
+import logging
+import sys
+import time
+from dataclasses import dataclass
+from datetime import datetime, timezone
+from typing import Any, Dict, List, Optional, Sequence, Tuple
+
+import numpy as np
+
+from models.job_posting_document import INACTIVE_STATUSES, JobPostingDocument
+from repositories.rag_repositories.job_poasting_rag_repository import (
+    MAX_CHARS, OVERLAP_CHARS, MODEL_NAME, encode_texts, _l2norm,
+)
+from repositories.rag_repositories.vector_store import LocalVectorStore, get_vector_store
+from repositories.rag_repositories.lexical_index import LexicalIndex, lexical_index
+from settings import INDEX_ENCODE_BATCH, VECTOR_SNAPSHOT_PATH
+
+logger = logging.getLogger(__name__)
+
+# 청크로 만들 상세 항목 (순서대로 이어붙임)
+DETAIL_FIELDS: List[Tuple[str, str]] = [
+    ("intro", "회사 소개"),
+    ("main_tasks", "주요 업무"),
+    ("requirements", "자격 요건"),
+    ("preferred_points", "우대 사항"),
+    ("benefits", "혜택 및 복지"),
+    ("hire_rounds", "채용 절차"),
+]
+
+# 인덱싱에 필요한 필드만 Mongo에서 가져옴
+INDEX_PROJECTION = {
+    "company.name": 1, "company.address": 1, "detail": 1,
+    "bucket": 1, "salary_bucket_2m_label": 1, "status": 1, "due_time": 1,
+    "skill_tags": 1,    # 키워드 색인용 (content_hash에는 포함 안 됨)
+}
+
+# 마감일이 없는 공고의 due_ts (3000-01-01, 항상 $gte now를 통과)
+NO_DUE_TS = 32503680000
+
+# 마감/비활성 공고는 벡터 저장소에 두지 않음
+def is_indexable(doc: Dict[str, Any]) -> bool:
+    return doc.get("status") not in INACTIVE_STATUSES
+
+# ===== 청크 =====
+def chunk_text(text: str, max_chars: int = MAX_CHARS, overlap: int = OVERLAP_CHARS) -> List[str]:
+    """max_chars 창을 overlap만큼 겹치며 자른다. 가능하면 줄바꿈/공백에서 끊는다."""
+    text = (text or "").strip()
+    if len(text) <= max_chars:
+        return [text] if text else []
+    chunks, start = [], 0
+    while start < len(text):
+        end = min(len(text), start + max_chars)
+        if end < len(text):
+            cut = max(text.rfind("\n", start + overlap, end), text.rfind(" ", start + overlap, end))
+            if cut > start:
+                end = cut
+        chunks.append(text[start:end].strip())
+        if end >= len(text):
+            break
+        start = max(end - overlap, start + 1)
+    return [c for c in chunks if c]
+
+def posting_text(doc: Dict[str, Any]) -> str:
+    company = (doc.get("company") or {}).get("name") or ""
+    detail = doc.get("detail") or {}
+    position = detail.get("position") or {}
+    jobs = ", ".join(position.get("job") or [])
+    lines = [f"[{company}] {position.get('jobGroup') or ''} {jobs}".strip()]
+    for key, label in DETAIL_FIELDS:
+        value = detail.get(key)
+        if value:
+            lines.append(f"{label}: {value}")
+    return "\n".join(lines)
+
+def due_ts(due_time: Optional[datetime]) -> int:
+    """마감 시각 → epoch seconds (where 절에서 숫자 비교용). 마감일이 없으면 NO_DUE_TS"""
+    if due_time is None:
+        return NO_DUE_TS
+    if due_time.tzinfo is None:
+        due_time = due_time.replace(tzinfo=timezone.utc)   # Mongo datetime은 UTC
+    return int(due_time.timestamp())
+
+def posting_metadata(doc: Dict[str, Any]) -> Dict[str, Any]:
+    """검색 where 절에서 쓰는 키들 (Chroma 메타데이터는 None 값을 허용하지 않으므로 생략)"""
+    address = (doc.get("company") or {}).get("address") or {}
+    meta = {
+        "source_id": str(doc["_id"]),
+        "bucket": doc.get("bucket"),
+        "location": address.get("location"),
+        "district": address.get("district"),
+        "salary_bucket_2m_label": doc.get("salary_bucket_2m_label"),
+        "status": doc.get("status") or "active",
+        "due_ts": due_ts(doc.get("due_time")),
+    }
+    return {k: v for k, v in meta.items() if v is not None}
+
+def build_chunks(doc: Dict[str, Any]) -> Tuple[List[str], Dict[str, Any]]:
+    """공고 1건 → (청크 텍스트 목록, content_hash가 포함된 공통 메타데이터)"""
+    chunks = chunk_text(posting_text(doc))
+    meta = posting_metadata(doc)
+    h = hashlib.sha1()
+    h.update(MODEL_NAME.encode("utf-8"))
+    h.update(json.dumps(meta, sort_keys=True, ensure_ascii=False).encode("utf-8"))
+    for c in chunks:
+        h.update(b"\x00" + c.encode("utf-8"))
+    meta["content_hash"] = h.hexdigest()[:16]
+    return chunks, meta
+
+# ===== 벡터 저장소 반영 =====
+async def encode_chunks(texts: List[str]) -> np.ndarray:
+    vecs = await asyncio.to_thread(encode_texts, texts, batch_size=64, convert_to_numpy=True)
+    return _l2norm(np.asarray(vecs, dtype=np.float32))
+
+async def upsert_postings(
+    store, postings: List[Tuple[List[str], Dict[str, Any]]], deletes: Sequence[str] = (),
+) -> int:
+    """
+    (청크, 메타) 묶음을 한 번에 인코딩해서 반영하고, deletes 공고의 청크는 지운다.
+    공고의 기존 청크 중 새 청크 id에 없는 것(청크 수가 줄어 남는 꼬리 등)도 지운다.
+    - LocalVectorStore: 삭제+upsert를 한 번의 교체로 반영
+    - 그 외(Chroma): 인코딩 → 같은 id로 덮어쓰기(upsert) → 남는 청크만 삭제 순서라 검색에서 공고가 빠지는 구간이 없음
+    반환: 반영한 청크 수
+    """
+    if not postings and not deletes:
+        return 0
+    ids, texts, metas = [], [], []
+    for chunks, meta in postings:
+        for i, c in enumerate(chunks):
+            ids.append(f"{meta['source_id']}:{i}")
+            texts.append(c)
+            metas.append({**meta, "chunk_index": i})
+    vecs = await encode_chunks(texts) if ids else np.zeros((0, 0), np.float32)
+    source_ids = [meta["source_id"] for _, meta in postings]
+    if isinstance(store, LocalVectorStore):
+        await store.replace({"source_id": {"$in": source_ids + list(deletes)}}, ids, vecs.tolist(), metas, texts)
+        return len(ids)
+    existing = await store.get(where={"source_id": {"$in": source_ids}}, include=[]) if source_ids else {}
+    if ids:
+        await store.upsert(ids=ids, embeddings=vecs.tolist(), metadatas=metas, documents=texts)
+    new_ids = set(ids)
+    stale = [i for i in existing.get("ids") or [] if i not in new_ids]
+    if stale:
+        await store.delete(ids=stale)
+    await delete_postings(store, deletes)
+    return len(ids)
+
+async def delete_postings(store, source_ids: List[str]) -> None:
+    if source_ids:
+        await store.delete(where={"source_id": {"$in": list(source_ids)}})
+
+async def load_indexed_hashes(store, page_size: int = 5000) -> Dict[str, str]:
+    """벡터 저장소에 이미 있는 source_id → content_hash"""
+    hashes: Dict[str, str] = {}
+    offset = 0
+    while True:
+        raw = await store.get(include=["metadatas"], limit=page_size, offset=offset)
+        metas = raw.get("metadatas") or []
+        for m in metas:
+            if m and m.get("source_id"):
+                hashes[m["source_id"]] = m.get("content_hash", "")
+        if len(metas) < page_size:
+            break
+        offset += page_size
+    return hashes
+
+# ===== 인덱서 =====
+@dataclass
+class IndexReport:
+    scanned: int = 0        # Mongo에서 읽은 공고 수
+    skipped: int = 0        # content_hash가 같아 건너뛴 공고 수
+    indexed: int = 0        # 새로/다시 임베딩한 공고 수
+    deleted: int = 0        # Mongo에 없어져 지운 공고 수
+    chunks: int = 0         # 인코딩+upsert한 청크 수
+    seconds: float = 0.0
+
+    @property
+    def chunks_per_sec(self) -> float:
+        return self.chunks / self.seconds if self.seconds else 0.0
+
+    def __str__(self) -> str:
+        return (f"scanned={self.scanned} indexed={self.indexed} skipped={self.skipped} "
+                f"deleted={self.deleted} chunks={self.chunks} "
+                f"elapsed={self.seconds:.1f}s throughput={self.chunks_per_sec:.1f} chunks/s")
+
+class JobPostingIndexer:
+    def __init__(self, store=None, *, batch_chunks: int = INDEX_ENCODE_BATCH):
+        self.store = store
+        self.batch_chunks = batch_chunks
+
+    async def run(self, *, full: bool = False, query: Optional[Dict[str, Any]] = None) -> IndexReport:
+        """
+        Mongo 공고 전체(또는 query)를 훑어 바뀐 공고만 다시 인덱싱한다.
+        - full=True면 content_hash와 상관없이 전부 다시 임베딩
+        - 마감(status inactive/closed)된 공고의 청크는 지운다
+        - query 없이 전체를 훑은 경우에는 Mongo에서 사라진 공고의 청크도 지운다
+        """
+        store = self.store or await get_vector_store()
+        report = IndexReport()
+        started = time.perf_counter()
+
+        known = {} if full else await load_indexed_hashes(store)
+        seen = set()
+        closed: List[str] = []
+        pending: List[Tuple[List[str], Dict[str, Any]]] = []
+        pending_chunks = 0
+
+        cursor = JobPostingDocument.get_pymongo_collection().find(
+            query or {}, INDEX_PROJECTION, batch_size=500,
+        )
+        async for doc in cursor:
+            report.scanned += 1
+            if not is_indexable(doc):
+                sid = str(doc["_id"])
+                if full or sid in known:
+                    closed.append(sid)
+                continue
+            chunks, meta = build_chunks(doc)
+            sid = meta["source_id"]
+            seen.add(sid)
+            if known.get(sid) == meta["content_hash"]:
+                report.skipped += 1
+                continue
+            pending.append((chunks, meta))
+            pending_chunks += len(chunks)
+            if pending_chunks >= self.batch_chunks:
+                report.chunks += await upsert_postings(store, pending)
+                report.indexed += len(pending)
+                pending, pending_chunks = [], 0
+
+        gone = [sid for sid in known if sid not in seen] if query is None else []
+        stale = sorted(set(closed) | set(gone))
+        report.chunks += await upsert_postings(store, pending, stale)
+        report.indexed += len(pending)
+        report.deleted = len(stale)
+
+        if isinstance(store, LocalVectorStore):
+            await asyncio.to_thread(store.save, VECTOR_SNAPSHOT_PATH)
+
+        report.seconds = time.perf_counter() - started
+        return report
+
+# ===== 키워드(BM25) 색인 =====
+async def build_lexical_index(index: Optional[LexicalIndex] = None) -> LexicalIndex:
+    """Mongo의 진행 중 공고로 키워드 색인을 채운다 (API 프로세스 시작 시 1회, 이후 동기화 워커가 갱신)"""
+    index = index or lexical_index
+    started = time.perf_counter()
+    try:
+        cursor = JobPostingDocument.get_pymongo_collection().find({}, INDEX_PROJECTION, batch_size=1000)
+        async for doc in cursor:
+            if is_indexable(doc):
+                index.upsert(doc, posting_metadata(doc))
+    except Exception:
+        # 실패해도 검색은 벡터만으로 계속 동작
+        logger.exception("lexical index 생성 실패")
+        return index
+    index.ready = True
+    logger.info("lexical index: %d postings in %.1fs", len(index), time.perf_counter() - started)
+    return index
+
+async def _main(full: bool) -> None:
+    from database import init_db
+    _, client = await init_db(index_mode="sync")
+    try:
+        report = await JobPostingIndexer().run(full=full)
+        print(report)
+    finally:
+        client.close()
+
+if __name__ == "__main__":
+    asyncio.run(_main(full="--full" in sys.argv[1:]))
@@ -0,0 +1,341 @@
+# services/job_posting_sync.py
+# Mongo(master_job_postings) 변경분 → 벡터 저장소 실시간 동기화 워커
+# - 변경 소스: Mongo change stream / _id·crawledAt 워터마크 폴링 / 인메모리(로컬 테스트용)
+# - 이벤트를 마이크로배치로 모아 바뀐 공고의 청크만 다시 임베딩(upsert)하거나 삭제
+# - 마감(status inactive/closed)으로 바뀐 공고는 삭제로 처리
+# - 공유 벡터 저장소(Chroma) 반영(임베딩/upsert)은 리더 프로세스 하나만 (JOB_SYNC_LEADER)
+#   나머지 uvicorn 워커는 자기 프로세스의 키워드 색인/total 캐시만 갱신
+# - 로컬 벡터 저장소(VECTOR_BACKEND=local)는 프로세스마다 따로이므로 모든 워커가 반영, 스냅샷 저장만 리더
+# - stats()로 처리량/지연(lag) 지표 제공
+from __future__ import annotations
+
+import asyncio
+import fcntl
+import logging
+import os
+import time
+from dataclasses import dataclass
+from datetime import datetime, timezone
+from typing import Any, Dict, List, Optional, Protocol
+
+from bson import ObjectId
+
+from models.job_posting_document import JobPostingDocument
+from repositories.rag_repositories.vector_store import LocalVectorStore, get_vector_store
+from repositories.rag_repositories.lexical_index import INLINE_MAX_POSTINGS, lexical_index
+from utils.count_cache import count_cache
+from services.job_posting_indexer import INDEX_PROJECTION, build_chunks, is_indexable, upsert_postings
+from settings import (
+    JOB_SYNC_MODE, JOB_SYNC_BATCH_SIZE, JOB_SYNC_MAX_WAIT_SECONDS, JOB_SYNC_POLL_SECONDS,
+    JOB_SYNC_LEADER, JOB_SYNC_LOCK_PATH, VECTOR_SNAPSHOT_PATH,
+)
+
+logger = logging.getLogger(__name__)
+
+@dataclass
+class ChangeEvent:
+    op: str                          # "upsert" | "delete"
+    source_id: str
+    doc: Optional[Dict[str, Any]]    # upsert일 때 공고 원본(dict)
+    ts: float                        # Mongo 쪽에서 변경이 일어난 시각 (epoch seconds)
+
+class ChangeSource(Protocol):
+    async def next_batch(self, max_items: int, max_wait: float) -> List[ChangeEvent]: ...
+    async def close(self) -> None: ...
+
+def _event_from_doc(doc: Dict[str, Any], ts: Optional[float] = None) -> ChangeEvent:
+    sid = str(doc["_id"])
+    op = "upsert" if is_indexable(doc) else "delete"
+    return ChangeEvent(op=op, source_id=sid, doc=doc if op == "upsert" else None, ts=ts or time.time())
+
+# ===== 변경 소스 =====
+class InMemoryChangeSource:
+    """큐 기반 변경 소스. 로컬 테스트나 크롤러가 같은 프로세스에 있을 때 직접 push"""
+
+    def __init__(self):
+        self._queue: "asyncio.Queue[ChangeEvent]" = asyncio.Queue()
+
+    def push(self, event: ChangeEvent) -> None:
+        self._queue.put_nowait(event)
+
+    def upsert(self, doc: Dict[str, Any]) -> None:
+        self.push(_event_from_doc(doc))
+
+    def delete(self, source_id: str) -> None:
+        self.push(ChangeEvent(op="delete", source_id=str(source_id), doc=None, ts=time.time()))
+
+    def qsize(self) -> int:
+        return self._queue.qsize()
+
+    async def next_batch(self, max_items: int, max_wait: float) -> List[ChangeEvent]:
+        """첫 이벤트를 max_wait까지 기다린 뒤, 그 시점에 쌓인 이벤트를 max_items까지 모은다"""
+        try:
+            first = await asyncio.wait_for(self._queue.get(), timeout=max_wait)
+        except asyncio.TimeoutError:
+            return []
+        batch = [first]
+        while len(batch) < max_items and not self._queue.empty():
+            batch.append(self._queue.get_nowait())
+        return batch
+
+    async def close(self) -> None:
+        pass
+
+class MongoChangeStreamSource(InMemoryChangeSource):
+    """
+    Mongo change stream을 읽어 큐에 넣는다 (replica set 필요).
+    resume_token은 메모리에만 두므로 재시작 시 그 사이 변경분은 인덱서 재실행으로 맞춘다.
+    """
+
+    def __init__(self):
+        super().__init__()
+        self.resume_token = None
+        self._task: Optional[asyncio.Task] = None
+
+    def start(self) -> None:
+        if self._task is None:
+            self._task = asyncio.create_task(self._tail())
+
+    async def _tail(self) -> None:
+        coll = JobPostingDocument.get_pymongo_collection()
+        pipeline = [{"$match": {"operationType": {"$in": ["insert", "update", "replace", "delete"]}}}]
+        while True:
+            try:
+                async with coll.watch(pipeline, full_document="updateLookup",
+                                      resume_after=self.resume_token) as stream:
+                    async for change in stream:
+                        self.resume_token = stream.resume_token
+                        self.push(self._to_event(change))
+            except asyncio.CancelledError:
+                raise
+            except Exception:
+                logger.exception("change stream 중단, 5초 후 재연결")
+                await asyncio.sleep(5)
+
+    @staticmethod
+    def _to_event(change: Dict[str, Any]) -> ChangeEvent:
+        cluster_time = change.get("clusterTime")
+        ts = float(cluster_time.time) if cluster_time is not None else time.time()
+        sid = str(change["documentKey"]["_id"])
+        doc = change.get("fullDocument")
+        if change["operationType"] == "delete" or doc is None:
+            return ChangeEvent(op="delete", source_id=sid, doc=None, ts=ts)
+        return _event_from_doc(doc, ts)
+
+    async def next_batch(self, max_items: int, max_wait: float) -> List[ChangeEvent]:
+        self.start()
+        return await super().next_batch(max_items, max_wait)
+
+    async def close(self) -> None:
+        if self._task is not None:
+            self._task.cancel()
+            try:
+                await self._task
+            except asyncio.CancelledError:
+                pass
+            self._task = None
+
+class MongoPollingSource:
+    """
+    change stream을 못 쓰는 환경(standalone Mongo)용 폴링 소스.
+    - 신규 공고: _id 워터마크 이후
+    - 재크롤링된 공고: metadata.crawledAt 워터마크 이후
+    하드 삭제는 감지하지 못하므로 주기적인 인덱서 실행으로 정리한다.
+    """
+
+    def __init__(self, *, since: Optional[datetime] = None, interval: float = JOB_SYNC_POLL_SECONDS):
+        since = since or datetime.now(timezone.utc)
+        self.last_id = ObjectId.from_datetime(since)
+        self.crawled_at = since
+        self.interval = interval
+        self._next_poll = 0.0
+
+    async def next_batch(self, max_items: int, max_wait: float) -> List[ChangeEvent]:
+        wait = self._next_poll - time.monotonic()
+        if wait > 0:
+            await asyncio.sleep(min(wait, max_wait))
+            if self._next_poll > time.monotonic():
+                return []
+
+        coll = JobPostingDocument.get_pymongo_collection()
+        created = await coll.find({"_id": {"$gt": self.last_id}}, INDEX_PROJECTION) \
+            .sort("_id", 1).limit(max_items).to_list(length=max_items)
+        if created:
+            self.last_id = created[-1]["_id"]
+        recrawled = await coll.find({"metadata.crawledAt": {"$gt": self.crawled_at}},
+                                    {**INDEX_PROJECTION, "metadata.crawledAt": 1}) \
+            .sort("metadata.crawledAt", 1).limit(max_items).to_list(length=max_items)
+        if recrawled:
+            self.crawled_at = recrawled[-1]["metadata"]["crawledAt"]
+
+        # 한 번에 다 못 가져왔으면 바로 다시 조회, 아니면 interval 후에
+        full = len(created) == max_items or len(recrawled) == max_items
+        self._next_poll = 0.0 if full else time.monotonic() + self.interval
+
+        events = [_event_from_doc(d, d["_id"].generation_time.timestamp()) for d in created]
+        events += [_event_from_doc(d, _epoch(d["metadata"]["crawledAt"])) for d in recrawled]
+        return events
+
+    async def close(self) -> None:
+        pass
+
+def _epoch(dt: datetime) -> float:
+    if dt.tzinfo is None:
+        dt = dt.replace(tzinfo=timezone.utc)
+    return dt.timestamp()
+
+# ===== 리더 선출 =====
+class LeaderLock:
+    """
+    같은 호스트의 프로세스 중 하나만 잡는 파일 락 (flock, 프로세스가 죽으면 OS가 풀어줌).
+    못 잡은 프로세스는 배치마다 다시 시도하므로 리더가 내려가면 다음 배치부터 넘겨받는다.
+    """
+
+    def __init__(self, path: str = JOB_SYNC_LOCK_PATH):
+        self.path = path
+        self._fd: Optional[int] = None
+
+    def __call__(self) -> bool:
+        if self._fd is not None:
+            return True
+        fd = os.open(self.path, os.O_RDWR | os.O_CREAT, 0o644)
+        try:
+            fcntl.flock(fd, fcntl.LOCK_EX | fcntl.LOCK_NB)
+        except OSError:
+            os.close(fd)
+            return False
+        self._fd = fd
+        logger.info("job posting sync 리더 (pid=%d)", os.getpid())
+        return True
+
+    def release(self) -> None:
+        if self._fd is not None:
+            os.close(self._fd)      # close 시 flock도 해제
+            self._fd = None
+
+def build_leader(mode: str = JOB_SYNC_LEADER):
+    if mode == "lock":
+        return LeaderLock()
+    leader = mode.lower() == "true"
+    return lambda: leader
+
+# ===== 워커 =====
+class JobPostingSyncWorker:
+    def __init__(self, source: ChangeSource, store=None, *, is_leader=None,
+                 batch_size: int = JOB_SYNC_BATCH_SIZE, max_wait: float = JOB_SYNC_MAX_WAIT_SECONDS):
+        self.source = source
+        self.store = store
+        self.is_leader = is_leader or (lambda: True)
+        self.leader: Optional[bool] = None      # 마지막 배치 시점의 역할
+        self.batch_size = batch_size
+        self.max_wait = max_wait
+        # 지표
+        self.batches = 0
+        self.events = 0
+        self.upserted = 0
+        self.skipped = 0
+        self.deleted = 0
+        self.chunks = 0
+        self.errors = 0
+        self.last_lag_seconds = 0.0
+        self.max_lag_seconds = 0.0
+        self.last_applied_at: Optional[float] = None
+
+    async def run(self) -> None:
+        """취소될 때까지 변경분을 마이크로배치로 반영"""
+        try:
+            while True:
+                batch = await self.source.next_batch(self.batch_size, self.max_wait)
+                if not batch:
+                    continue
+                try:
+                    await self.apply(batch)
+                except Exception:
+                    self.errors += 1
+                    logger.exception("job posting sync 배치 반영 실패 (%d건)", len(batch))
+        finally:
+            await self.source.close()
+            # 로컬 인덱스는 종료 시 스냅샷에 반영해 재시작 후에도 유지 (같은 경로에 여럿이 쓰지 않도록 리더만)
+            if self.leader and (self.upserted or self.deleted):
+                store = self.store or await get_vector_store()
+                if isinstance(store, LocalVectorStore):
+                    await asyncio.to_thread(store.save, VECTOR_SNAPSHOT_PATH)
+            if isinstance(self.is_leader, LeaderLock):
+                self.is_leader.release()
+
+    async def apply(self, batch: List[ChangeEvent]) -> None:
+        # 같은 공고의 이벤트는 마지막 것만 반영
+        latest: Dict[str, ChangeEvent] = {}
+        for ev in batch:
+            latest[ev.source_id] = ev
+        upserts = [ev for ev in latest.values() if ev.op == "upsert"]
+        deletes = [sid for sid, ev in latest.items() if ev.op == "delete"]
+        postings = [build_chunks(ev.doc) for ev in upserts]
+
+        changed: List = []
+        self.leader = self.is_leader()
+        store = self.store or await get_vector_store()
+        # 로컬 저장소는 이 프로세스 것이라 리더가 아니어도 직접 반영해야 검색에 바뀐 공고가 보임
+        writer = self.leader or isinstance(store, LocalVectorStore)
+        if writer:
+            # 내용이 안 바뀐 업데이트(조회수 등)는 임베딩 생략
+            known = await self._indexed_hashes(store, [meta["source_id"] for _, meta in postings])
+            changed = [(c, m) for c, m in postings if known.get(m["source_id"]) != m["content_hash"]]
+            # 삭제와 upsert를 저장소 변경 한 번으로
+            self.chunks += await upsert_postings(store, changed, deletes)
+
+        # 키워드 색인(skill_tags 등 content_hash 밖 필드 포함)은 싸므로 변경분 전부 반영
+        # 색인이 크면 검색도 스레드에서 돌므로 변경도 스레드에서 (락 대기로 이벤트 루프를 막지 않도록)
+        if lexical_index.ready:
+            docs = [(ev.doc, meta) for ev, (_, meta) in zip(upserts, postings)]
+            if len(lexical_index) <= INLINE_MAX_POSTINGS:
+                lexical_index.apply(docs, deletes)
+            else:
+                await asyncio.to_thread(lexical_index.apply, docs, deletes)
+
+        # 상태/마감일이 바뀌었을 수 있으므로 목록 total 캐시 무효화
+        count_cache.invalidate(JobPostingDocument)
+
+        now = time.time()
+        lag = max(now - ev.ts for ev in batch)
+        self.batches += 1
+        self.events += len(batch)
+        if writer:
+            self.upserted += len(changed)
+            self.skipped += len(postings) - len(changed)
+            self.deleted += len(deletes)
+        self.last_lag_seconds = lag
+        self.max_lag_seconds = max(self.max_lag_seconds, lag)
+        self.last_applied_at = now
+
+    @staticmethod
+    async def _indexed_hashes(store, source_ids: List[str]) -> Dict[str, str]:
+        if not source_ids:
+            return {}
+        raw = await store.get(where={"source_id": {"$in": source_ids}}, include=["metadatas"])
+        return {m["source_id"]: m.get("content_hash", "") for m in (raw.get("metadatas") or []) if m}
+
+    def stats(self) -> Dict[str, Any]:
+        pending = self.source.qsize() if hasattr(self.source, "qsize") else None
+        return {
+            "leader": self.leader,
+            "batches": self.batches,
+            "events": self.events,
+            "upserted": self.upserted,
+            "skipped": self.skipped,
+            "deleted": self.deleted,
+            "chunks": self.chunks,
+            "errors": self.errors,
+            "pending": pending,
+            "last_lag_seconds": self.last_lag_seconds,
+            "max_lag_seconds": self.max_lag_seconds,
+            "since_last_apply_seconds": (time.time() - self.last_applied_at) if self.last_applied_at else None,
+        }
+
+def build_sync_worker(mode: str = JOB_SYNC_MODE) -> Optional[JobPostingSyncWorker]:
+    """설정(JOB_SYNC_MODE)에 맞는 워커 생성. off면 None"""
+    if mode == "change_stream":
+        return JobPostingSyncWorker(MongoChangeStreamSource(), is_leader=build_leader())
+    if mode == "poll":
+        return JobPostingSyncWorker(MongoPollingSource(), is_leader=build_leader())
+    return None
@@ -0,0 +1,236 @@
+# services/recommendation_batch.py
+# 야간 배치 추천: 전체 사용자 × 전체 진행 중 공고 점수를 행렬곱으로 계산해 user_recommendations에 일괄 기록
+# - 공고 행렬 P: 벡터 저장소의 청크 임베딩을 공고(source_id)별 평균 → L2 정규화
+# - 사용자 행렬 U: 프로필 텍스트 임베딩 + 최근 북마크 공고 벡터 (온라인 추천과 같은 blend_user_vector)
+# - (사용자 블록 × 공고 블록) 단위 행렬곱 + argpartition으로 top-K만 유지 → 메모리 상한 고정
+#
+# 실행: python -m services.recommendation_batch
+from __future__ import annotations
+
+import asyncio
+import time
+from dataclasses import dataclass
+from datetime import datetime, timezone
+from typing import Any, Dict, List, Optional, Tuple
+
+import numpy as np
+
+from models.user_document import UserDocument
+from models.user_job_bookmark_document import UserJobBookmarkDocument
+from repositories.rag_repositories.job_poasting_rag_repository import encode_texts, _l2norm, blend_user_vector
+from repositories.rag_repositories.vector_store import get_vector_store
+from repositories.user_recommendation_repository import UserRecommendationRepository
+from utils.recommendation import fingerprint, user_profile_text
+from utils.where_minimal import live_where
+from settings import (
+    RECO_POOL, RECO_MAX_BOOKMARKS, RECO_BATCH_USER_BLOCK, RECO_BATCH_MEMORY_MB, SEARCH_LIVE_ONLY,
+)
+
+# ===== 공고 행렬 =====
+async def load_posting_matrix(store, page_size: int = 5000) -> Tuple[List[str], np.ndarray]:
+    """벡터 저장소 → (source_id 목록, 공고별 평균 임베딩 행렬 float32 [n_post, d])"""
+    where = live_where(None) if SEARCH_LIVE_ONLY else None
+    sums: Dict[str, np.ndarray] = {}
+    offset = 0
+    while True:
+        raw = await store.get(
+            include=["embeddings", "metadatas"], limit=page_size, offset=offset,
+            **({"where": where} if where else {}),
+        )
+        metas = raw.get("metadatas") or []
+        embs = raw.get("embeddings")
+        if metas:
+            E = _l2norm(np.asarray(embs, dtype=np.float32))
+            for m, v in zip(metas, E):
+                sid = (m or {}).get("source_id")
+                if sid:
+                    acc = sums.get(sid)
+                    sums[sid] = v.copy() if acc is None else acc + v
+        if len(metas) < page_size:
+            break
+        offset += page_size
+    ids = list(sums)
+    if not ids:
+        return [], np.zeros((0, 0), dtype=np.float32)
+    return ids, _l2norm(np.stack([sums[s] for s in ids]).astype(np.float32))
+
+# ===== 사용자 입력 =====
+async def load_recent_bookmarks(limit: int = RECO_MAX_BOOKMARKS) -> Dict[str, List[str]]:
+    """user_id → 최근 북마크 job_id 목록 (컬렉션 한 번 집계)"""
+    pipeline = [
+        {"$sort": {"created_at": -1}},
+        {"$group": {"_id": "$user_id", "job_ids": {"$push": "$job_id"}}},
+        {"$project": {"job_ids": {"$slice": ["$job_ids", limit]}}},
+    ]
+    out: Dict[str, List[str]] = {}
+    cursor = UserJobBookmarkDocument.get_pymongo_collection().aggregate(pipeline, allowDiskUse=True)
+    async for row in cursor:
+        out[row["_id"]] = row["job_ids"]
+    return out
+
+@dataclass
+class _UserInput:
+    user_id: str
+    profile_text: str
+    liked_ids: List[str]
+    fingerprint: str
+
+def _user_inputs(users: List[UserDocument], bookmarks: Dict[str, List[str]]) -> List[_UserInput]:
+    out = []
+    for u in users:
+        uid = str(u.id)
+        text, interest_ids = user_profile_text(u)
+        liked = list(dict.fromkeys(bookmarks.get(uid, []) + interest_ids))
+        if text or liked:
+            out.append(_UserInput(uid, text, liked, fingerprint(text, liked)))
+    return out
+
+async def build_user_matrix(
+    inputs: List[_UserInput], post_index: Dict[str, int], P: np.ndarray,
+) -> Tuple[List[_UserInput], np.ndarray]:
+    """사용자 입력 → (벡터를 만들 수 있었던 사용자, 사용자 행렬 [n_user, d])"""
+    texts = [i.profile_text for i in inputs if i.profile_text]
+    encoded = iter(
+        _l2norm(np.asarray(await asyncio.to_thread(encode_texts, texts, batch_size=64), dtype=np.float32))
+        if texts else []
+    )
+    kept, rows = [], []
+    for i in inputs:
+        profile_vec = next(encoded) if i.profile_text else None
+        liked_rows = [post_index[j] for j in i.liked_ids if j in post_index]
+        u = blend_user_vector(profile_vec, P[liked_rows] if liked_rows else None)
+        if u is not None:
+            kept.append(i)
+            rows.append(u)
+    d = P.shape[1] if P.size else 0
+    return kept, (np.stack(rows) if rows else np.zeros((0, d), dtype=np.float32))
+
+# ===== top-K =====
+def topk_blocked(
+    U: np.ndarray,
+    P: np.ndarray,
+    k: int,
+    exclude: Optional[List[List[int]]] = None,
+    *,
+    post_block: int,
+) -> Tuple[np.ndarray, np.ndarray]:
+    """
+    U[n_u, d] @ P[n_p, d].T의 행별 top-k (인덱스, 점수)를 공고 블록 단위로 계산.
+    블록마다 argpartition으로 후보 k개만 남기고 이전 top-k와 합쳐 다시 k개로 줄인다.
+    exclude[i]: 사용자 i에게서 뺄 공고 인덱스 (이미 북마크한 공고)
+    """
+    n_u, n_p = U.shape[0], P.shape[0]
+    k = min(k, n_p)
+    best_s = np.full((n_u, k), -np.inf, dtype=np.float32)
+    best_i = np.zeros((n_u, k), dtype=np.int64)
+    rows = np.arange(n_u)[:, None]
+    for start in range(0, n_p, post_block):
+        S = U @ P[start:start + post_block].T                        # [n_u, b]
+        if exclude:
+            for r, idxs in enumerate(exclude):
+                local = [j - start for j in idxs if start <= j < start + S.shape[1]]
+                if local:
+                    S[r, local] = -np.inf
+        kb = min(k, S.shape[1])
+        part = np.argpartition(-S, kb - 1, axis=1)[:, :kb]
+        cand_s = np.concatenate([best_s, S[rows, part]], axis=1)
+        cand_i = np.concatenate([best_i, part + start], axis=1)
+        keep = np.argpartition(-cand_s, k - 1, axis=1)[:, :k]
+        best_s, best_i = cand_s[rows, keep], cand_i[rows, keep]
+    order = np.argsort(-best_s, axis=1)
+    return best_i[rows, order], best_s[rows, order]
+
+# ===== 배치 =====
+@dataclass
+class BatchReport:
+    users: int = 0          # 추천을 기록한 사용자 수
+    skipped: int = 0        # 프로필/북마크가 없어 건너뛴 사용자 수
+    postings: int = 0
+    written: int = 0
+    seconds: float = 0.0
+
+    def __str__(self) -> str:
+        rate = self.users / self.seconds if self.seconds else 0.0
+        return (f"users={self.users} skipped={self.skipped} postings={self.postings} "
+                f"written={self.written} elapsed={self.seconds:.1f}s ({rate:.0f} users/s)")
+
+class RecommendationBatch:
+    def __init__(
+        self,
+        store=None,
+        repo: Optional[UserRecommendationRepository] = None,
+        *,
+        k: int = RECO_POOL,
+        user_block: int = RECO_BATCH_USER_BLOCK,
+        memory_mb: int = RECO_BATCH_MEMORY_MB,
+    ):
+        self.store = store
+        self.repo = repo or UserRecommendationRepository()
+        self.k = k
+        self.user_block = user_block
+        self.memory_mb = memory_mb
+
+    def _post_block(self) -> int:
+        # 점수 블록(float32) + 부호 반전 사본(float32) + argpartition 인덱스(int64) = 원소당 16바이트
+        budget = self.memory_mb * 1024 * 1024
+        return max(self.k, budget // (self.user_block * 16))
+
+    async def run(self) -> BatchReport:
+        report = BatchReport()
+        started = time.perf_counter()
+
+        store = self.store or await get_vector_store()
+        post_ids, P = await load_posting_matrix(store)
+        report.postings = len(post_ids)
+        if not post_ids:
+            report.seconds = time.perf_counter() - started
+            return report
+        post_index = {s: i for i, s in enumerate(post_ids)}
+        bookmarks = await load_recent_bookmarks()
+
+        batch: List[UserDocument] = []
+        async for user in UserDocument.find_all():
+            batch.append(user)
+            if len(batch) >= self.user_block:
+                await self._run_block(batch, bookmarks, post_ids, post_index, P, report)
+                batch = []
+        await self._run_block(batch, bookmarks, post_ids, post_index, P, report)
+
+        report.seconds = time.perf_counter() - started
+        return report
+
+    async def _run_block(self, users, bookmarks, post_ids, post_index, P, report: BatchReport) -> None:
+        if not users:
+            return
+        inputs, U = await build_user_matrix(_user_inputs(users, bookmarks), post_index, P)
+        report.skipped += len(users) - len(inputs)
+        if not inputs:
+            return
+        exclude = [[post_index[j] for j in i.liked_ids if j in post_index] for i in inputs]
+        idx, scores = await asyncio.to_thread(
+            topk_blocked, U, P, self.k, exclude, post_block=self._post_block(),
+        )
+        now = datetime.now(timezone.utc)
+        docs: List[Dict[str, Any]] = []
+        for r, i in enumerate(inputs):
+            valid = np.isfinite(scores[r])
+            docs.append({
+                "user_id": i.user_id,
+                "job_ids": [post_ids[j] for j in idx[r][valid]],
+                "scores": [round(float(s), 6) for s in scores[r][valid]],
+                "fingerprint": i.fingerprint,
+                "generated_at": now,
+            })
+        report.written += await self.repo.bulk_replace(docs)
+        report.users += len(inputs)
+
+async def _main() -> None:
+    from database import init_db
+    _, client = await init_db(index_mode="sync")
+    try:
+        print(await RecommendationBatch().run())
+    finally:
+        client.close()
+
+if __name__ == "__main__":
+    asyncio.run(_main())
@@ -4,6 +4,7 @@ from typing import Any, Dict, Tuple
 from schemas.user import SignUpRequest, UserUpdateRequest, UserResponse, QnACreate, QnAUpdate
 from repositories.user_repository import UserRepository
 from services import file
+from utils.recommendation import recommendation_cache
 from uuid import UUID, uuid4
 from datetime import datetime, timezone
 
@@ -67,6 +68,7 @@ class UserService:
         updated = await self.repo.update(user_id, payload)
         if not updated:
             raise ValueError("업데이트 실패 또는 사용자를 찾을 수 없습니다.")
+        recommendation_cache.invalidate(user_id)   # 추천 입력(희망 포지션/역량 등)이 바뀌었을 수 있음
         return UserResponse.from_doc(updated.dict())
 
     # 이미지 업로드
@@ -6,6 +6,7 @@ load_dotenv()
 # DB Configs
 MONGO_URI = os.getenv("MONGO_URI", "mongodb://localhost:27017")
 DB_NAME = os.getenv("DB_NAME", "db")
+MONGO_INDEX_MODE = os.getenv("MONGO_INDEX_MODE", "background")  # background(시작 후 생성 + 실행 계획 점검) | sync(생성 끝날 때까지 대기) | off
 
 # JWT Configs
 JWT_SECRET = os.getenv("JWT_SECRET", "secret")
@@ -25,3 +26,87 @@ GCP_PROJECT_ID = os.getenv("GCP_PROJECT_ID")
 # VectorDB
 VC_HOST = os.getenv("VC_HOST")
 VC_PORT = os.getenv("VC_PORT", 8000)
+
+# RAG Search
+RAG_ENCODE_WORKERS = int(os.getenv("RAG_ENCODE_WORKERS", 2))          # 쿼리 임베딩(CPU) 전용 스레드 수
+RAG_SEARCH_CONCURRENCY = int(os.getenv("RAG_SEARCH_CONCURRENCY", 8))  # 워커당 동시 검색 상한
+RAG_SCORE_MODE = os.getenv("RAG_SCORE_MODE", "distance")  # distance(1 - cosine distance) | embedding(임베딩 받아 재계산)
+# 진행 중(status/due_ts) 공고만 검색. status/due_ts 메타데이터가 없는 기존 인덱스에서는 결과가 0건이 되므로
+# python -m services.job_posting_indexer --full로 재인덱싱한 뒤 true로 켠다
+SEARCH_LIVE_ONLY = os.getenv("SEARCH_LIVE_ONLY", "false").lower() == "true"
+
+# Where-clause Cache
+WHERE_CACHE_BACKEND = os.getenv("WHERE_CACHE_BACKEND", "memory")  # memory | mongo(워커 간 공유)
+WHERE_CACHE_MAXSIZE = int(os.getenv("WHERE_CACHE_MAXSIZE", 5000))
+WHERE_CACHE_TTL_SECONDS = int(os.getenv("WHERE_CACHE_TTL_SECONDS", 86400))
+
+# Where Extractor
+WHERE_EXTRACTOR_MODE = os.getenv("WHERE_EXTRACTOR_MODE", "hybrid")  # hybrid | llm | report
+WHERE_RULES_MIN_CONFIDENCE = float(os.getenv("WHERE_RULES_MIN_CONFIDENCE", 1.0))
+
+# Query Embedding Cache
+EMBED_CACHE_MAX_MB = int(os.getenv("EMBED_CACHE_MAX_MB", 32))
+
+# Query Embedding Micro-batching (동시 검색어 인코딩을 한 번의 배치로)
+EMBED_BATCH_ENABLED = os.getenv("EMBED_BATCH_ENABLED", "true").lower() == "true"
+EMBED_BATCH_MAX_SIZE = int(os.getenv("EMBED_BATCH_MAX_SIZE", 32))
+EMBED_BATCH_MAX_WAIT_MS = float(os.getenv("EMBED_BATCH_MAX_WAIT_MS", 3.0))  # 첫 요청 후 더 모으는 최대 대기
+
+# List Counts (목록 API total)
+COUNT_CACHE_SIZE = int(os.getenv("COUNT_CACHE_SIZE", 10000))
+COUNT_CACHE_TTL_SECONDS = int(os.getenv("COUNT_CACHE_TTL_SECONDS", 30))  # 필터별 정확한 개수 캐시 (쓰기 시 같은 프로세스에서는 즉시 무효화)
+JOB_LIST_TOTAL_MODE = os.getenv("JOB_LIST_TOTAL_MODE", "exact")  # exact(진행 중 공고 수, 캐시) | estimated(컬렉션 추정치, 마감 공고 포함)
+
+# Search Result Cache
+SEARCH_RESULT_CACHE_SIZE = int(os.getenv("SEARCH_RESULT_CACHE_SIZE", 1000))
+SEARCH_RESULT_CACHE_TTL_SECONDS = int(os.getenv("SEARCH_RESULT_CACHE_TTL_SECONDS", 300))
+SEARCH_RESULT_POOL = int(os.getenv("SEARCH_RESULT_POOL", 500))  # 첫 검색 때 받아둘 청크 후보 수
+
+# Vector Store
+VECTOR_BACKEND = os.getenv("VECTOR_BACKEND", "chroma")  # chroma(원격 HttpClient) | local(프로세스 내 인덱스)
+VECTOR_SNAPSHOT_PATH = os.getenv("VECTOR_SNAPSHOT_PATH", "./vector_snapshot")
+VECTOR_HNSW_MIN_ROWS = int(os.getenv("VECTOR_HNSW_MIN_ROWS", 50000))  # 이 이상이면 hnswlib 사용(설치 시)
+
+# Job Posting Indexer
+INDEX_ENCODE_BATCH = int(os.getenv("INDEX_ENCODE_BATCH", 512))  # 한 번에 인코딩/upsert할 청크 수
+
+# Job Posting Sync (Mongo → 벡터 저장소)
+JOB_SYNC_MODE = os.getenv("JOB_SYNC_MODE", "off")  # off | change_stream | poll
+JOB_SYNC_BATCH_SIZE = int(os.getenv("JOB_SYNC_BATCH_SIZE", 64))
+JOB_SYNC_MAX_WAIT_SECONDS = float(os.getenv("JOB_SYNC_MAX_WAIT_SECONDS", 2.0))  # 마이크로배치를 모으는 최대 대기
+JOB_SYNC_POLL_SECONDS = float(os.getenv("JOB_SYNC_POLL_SECONDS", 30.0))  # poll 모드 조회 주기
+# 공유 벡터 저장소(Chroma)에 쓰는 프로세스: lock(같은 호스트에서 파일 락을 잡은 하나) | true | false (호스트가 여럿이면 한 곳만 true)
+# VECTOR_BACKEND=local이면 모든 프로세스가 자기 저장소에 반영하고 스냅샷 저장만 리더가 한다
+JOB_SYNC_LEADER = os.getenv("JOB_SYNC_LEADER", "lock")
+JOB_SYNC_LOCK_PATH = os.getenv("JOB_SYNC_LOCK_PATH", "/tmp/job_posting_sync.lock")
+
+# Recommendation
+RECO_POOL = int(os.getenv("RECO_POOL", 200))  # 사용자별로 캐시해 둘 추천 공고 수
+RECO_MAX_BOOKMARKS = int(os.getenv("RECO_MAX_BOOKMARKS", 50))  # 사용자 벡터에 반영할 최근 북마크 수
+RECO_PROFILE_WEIGHT = float(os.getenv("RECO_PROFILE_WEIGHT", 0.5))  # 프로필 vs 북마크 벡터 가중치
+RECO_CACHE_SIZE = int(os.getenv("RECO_CACHE_SIZE", 10000))
+RECO_CACHE_TTL_SECONDS = int(os.getenv("RECO_CACHE_TTL_SECONDS", 86400))  # 마감 공고가 오래 남지 않도록 상한
+RECO_BATCH_USER_BLOCK = int(os.getenv("RECO_BATCH_USER_BLOCK", 2048))  # 야간 배치: 한 번에 점수 계산할 사용자 수
+RECO_BATCH_MEMORY_MB = int(os.getenv("RECO_BATCH_MEMORY_MB", 512))  # 야간 배치: 점수 블록 메모리 상한
+
+# Hybrid Search (BM25 키워드 + 벡터, RRF 결합)
+SEARCH_HYBRID = os.getenv("SEARCH_HYBRID", "false").lower() == "true"  # true면 API 시작 시 Mongo에서 키워드 색인 생성
+SEARCH_HYBRID_POOL = int(os.getenv("SEARCH_HYBRID_POOL", 150))  # 하이브리드일 때 첫 검색 청크 후보 수 (SEARCH_RESULT_POOL 대신)
+SEARCH_RRF_K = int(os.getenv("SEARCH_RRF_K", 60))
+
+# Rerank (크로스 인코더, 선택)
+RERANK_MODEL = os.getenv("RERANK_MODEL", "")  # 예: cross-encoder/mmarco-mMiniLMv2-L12-H384-v1, 비우면 사용 안 함
+RERANK_TOP_N = int(os.getenv("RERANK_TOP_N", 30))  # 재정렬할 상위 공고 수
+RERANK_BUDGET_MS = int(os.getenv("RERANK_BUDGET_MS", 250))  # 넘으면 1차 순서 그대로 응답
+RERANK_MAX_PENDING = int(os.getenv("RERANK_MAX_PENDING", 2))  # 실행/대기 중인 재정렬 배치 상한, 차 있으면 재정렬 생략
+RERANK_CACHE_SIZE = int(os.getenv("RERANK_CACHE_SIZE", 50000))  # (검색어, 공고) 점수 캐시 항목 수
+
+# Encoder
+ENCODER_BACKEND = os.getenv("ENCODER_BACKEND", "torch")  # torch | onnx | onnx-int8 (encoder export 필요)
+ENCODER_ONNX_DIR = os.getenv("ENCODER_ONNX_DIR", "./onnx_models")
+ENCODER_THREADS = int(os.getenv("ENCODER_THREADS", 0))  # onnxruntime intra-op 스레드 수 (0이면 기본값)
+ENCODER_MODE = os.getenv("ENCODER_MODE", "local")  # local(워커마다 지연 로드) | shared(encoder serve 프로세스 하나를 워커들이 공유)
+ENCODER_SHARED_ADDRESS = os.getenv("ENCODER_SHARED_ADDRESS", "127.0.0.1:50071")
+# shared 모드 필수, 기본값 없음 (encoder serve와 API 워커에 같은 값). 예: python -c "import secrets; print(secrets.token_hex(32))"
+ENCODER_SHARED_AUTHKEY = os.getenv("ENCODER_SHARED_AUTHKEY", "")
+ENCODER_PRELOAD = os.getenv("ENCODER_PRELOAD", "false").lower() == "true"  # main import 시 로드 (gunicorn --preload로 fork 전에 올려 워커 간 공유, torch 백엔드용)
@@ -20,4 +20,20 @@ def get_gemini_response(prompt, gemini_model=GEMINI_MODEL, temperature=0.7):
         return response.text
     except Exception as e:
         print("API 호출 중 에러가 발생했습니다.")
-        raise e
\ No newline at end of file
+        raise e
+
+async def get_gemini_response_async(prompt, gemini_model=GEMINI_MODEL, temperature=0.7):
+    """
+    get_gemini_response의 비동기 버전.
+    이벤트 루프를 막지 않도록 generate_content_async를 사용한다.
+    """
+    model = genai.GenerativeModel(gemini_model, generation_config=genai.GenerationConfig(
+        temperature=temperature
+    ))
+
+    try:
+        response = await model.generate_content_async(prompt)
+        return response.text
+    except Exception as e:
+        print("API 호출 중 에러가 발생했습니다.")
+        raise e
@@ -0,0 +1,79 @@
+# utils/count_cache.py
+# 목록 API의 전체 개수(total) 계층
+# - 필터 없는 컬렉션: estimated_document_count (컬렉션 메타데이터만 읽음, 스캔 없음)
+# - 필터가 있으면: 정확한 count를 (컬렉션, scope, key)별로 짧은 TTL 캐시
+# - 리포지토리가 쓰기(생성/삭제) 시 invalidate(컬렉션, scope) → 같은 프로세스에서는 바로 반영
+#   (다른 워커는 TTL 동안 이전 값이 보일 수 있음)
+# - 무효화 직전에 시작한 count 결과는 캐시에 넣지 않음 (scope별 버전 비교)
+from typing import Any, Dict, Optional, Tuple, Type
+
+from beanie import Document
+from cachetools import TTLCache
+
+from settings import COUNT_CACHE_SIZE, COUNT_CACHE_TTL_SECONDS
+
+class CountCache:
+    def __init__(self, maxsize: int, ttl_seconds: int):
+        self._data: TTLCache = TTLCache(maxsize=maxsize, ttl=ttl_seconds)
+        self._versions: Dict[Tuple[str, Optional[str]], int] = {}
+        self.hits = 0
+        self.misses = 0
+        self.estimated = 0
+        self.invalidations = 0
+
+    def _version(self, collection: str, scope: Optional[str]) -> Tuple[int, int]:
+        # 컬렉션 전체 무효화(scope=None)와 scope 무효화를 모두 반영
+        return self._versions.get((collection, None), 0), self._versions.get((collection, scope), 0)
+
+    async def count(
+        self,
+        document_cls: Type[Document],
+        filter: Optional[Dict[str, Any]] = None,
+        *,
+        key: Optional[str] = None,
+        scope: Optional[str] = None,
+    ) -> int:
+        """
+        filter가 비었으면 추정치, 아니면 캐시된 정확한 개수.
+        key: 캐시 키 (생략 시 filter 문자열; 매번 달라지는 값(현재 시각 등)이 들어간 filter는 key를 직접 지정)
+        scope: 무효화 단위 (예: user_id)
+        """
+        collection = document_cls.get_collection_name()
+        if not filter:
+            self.estimated += 1
+            return await document_cls.get_pymongo_collection().estimated_document_count()
+
+        cache_key = (collection, scope, key if key is not None else repr(sorted(filter.items())))
+        n = self._data.get(cache_key)
+        if n is not None:
+            self.hits += 1
+            return n
+        self.misses += 1
+        version = self._version(collection, scope)
+        n = await document_cls.find(filter).count()
+        if self._version(collection, scope) == version:
+            self._data[cache_key] = n
+        return n
+
+    def invalidate(self, document_cls: Type[Document], scope: Optional[str] = None) -> None:
+        """scope의 캐시된 개수를 버림 (scope=None이면 컬렉션 전체)"""
+        collection = document_cls.get_collection_name()
+        vkey = (collection, scope)
+        self._versions[vkey] = self._versions.get(vkey, 0) + 1
+        for k in [k for k in list(self._data.keys()) if k[0] == collection and (scope is None or k[1] == scope)]:
+            self._data.pop(k, None)
+        self.invalidations += 1
+
+    def stats(self) -> Dict[str, Any]:
+        lookups = self.hits + self.misses
+        return {
+            "entries": len(self._data),
+            "hits": self.hits,
+            "misses": self.misses,
+            "estimated": self.estimated,
+            "invalidations": self.invalidations,
+            "hit_ratio": (self.hits / lookups) if lookups else 0.0,
+        }
+
+# 프로세스 공용 인스턴스 (목록 리포지토리가 조회/무효화)
+count_cache = CountCache(maxsize=COUNT_CACHE_SIZE, ttl_seconds=COUNT_CACHE_TTL_SECONDS)
@@ -0,0 +1,151 @@
+# utils/embedding_batcher.py
+# 쿼리 임베딩 마이크로배처: 동시에 들어온 검색어 인코딩을 모아 한 번의 배치 forward로 처리
+# - 첫 요청이 들어오면 최대 max_wait_ms 동안 더 모으고, max_batch개가 차면 즉시 실행
+# - 배치 실행은 스레드풀에서 (동시에 max_inflight개까지), 그동안 들어온 요청은 다음 배치로 쌓임
+# - 같은 배치 안의 같은 검색어는 한 번만 인코딩
+# - stats(): 배치 크기 / 큐 깊이 히스토그램, 대기 시간 → EMBED_BATCH_* 튜닝용
+from __future__ import annotations
+
+import asyncio
+import time
+from bisect import bisect_left
+from concurrent.futures import Executor
+from typing import Callable, Dict, List, Optional, Sequence, Tuple
+
+import numpy as np
+
+# 히스토그램 구간 상한 (마지막은 그 이상 전부)
+_BUCKETS = (1, 2, 4, 8, 16, 32, 64, 128)
+
+class _Histogram:
+    def __init__(self, bounds: Sequence[int] = _BUCKETS):
+        self.bounds = tuple(bounds)
+        self.counts = [0] * (len(self.bounds) + 1)
+        self.n = 0
+        self.total = 0
+        self.max = 0
+
+    def observe(self, v: int) -> None:
+        self.counts[bisect_left(self.bounds, v)] += 1
+        self.n += 1
+        self.total += v
+        self.max = max(self.max, v)
+
+    def snapshot(self) -> Dict[str, object]:
+        labels = [f"<={b}" for b in self.bounds] + [f">{self.bounds[-1]}"]
+        return {
+            "mean": round(self.total / self.n, 2) if self.n else 0.0,
+            "max": self.max,
+            "buckets": {k: c for k, c in zip(labels, self.counts) if c},
+        }
+
+class EmbeddingBatcher:
+    def __init__(
+        self,
+        encode: Callable[[List[str]], np.ndarray],
+        *,
+        executor: Optional[Executor] = None,
+        max_batch: int = 32,
+        max_wait_ms: float = 3.0,
+        max_inflight: int = 1,
+    ):
+        self._encode = encode
+        self._executor = executor
+        self.max_batch = max_batch
+        self.max_wait = max_wait_ms / 1000.0
+        self.max_inflight = max_inflight
+        self._pending: List[Tuple[str, asyncio.Future, float]] = []
+        # 이벤트 루프에 묶이는 객체는 처음 쓰는 루프에서 생성 (스크립트가 asyncio.run을 여러 번 불러도 안전)
+        self._loop: Optional[asyncio.AbstractEventLoop] = None
+        self._arrived: Optional[asyncio.Event] = None
+        self._full: Optional[asyncio.Event] = None
+        self._slots: Optional[asyncio.Semaphore] = None
+        self._worker: Optional[asyncio.Task] = None
+        self.batch_sizes = _Histogram()
+        self.queue_depths = _Histogram()
+        self.batches = 0
+        self.items = 0
+        self.deduped = 0
+        self.errors = 0
+        self.wait_ms_total = 0.0
+
+    def _ensure_loop(self) -> None:
+        loop = asyncio.get_running_loop()
+        if self._loop is loop and self._worker is not None and not self._worker.done():
+            return
+        if self._loop is not loop:
+            self._pending = []
+            self._arrived = asyncio.Event()
+            self._full = asyncio.Event()
+            self._slots = asyncio.Semaphore(self.max_inflight)
+            self._loop = loop
+        self._worker = loop.create_task(self._run())
+
+    async def encode(self, text: str) -> np.ndarray:
+        """text 하나의 임베딩 (정규화 전, 1-D float32)"""
+        self._ensure_loop()
+        fut = self._loop.create_future()
+        self._pending.append((text, fut, time.perf_counter()))
+        self._arrived.set()
+        if len(self._pending) >= self.max_batch:
+            self._full.set()
+        return await fut
+
+    async def _run(self) -> None:
+        while True:
+            await self._arrived.wait()
+            await self._slots.acquire()
+            # 실행 슬롯을 얻은 뒤 max_wait만큼 더 모음 (슬롯을 기다리는 동안 쌓인 요청은 바로 나감)
+            if len(self._pending) < self.max_batch:
+                try:
+                    await asyncio.wait_for(self._full.wait(), timeout=self.max_wait)
+                except asyncio.TimeoutError:
+                    pass
+            self.queue_depths.observe(len(self._pending))
+            batch, self._pending = self._pending[:self.max_batch], self._pending[self.max_batch:]
+            if len(self._pending) < self.max_batch:
+                self._full.clear()
+            if not self._pending:
+                self._arrived.clear()
+            batch = [b for b in batch if not b[1].cancelled()]
+            if not batch:
+                self._slots.release()
+                continue
+            self._loop.create_task(self._flush(batch))
+
+    async def _flush(self, batch: List[Tuple[str, asyncio.Future, float]]) -> None:
+        try:
+            texts = list(dict.fromkeys(t for t, _, _ in batch))
+            started = time.perf_counter()
+            self.batches += 1
+            self.items += len(batch)
+            self.deduped += len(batch) - len(texts)
+            self.batch_sizes.observe(len(texts))
+            self.wait_ms_total += sum(started - t0 for _, _, t0 in batch) * 1000
+            try:
+                vecs = await self._loop.run_in_executor(self._executor, self._encode, texts)
+            except Exception as e:
+                self.errors += 1
+                for _, fut, _ in batch:
+                    if not fut.done():
+                        fut.set_exception(e)
+                return
+            row = {t: i for i, t in enumerate(texts)}
+            vecs = np.asarray(vecs, dtype=np.float32)
+            for t, fut, _ in batch:
+                if not fut.done():
+                    fut.set_result(vecs[row[t]])
+        finally:
+            self._slots.release()
+
+    def stats(self) -> Dict[str, object]:
+        return {
+            "batches": self.batches,
+            "items": self.items,
+            "deduped": self.deduped,
+            "errors": self.errors,
+            "queue_depth": len(self._pending),
+            "avg_wait_ms": round(self.wait_ms_total / self.items, 3) if self.items else 0.0,
+            "batch_size": self.batch_sizes.snapshot(),
+            "queue_depth_at_flush": self.queue_depths.snapshot(),
+        }
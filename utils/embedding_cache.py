@@ -0,0 +1,75 @@
+# utils/embedding_cache.py
+# 쿼리 임베딩 캐시: (모델명, 쿼리 텍스트) → L2 정규화된 float32 벡터
+# - 같은 검색어의 재검색/다음 페이지 요청은 트랜스포머 forward를 건너뛴다.
+# - 항목 수가 아니라 실제 바이트 수로 상한을 관리한다 (LRU 축출).
+from collections import OrderedDict
+from typing import Any, Dict, Optional, Tuple
+
+import numpy as np
+
+# 키 문자열/튜플/ndarray 헤더 등 벡터 외 부가 메모리 추정치
+_ENTRY_OVERHEAD_BYTES = 200
+
+class QueryEmbeddingCache:
+    def __init__(self, max_bytes: int):
+        self.max_bytes = max_bytes
+        self._data: "OrderedDict[Tuple[str, str], np.ndarray]" = OrderedDict()
+        self.bytes = 0
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+
+    @staticmethod
+    def _key(text: str, model_name: str) -> Tuple[str, str]:
+        return model_name, text.strip()
+
+    @staticmethod
+    def _size(key: Tuple[str, str], vec: np.ndarray) -> int:
+        return vec.nbytes + len(key[1].encode("utf-8")) + _ENTRY_OVERHEAD_BYTES
+
+    def get(self, text: str, model_name: str) -> Optional[np.ndarray]:
+        key = self._key(text, model_name)
+        vec = self._data.get(key)
+        if vec is None:
+            self.misses += 1
+            return None
+        self._data.move_to_end(key)
+        self.hits += 1
+        return vec
+
+    def clear(self) -> None:
+        self._data.clear()
+        self.bytes = 0
+
+    def put(self, text: str, model_name: str, vec: np.ndarray) -> np.ndarray:
+        """벡터를 float32 읽기 전용 배열로 저장하고 저장된 배열을 반환"""
+        key = self._key(text, model_name)
+        arr = np.ascontiguousarray(vec, dtype=np.float32).reshape(-1)
+        arr.setflags(write=False)   # 캐시된 벡터를 호출자가 실수로 바꾸지 못하게
+        size = self._size(key, arr)
+        if size > self.max_bytes:
+            return arr
+
+        old = self._data.pop(key, None)
+        if old is not None:
+            self.bytes -= self._size(key, old)
+        self._data[key] = arr
+        self.bytes += size
+
+        while self.bytes > self.max_bytes and self._data:
+            k, v = self._data.popitem(last=False)
+            self.bytes -= self._size(k, v)
+            self.evictions += 1
+        return arr
+
+    def stats(self) -> Dict[str, Any]:
+        lookups = self.hits + self.misses
+        return {
+            "entries": len(self._data),
+            "bytes": self.bytes,
+            "max_bytes": self.max_bytes,
+            "hits": self.hits,
+            "misses": self.misses,
+            "evictions": self.evictions,
+            "hit_ratio": (self.hits / lookups) if lookups else 0.0,
+        }
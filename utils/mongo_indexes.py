@@ -0,0 +1,181 @@
+# utils/mongo_indexes.py
+# Mongo 인덱스 관리
+# - 선언: 각 Document 모델의 Indexed(...) 필드 + Settings.indexes (Beanie와 같은 규칙)
+# - 생성: init_db가 Beanie 인덱스 생성을 건너뛰고 여기서 백그라운드로 생성 (큰 컬렉션도 시작을 막지 않음)
+#   기존 인덱스는 지우지 않음. 유니크 인덱스가 중복 데이터로 실패하면 로그만 남기고 나머지는 계속
+# - 점검: 리포지토리의 주요 쿼리(HOT_QUERIES)를 explain()해서 COLLSCAN / 메모리 정렬(SORT)이 있으면 경고
+#
+# 수동 실행: python -m utils.mongo_indexes [--no-build]
+from __future__ import annotations
+
+import asyncio
+import logging
+import sys
+from dataclasses import dataclass, field
+from datetime import datetime, timezone
+from typing import Any, Callable, Dict, List, Optional, Sequence, Tuple, Type
+
+from beanie import Document
+from pymongo import IndexModel
+from pymongo.errors import OperationFailure
+
+from models.cover_letter_document import CoverLetterDocument
+from models.job_posting_document import JobPostingDocument
+from models.refresh_token_document import RefreshTokenDocument
+from models.user_document import UserDocument
+from models.user_job_bookmark_document import UserJobBookmarkDocument
+from models.user_recommendation_document import UserRecommendationDocument
+from models.where_cache_document import WhereCacheDocument
+from repositories.mongo_repositories.job_posting_mongodb_repository import live_filter
+
+logger = logging.getLogger(__name__)
+
+# ===== 선언된 인덱스 =====
+def declared_indexes(cls: Type[Document]) -> List[IndexModel]:
+    """Indexed(...) 필드와 Settings.indexes를 IndexModel 목록으로 (init_beanie 이후 호출)"""
+    from beanie.odm.utils.init import get_index_attributes, get_model_fields
+
+    out: List[IndexModel] = []
+    for name, f in get_model_fields(cls).items():
+        attrs = get_index_attributes(f)
+        if attrs is not None:
+            out.append(IndexModel([(f.alias or name, attrs[0])], **attrs[1]))
+    # init_beanie가 Settings.indexes를 IndexModelField 목록으로 바꿔 둠
+    out += [f.index for f in cls.get_settings().indexes or []]
+    return out
+
+@dataclass
+class IndexBuildReport:
+    created: Dict[str, List[str]] = field(default_factory=dict)    # 컬렉션 → 인덱스 이름
+    failed: Dict[str, str] = field(default_factory=dict)           # "컬렉션.인덱스" → 오류
+    seconds: float = 0.0
+
+async def ensure_indexes(models: Sequence[Type[Document]]) -> IndexBuildReport:
+    """선언된 인덱스 중 없는 것만 생성 (인덱스마다 따로 만들어 하나가 실패해도 나머지는 생성)"""
+    report = IndexBuildReport()
+    started = asyncio.get_running_loop().time()
+    for cls in models:
+        coll = cls.get_pymongo_collection()
+        existing = await coll.index_information()
+        by_keys = {tuple(tuple(k) for k in info["key"]): (name, info) for name, info in existing.items()}
+        for idx in declared_indexes(cls):
+            doc = idx.document
+            keys = tuple((k, v) for k, v in doc["key"].items())
+            if doc["name"] in existing:
+                continue
+            if keys in by_keys:
+                # 같은 키의 인덱스가 다른 이름/옵션으로 이미 있음 → 자동으로 바꾸지 않음 (수동 마이그레이션)
+                name, info = by_keys[keys]
+                if doc.get("unique") and not info.get("unique"):
+                    report.failed[f"{coll.name}.{doc['name']}"] = f"기존 인덱스 {name}가 unique 아님"
+                    logger.warning("인덱스 %s.%s: 같은 키의 %s가 unique가 아님 (중복 정리 후 교체 필요)",
+                                   coll.name, doc["name"], name)
+                continue
+            try:
+                await coll.create_indexes([idx])
+                report.created.setdefault(coll.name, []).append(doc["name"])
+                logger.info("인덱스 생성: %s.%s", coll.name, doc["name"])
+            except OperationFailure as e:
+                report.failed[f"{coll.name}.{doc['name']}"] = str(e)
+                logger.error("인덱스 생성 실패: %s.%s (%s)", coll.name, doc["name"], e)
+    report.seconds = asyncio.get_running_loop().time() - started
+    return report
+
+# ===== 주요 쿼리 explain 점검 =====
+# (이름, 모델, filter 생성 함수, sort) — 리포지토리 쿼리와 같은 모양 (값은 더미)
+HotQuery = Tuple[str, Type[Document], Callable[[], Dict[str, Any]], Optional[List[Tuple[str, int]]]]
+
+HOT_QUERIES: List[HotQuery] = [
+    ("job_postings.list_recent", JobPostingDocument, live_filter, [("_id", -1)]),
+    ("job_postings.count_live", JobPostingDocument, live_filter, None),
+    ("job_postings.poll_recrawled", JobPostingDocument,
+     lambda: {"metadata.crawledAt": {"$gt": datetime.now(timezone.utc)}}, [("metadata.crawledAt", 1)]),
+    ("bookmarks.is_bookmarked", UserJobBookmarkDocument, lambda: {"user_id": "u", "job_id": "j"}, None),
+    ("bookmarks.bookmarked_in_ids", UserJobBookmarkDocument,
+     lambda: {"user_id": "u", "job_id": {"$in": ["j1", "j2"]}}, None),
+    ("bookmarks.list_user", UserJobBookmarkDocument, lambda: {"user_id": "u"}, [("created_at", 1), ("_id", 1)]),
+    ("bookmarks.recent_job_ids", UserJobBookmarkDocument, lambda: {"user_id": "u"}, [("created_at", -1)]),
+    ("cover_letters.list_by_user", CoverLetterDocument, lambda: {"user_id": "u"},
+     [("updated_at", -1), ("_id", -1)]),
+    ("cover_letters.list_by_user_type", CoverLetterDocument, lambda: {"user_id": "u", "type": "profile"},
+     [("updated_at", -1), ("_id", -1)]),
+    ("cover_letters.list_by_user_job", CoverLetterDocument, lambda: {"user_id": "u", "job_posting_id": "j"},
+     [("updated_at", -1), ("_id", -1)]),
+    ("refresh_tokens.by_token", RefreshTokenDocument, lambda: {"token": "t"}, None),
+    ("refresh_tokens.by_user", RefreshTokenDocument, lambda: {"user_id": "u"}, None),
+    ("users.by_email", UserDocument, lambda: {"email": "a@b.c"}, None),
+    ("user_recommendations.by_user", UserRecommendationDocument, lambda: {"user_id": "u"}, None),
+    ("where_cache.by_key", WhereCacheDocument, lambda: {"key": "k"}, None),
+]
+
+def _plan_stages(plan: Dict[str, Any]) -> List[Tuple[str, Optional[str]]]:
+    """winningPlan 트리 → [(stage, indexName)]"""
+    out = [(plan.get("stage", "?"), plan.get("indexName"))]
+    for key in ("inputStage", "queryPlan"):
+        if key in plan:
+            out += _plan_stages(plan[key])
+    for child in plan.get("inputStages", []):
+        out += _plan_stages(child)
+    return out
+
+@dataclass
+class QueryPlanCheck:
+    name: str
+    collection: str
+    stages: List[str]
+    indexes: List[str]
+    ok: bool
+
+async def explain_hot_queries(queries: Sequence[HotQuery] = HOT_QUERIES) -> List[QueryPlanCheck]:
+    out: List[QueryPlanCheck] = []
+    for name, cls, make_filter, sort in queries:
+        coll = cls.get_pymongo_collection()
+        cursor = coll.find(make_filter())
+        if sort:
+            cursor = cursor.sort(sort)
+        plan = (await cursor.limit(20).explain())["queryPlanner"]["winningPlan"]
+        stages = _plan_stages(plan)
+        names = [s for s, _ in stages]
+        indexes = [i for _, i in stages if i]
+        ok = "COLLSCAN" not in names and "SORT" not in names
+        out.append(QueryPlanCheck(name, coll.name, names, indexes, ok))
+    return out
+
+def format_plan_report(checks: Sequence[QueryPlanCheck]) -> str:
+    lines = [f"{'query':<36} {'ok':<3} {'plan':<40} index"]
+    for c in checks:
+        lines.append(f"{c.name:<36} {'ok' if c.ok else '!!':<3} {' > '.join(c.stages):<40} {', '.join(c.indexes)}")
+    return "\n".join(lines)
+
+async def build_and_report(models: Sequence[Type[Document]], *, build: bool = True, report: bool = True) -> None:
+    """init_db가 백그라운드로 실행: 인덱스 생성 → 주요 쿼리 실행 계획 로그"""
+    try:
+        if build:
+            r = await ensure_indexes(models)
+            logger.info("인덱스 점검 완료: 생성 %d개, 실패 %d개 (%.1fs)",
+                        sum(len(v) for v in r.created.values()), len(r.failed), r.seconds)
+        if report:
+            checks = await explain_hot_queries()
+            bad = [c.name for c in checks if not c.ok]
+            logger.log(logging.WARNING if bad else logging.INFO, "주요 쿼리 실행 계획\n%s", format_plan_report(checks))
+            if bad:
+                logger.warning("인덱스를 타지 않거나 메모리 정렬하는 쿼리: %s", ", ".join(bad))
+    except asyncio.CancelledError:
+        raise
+    except Exception:
+        logger.exception("인덱스 생성/점검 실패")
+
+async def _main(build: bool) -> None:
+    from database import DOCUMENT_MODELS, init_db
+    _, client = await init_db(index_mode="off")
+    try:
+        if build:
+            r = await ensure_indexes(DOCUMENT_MODELS)
+            print(f"created={r.created} failed={r.failed} ({r.seconds:.1f}s)")
+        print(format_plan_report(await explain_hot_queries()))
+    finally:
+        client.close()
+
+if __name__ == "__main__":
+    logging.basicConfig(level=logging.INFO)
+    asyncio.run(_main(build="--no-build" not in sys.argv[1:]))
@@ -0,0 +1,77 @@
+# utils/recommendation.py
+# 사용자 맞춤 추천 보조: 프로필 → 임베딩용 텍스트, 추천 입력 지문(fingerprint), 사용자별 추천 캐시
+# - 캐시는 프로필/북마크가 바뀌어 지문이 달라지거나 명시적으로 invalidate될 때만 다시 계산
+import hashlib
+from dataclasses import dataclass
+from typing import Any, Dict, List, Optional, Tuple
+
+from bson import ObjectId
+from cachetools import TTLCache
+
+from settings import RECO_CACHE_SIZE, RECO_CACHE_TTL_SECONDS
+
+def user_profile_text(user) -> Tuple[str, List[str]]:
+    """
+    UserDocument → (임베딩할 프로필 텍스트, interest_jobs 중 공고 id로 보이는 것)
+    interest_jobs는 공고 id(ObjectId 문자열)면 북마크처럼 공고 벡터로, 아니면 텍스트로 사용
+    """
+    parts: List[str] = []
+    for p in user.preferred_position or []:
+        parts.append(" ".join(x for x in (p.job_group, p.job) if x))
+    parts.extend(c for c in (user.competencies or []) if c)
+    for w in user.work_experience or []:
+        parts.append(" ".join(x for x in (w.job_group, w.job, w.description) if x))
+
+    interest_ids: List[str] = []
+    for j in user.interest_jobs or []:
+        if ObjectId.is_valid(j):
+            interest_ids.append(j)
+        elif j and j.strip():
+            parts.append(j.strip())
+    return "\n".join(p for p in parts if p), interest_ids
+
+def fingerprint(profile_text: str, liked_ids: List[str]) -> str:
+    h = hashlib.sha1(profile_text.encode("utf-8"))
+    for j in sorted(set(liked_ids)):
+        h.update(b"\x00" + j.encode("ascii", "ignore"))
+    return h.hexdigest()[:16]
+
+@dataclass
+class _Entry:
+    fingerprint: str
+    job_ids: List[str]
+
+class RecommendationCache:
+    def __init__(self, maxsize: int, ttl_seconds: int):
+        self._data: TTLCache = TTLCache(maxsize=maxsize, ttl=ttl_seconds)
+        self.hits = 0
+        self.misses = 0
+        self.invalidations = 0
+
+    def get(self, user_id: str, fp: str) -> Optional[List[str]]:
+        entry = self._data.get(user_id)
+        if entry is None or entry.fingerprint != fp:
+            self.misses += 1
+            return None
+        self.hits += 1
+        return entry.job_ids
+
+    def put(self, user_id: str, fp: str, job_ids: List[str]) -> None:
+        self._data[user_id] = _Entry(fp, job_ids)
+
+    def invalidate(self, user_id: str) -> None:
+        if self._data.pop(user_id, None) is not None:
+            self.invalidations += 1
+
+    def stats(self) -> Dict[str, Any]:
+        lookups = self.hits + self.misses
+        return {
+            "users": len(self._data),
+            "hits": self.hits,
+            "misses": self.misses,
+            "invalidations": self.invalidations,
+            "hit_ratio": (self.hits / lookups) if lookups else 0.0,
+        }
+
+# 프로세스 공용 인스턴스 (추천 조회 / 프로필·북마크 변경 시 invalidate)
+recommendation_cache = RecommendationCache(maxsize=RECO_CACHE_SIZE, ttl_seconds=RECO_CACHE_TTL_SECONDS)
@@ -0,0 +1,107 @@
+# utils/search_result_cache.py
+# 검색 랭킹 캐시: 검색어별로 dedup된 전체 랭킹(best_by_source)을 잠깐 보관
+# - 2페이지 이후는 LLM/인코딩/Chroma 없이 캐시된 배열을 잘라서 응답
+# - cursor 토큰은 (랭킹 스냅샷 id, 다음 offset)을 담아 같은 스냅샷으로 일관되게 페이징
+import base64
+import binascii
+import hashlib
+import json
+import time
+from dataclasses import dataclass, field
+from typing import Any, Dict, List, Optional, Tuple
+
+import numpy as np
+from cachetools import TTLCache
+
+@dataclass
+class RankedResult:
+    snapshot_id: str
+    where: Optional[dict]
+    source_ids: List[str]               # score 내림차순, source_id(job_id) 단위로 dedup됨
+    scores: np.ndarray                  # source_ids와 같은 순서의 float32 score
+    n_results: int                      # 이 랭킹을 만들 때 요청한 청크 후보 수
+    exhausted: bool                     # 후보를 전부 받았는지 (더 요청해도 늘지 않음)
+    total: int = 0                      # where 조건에 맞는 전체 공고 수
+    reusable: bool = True               # 같은 검색어의 새 요청에 재사용 가능 (False면 cursor로만 조회, 예: 재정렬 실패)
+    created_at: float = field(default_factory=time.time)
+
+    def page(self, offset: int, limit: int) -> List[str]:
+        return self.source_ids[max(0, offset):max(0, offset) + limit]
+
+    def covers(self, offset: int, limit: int) -> bool:
+        """offset/limit 구간을 이 랭킹만으로 응답할 수 있는지"""
+        return self.exhausted or offset + limit <= len(self.source_ids)
+
+class SearchResultCache:
+    def __init__(self, maxsize: int = 1000, ttl_seconds: int = 300):
+        self._by_key: TTLCache = TTLCache(maxsize=maxsize, ttl=ttl_seconds)    # 검색어 키 → 스냅샷 id
+        self._by_id: TTLCache = TTLCache(maxsize=maxsize, ttl=ttl_seconds)     # 스냅샷 id → RankedResult
+        self.hits = 0
+        self.misses = 0
+
+    @staticmethod
+    def make_key(query_norm: str, model_name: str) -> str:
+        return hashlib.sha1(f"{model_name}\x00{query_norm}".encode("utf-8")).hexdigest()[:16]
+
+    def get(self, key: str) -> Optional[RankedResult]:
+        sid = self._by_key.get(key)
+        res = self._by_id.get(sid) if sid else None
+        if res is None:
+            self.misses += 1
+        else:
+            self.hits += 1
+        return res
+
+    def get_snapshot(self, snapshot_id: str) -> Optional[RankedResult]:
+        res = self._by_id.get(snapshot_id)
+        if res is None:
+            self.misses += 1
+        else:
+            self.hits += 1
+        return res
+
+    def put(self, key: str, res: RankedResult) -> None:
+        if res.reusable:
+            self._by_key[key] = res.snapshot_id
+        elif self._by_key.get(key) == res.snapshot_id:
+            del self._by_key[key]
+        self._by_id[res.snapshot_id] = res
+
+    def clear(self) -> None:
+        self._by_key.clear()
+        self._by_id.clear()
+
+    @staticmethod
+    def new_snapshot_id(key: str) -> str:
+        return f"{key}.{int(time.time() * 1000):x}"
+
+    @staticmethod
+    def snapshot_belongs_to(snapshot_id: str, key: str) -> bool:
+        """스냅샷 id가 이 검색어 키로 만든 것인지 (다른 검색어의 cursor로 랭킹을 가져가지 않도록)"""
+        return snapshot_id.startswith(key + ".")
+
+    def stats(self) -> Dict[str, Any]:
+        lookups = self.hits + self.misses
+        return {
+            "snapshots": len(self._by_id),
+            "hits": self.hits,
+            "misses": self.misses,
+            "hit_ratio": (self.hits / lookups) if lookups else 0.0,
+        }
+
+# ===== cursor 토큰 =====
+def encode_cursor(snapshot_id: str, offset: int) -> str:
+    raw = json.dumps({"s": snapshot_id, "o": offset}, separators=(",", ":")).encode("utf-8")
+    return base64.urlsafe_b64encode(raw).decode("ascii").rstrip("=")
+
+def decode_cursor(cursor: str) -> Tuple[str, int]:
+    """cursor → (snapshot_id, offset). 형식이 잘못되면 ValueError"""
+    try:
+        pad = "=" * (-len(cursor) % 4)
+        obj = json.loads(base64.urlsafe_b64decode(cursor + pad))
+        snapshot_id, offset = str(obj["s"]), int(obj["o"])
+    except (binascii.Error, ValueError, KeyError, TypeError):
+        raise ValueError("잘못된 cursor입니다.")
+    if offset < 0:
+        raise ValueError("잘못된 cursor입니다.")
+    return snapshot_id, offset
@@ -0,0 +1,143 @@
+# utils/where_cache.py
+# build_where_from_llm 결과(where 절) 캐시
+# - 1차: 프로세스 내 LRU + TTL (cachetools.TTLCache)
+# - 2차(선택): 워커/노드 간 공유 백엔드 (Mongo TTL 컬렉션)
+import asyncio
+import json
+from datetime import datetime, timezone, timedelta
+from typing import Any, Awaitable, Callable, Dict, Optional, Protocol
+
+from cachetools import TTLCache
+from models.where_cache_document import WhereCacheDocument
+from settings import WHERE_CACHE_BACKEND, WHERE_CACHE_MAXSIZE, WHERE_CACHE_TTL_SECONDS
+
+def normalize_query(query: str) -> str:
+    """대소문자/연속 공백 차이는 같은 검색어로 본다."""
+    return " ".join((query or "").lower().split())
+
+# ===== 공유 백엔드 인터페이스 =====
+class WhereCacheBackend(Protocol):
+    async def get(self, key: str) -> Optional[dict]: ...
+    async def set(self, key: str, where: dict, ttl_seconds: int) -> None: ...
+
+class MongoWhereCacheBackend:
+    """where_cache 컬렉션을 쓰는 공유 백엔드 (만료는 TTL 인덱스가 정리)"""
+    async def get(self, key: str) -> Optional[dict]:
+        doc = await WhereCacheDocument.find_one(WhereCacheDocument.key == key)
+        if not doc:
+            return None
+        # TTL 모니터는 60초 주기라 만료 직후 문서가 남아있을 수 있음
+        expires_at = doc.expires_at
+        if expires_at.tzinfo is None:
+            expires_at = expires_at.replace(tzinfo=timezone.utc)
+        if expires_at <= datetime.now(timezone.utc):
+            return None
+        return json.loads(doc.where_json)
+
+    async def set(self, key: str, where: dict, ttl_seconds: int) -> None:
+        exp = datetime.now(timezone.utc) + timedelta(seconds=ttl_seconds)
+        where_json = json.dumps(where, ensure_ascii=False)
+        await WhereCacheDocument.find_one(WhereCacheDocument.key == key).upsert(
+            {"$set": {"where_json": where_json, "expires_at": exp}},
+            on_insert=WhereCacheDocument(key=key, where_json=where_json, expires_at=exp),
+        )
+
+# ===== 캐시 본체 =====
+class WhereCache:
+    def __init__(
+        self,
+        maxsize: int = 5000,
+        ttl_seconds: int = 86400,
+        shared: Optional[WhereCacheBackend] = None,
+    ):
+        self.ttl_seconds = ttl_seconds
+        self.local: TTLCache = TTLCache(maxsize=maxsize, ttl=ttl_seconds)
+        self.shared = shared
+        self._inflight: Dict[str, asyncio.Future] = {}
+        self.hits = 0           # 로컬 LRU 적중
+        self.shared_hits = 0    # 공유 백엔드 적중
+        self.misses = 0         # 빌더(LLM 등) 호출
+        self.coalesced = 0      # 같은 검색어의 진행 중인 빌드를 기다려 결과를 받음 (single-flight)
+        self.rebuilds = 0       # 기다리던 빌드의 리더가 취소돼 다시 시도
+
+    async def get_or_build(self, query: str, builder: Callable[[str], Awaitable[dict]]) -> dict:
+        """
+        정규화된 query로 캐시를 조회하고, 없으면 builder(query)로 만들어 저장한다.
+        - 같은 검색어가 동시에 들어오면 builder는 한 번만 호출된다.
+        - 먼저 온 요청(리더)이 취소되면 기다리던 요청 중 하나가 다시 리더가 되어 만든다.
+        """
+        key = normalize_query(query)
+        while True:
+            where = self.local.get(key)
+            if where is not None:
+                self.hits += 1
+                return where
+
+            pending = self._inflight.get(key)
+            if pending is None:
+                break
+            try:
+                where = await asyncio.shield(pending)
+            except asyncio.CancelledError:
+                # 리더만 취소됐고 이 요청은 살아 있으면 다시 시도
+                task = asyncio.current_task()
+                if pending.cancelled() and not (task is not None and task.cancelling()):
+                    self.rebuilds += 1
+                    continue
+                raise
+            self.coalesced += 1
+            return where
+
+        fut = asyncio.get_running_loop().create_future()
+        self._inflight[key] = fut
+        try:
+            where = await self._load(key, query, builder)
+            fut.set_result(where)
+            return where
+        except Exception as e:
+            fut.set_exception(e)
+            # 대기자가 없으면 "exception was never retrieved" 경고 방지
+            fut.exception()
+            raise
+        finally:
+            # CancelledError 등으로 결과 없이 끝났으면 대기자를 깨운다
+            if not fut.done():
+                fut.cancel()
+            self._inflight.pop(key, None)
+
+    async def _load(self, key: str, query: str, builder: Callable[[str], Awaitable[dict]]) -> dict:
+        if self.shared is not None:
+            where = await self.shared.get(key)
+            if where is not None:
+                self.shared_hits += 1
+                self.local[key] = where
+                return where
+
+        self.misses += 1
+        where = await builder(query) or {}
+        self.local[key] = where
+        if self.shared is not None:
+            await self.shared.set(key, where, self.ttl_seconds)
+        return where
+
+    def stats(self) -> Dict[str, Any]:
+        lookups = self.hits + self.shared_hits + self.coalesced + self.misses
+        return {
+            "size": len(self.local),
+            "hits": self.hits,
+            "shared_hits": self.shared_hits,
+            "coalesced": self.coalesced,
+            "rebuilds": self.rebuilds,
+            "inflight": len(self._inflight),
+            "misses": self.misses,
+            "hit_ratio": ((self.hits + self.shared_hits + self.coalesced) / lookups) if lookups else 0.0,
+        }
+
+def build_where_cache() -> WhereCache:
+    """settings 값으로 WhereCache 생성 (WHERE_CACHE_BACKEND: memory | mongo)"""
+    shared = MongoWhereCacheBackend() if WHERE_CACHE_BACKEND == "mongo" else None
+    return WhereCache(
+        maxsize=WHERE_CACHE_MAXSIZE,
+        ttl_seconds=WHERE_CACHE_TTL_SECONDS,
+        shared=shared,
+    )
@@ -1,5 +1,7 @@
-import re, json
-from utils.ai import get_gemini_response
+import re, json, time
+from datetime import datetime, timezone
+from utils.ai import get_gemini_response, get_gemini_response_async
+from models.job_posting_document import INACTIVE_STATUSES
 
 BUCKET_SET = {
     "security","design","product","marketing","sales","cs",
@@ -103,6 +105,16 @@ def build_where_from_llm(query: str) -> dict:
     resp = get_gemini_response(PROMPT.format(query=query))
     obj = _extract_json(resp)
     # 2) 있는 키만 where로 조립
+    return _where_from_obj(obj, query)
+
+async def build_where_from_llm_async(query: str) -> dict:
+    """build_where_from_llm의 비동기 버전 (검색 API 경로에서 사용)"""
+    resp = await get_gemini_response_async(PROMPT.format(query=query))
+    obj = _extract_json(resp)
+    return _where_from_obj(obj, query)
+
+def _where_from_obj(obj: dict, query: str) -> dict:
+    """LLM이 뽑은 JSON 객체에서 허용된 키만 골라 Chroma where 절로 조립"""
     conds = []
 
     # 단일 bucket
@@ -165,6 +177,63 @@ def build_where_from_llm(query: str) -> dict:
         return conds[0]
     return {"$and": conds}
 
+# ===== 진행 중 공고 조건 =====
+def live_where(where: dict | None, now: float | None = None) -> dict:
+    """
+    where 절에 진행 중 공고 조건(status, due_ts >= 현재)을 붙인 새 dict를 반환한다.
+    - where는 캐시된 값일 수 있으므로 수정하지 않는다.
+    - 현재 시각은 시(hour) 단위로 내림해서 개수/랭킹 캐시 키가 한 시간 동안 유지되게 한다.
+    """
+    now = int(time.time() if now is None else now)
+    live = [
+        {"status": {"$nin": list(INACTIVE_STATUSES)}},
+        {"due_ts": {"$gte": now - now % 3600}},
+    ]
+    if not where:
+        return {"$and": live}
+    if set(where) == {"$and"}:
+        return {"$and": [*where["$and"], *live]}
+    return {"$and": [where, *live]}
+
+# ===== Chroma where → Mongo filter (검색 결과 전체 개수를 Mongo count로 셀 때) =====
+# 벡터 메타데이터 키 → 공고 문서 필드 (services/job_posting_indexer.posting_metadata의 역방향)
+_MONGO_FIELDS = {
+    "bucket": "bucket",
+    "location": "company.address.location",
+    "district": "company.address.district",
+    "salary_bucket_2m_label": "salary_bucket_2m_label",
+    "status": "status",
+}
+_MONGO_OPS = {"$eq", "$ne", "$in", "$nin", "$gt", "$gte", "$lt", "$lte"}
+
+def _due_ts_to_mongo(cond) -> dict:
+    # due_ts는 마감일 없는 공고를 NO_DUE_TS(먼 미래)로 저장 → 하한 조건이면 due_time 없는 공고도 포함
+    if not isinstance(cond, dict) or len(cond) != 1:
+        raise ValueError(f"지원하지 않는 due_ts 조건: {cond!r}")
+    (op, ts), = cond.items()
+    if op not in ("$gt", "$gte", "$lt", "$lte"):
+        raise ValueError(f"지원하지 않는 due_ts 조건: {cond!r}")
+    bound = {"due_time": {op: datetime.fromtimestamp(ts, tz=timezone.utc)}}
+    return {"$or": [{"due_time": None}, bound]} if op in ("$gt", "$gte") else bound
+
+def where_to_mongo(where: dict | None) -> dict:
+    """build_where/live_where가 만든 Chroma where 절 → 같은 공고를 고르는 Mongo filter. 모르는 키/연산자면 ValueError"""
+    if not where:
+        return {}
+    out = []
+    for key, cond in where.items():
+        if key in ("$and", "$or"):
+            out.append({key: [where_to_mongo(c) for c in cond]})
+        elif key == "due_ts":
+            out.append(_due_ts_to_mongo(cond))
+        elif key in _MONGO_FIELDS:
+            if isinstance(cond, dict) and not set(cond) <= _MONGO_OPS:
+                raise ValueError(f"지원하지 않는 연산자: {cond!r}")
+            out.append({_MONGO_FIELDS[key]: cond})
+        else:
+            raise ValueError(f"Mongo 필드로 바꿀 수 없는 키: {key}")
+    return out[0] if len(out) == 1 else {"$and": out}
+
 # ===== quick test =====
 if __name__ == "__main__":
     samples = [
@@ -0,0 +1,357 @@
+# utils/where_rules.py
+# LLM 없이 규칙(지명 사전 + 직군 키워드 + 연봉 정규식)으로 where 절을 만드는 추출기
+# - 모든 토큰을 설명할 수 있으면(신뢰도 충분) 그대로 사용
+# - 모르는 단어가 섞여 있으면 build_where_from_llm_async(Gemini)로 폴백
+import re
+import sys
+from dataclasses import dataclass, field
+from typing import Dict, List, Optional, Set, Tuple
+
+from settings import WHERE_EXTRACTOR_MODE, WHERE_RULES_MIN_CONFIDENCE
+from utils.where_minimal import (
+    BUCKET_SET, _labels_from_free_text, _labels_from_range, _salary_re,
+    build_where_from_llm_async,
+)
+
+# ===== 시/도 (메타데이터 location 값 → 별칭) =====
+LOCATION_ALIASES: Dict[str, List[str]] = {
+    "서울": ["서울", "서울시", "서울특별시"],
+    "경기": ["경기", "경기도"],
+    "인천": ["인천", "인천시", "인천광역시"],
+    "부산": ["부산", "부산시", "부산광역시"],
+    "대구": ["대구", "대구시", "대구광역시"],
+    "대전": ["대전", "대전시", "대전광역시"],
+    "광주": ["광주", "광주광역시"],
+    "울산": ["울산", "울산시", "울산광역시"],
+    "세종": ["세종", "세종시", "세종특별자치시"],
+    "강원": ["강원", "강원도", "강원특별자치도"],
+    "충북": ["충북", "충청북도"],
+    "충남": ["충남", "충청남도"],
+    "전북": ["전북", "전라북도", "전북특별자치도"],
+    "전남": ["전남", "전라남도"],
+    "경북": ["경북", "경상북도"],
+    "경남": ["경남", "경상남도"],
+    "제주": ["제주", "제주도", "제주특별자치도"],
+}
+
+# ===== 시/군/구 (메타데이터 district 값) =====
+DISTRICTS_BY_LOCATION: Dict[str, List[str]] = {
+    "서울": [
+        "종로구", "중구", "용산구", "성동구", "광진구", "동대문구", "중랑구", "성북구", "강북구",
+        "도봉구", "노원구", "은평구", "서대문구", "마포구", "양천구", "강서구", "구로구", "금천구",
+        "영등포구", "동작구", "관악구", "서초구", "강남구", "송파구", "강동구",
+    ],
+    "부산": [
+        "중구", "서구", "동구", "영도구", "부산진구", "동래구", "남구", "북구", "해운대구",
+        "사하구", "금정구", "강서구", "연제구", "수영구", "사상구", "기장군",
+    ],
+    "대구": ["중구", "동구", "서구", "남구", "북구", "수성구", "달서구", "달성군", "군위군"],
+    "인천": ["중구", "동구", "미추홀구", "연수구", "남동구", "부평구", "계양구", "서구", "강화군", "옹진군"],
+    "광주": ["동구", "서구", "남구", "북구", "광산구"],
+    "대전": ["동구", "중구", "서구", "유성구", "대덕구"],
+    "울산": ["중구", "남구", "동구", "북구", "울주군"],
+    "경기": [
+        "수원시", "성남시", "의정부시", "안양시", "부천시", "광명시", "평택시", "동두천시", "안산시",
+        "고양시", "과천시", "구리시", "남양주시", "오산시", "시흥시", "군포시", "의왕시", "하남시",
+        "용인시", "파주시", "이천시", "안성시", "김포시", "화성시", "광주시", "양주시", "포천시",
+        "여주시", "연천군", "가평군", "양평군",
+        # 일반구
+        "장안구", "권선구", "팔달구", "영통구", "수정구", "중원구", "분당구", "만안구", "동안구",
+        "상록구", "단원구", "덕양구", "일산동구", "일산서구", "처인구", "기흥구", "수지구",
+    ],
+    "강원": ["춘천시", "원주시", "강릉시", "동해시", "태백시", "속초시", "삼척시"],
+    "충북": ["청주시", "충주시", "제천시", "상당구", "서원구", "흥덕구", "청원구"],
+    "충남": ["천안시", "공주시", "보령시", "아산시", "서산시", "논산시", "계룡시", "당진시", "동남구", "서북구"],
+    "전북": ["전주시", "군산시", "익산시", "정읍시", "남원시", "김제시", "완산구", "덕진구"],
+    "전남": ["목포시", "여수시", "순천시", "나주시", "광양시"],
+    "경북": ["포항시", "경주시", "김천시", "안동시", "구미시", "영주시", "영천시", "상주시", "문경시", "경산시"],
+    "경남": [
+        "창원시", "진주시", "통영시", "사천시", "김해시", "밀양시", "거제시", "양산시",
+        "의창구", "성산구", "마산합포구", "마산회원구", "진해구",
+    ],
+    "제주": ["제주시", "서귀포시"],
+}
+
+# 자주 쓰이는 업무지구/동네 → 구
+DISTRICT_LANDMARKS: Dict[str, str] = {
+    "판교": "분당구", "여의도": "영등포구", "테헤란로": "강남구", "역삼": "강남구", "삼성동": "강남구",
+    "가산": "금천구", "가산디지털단지": "금천구", "구로디지털단지": "구로구", "성수": "성동구",
+    "성수동": "성동구", "광화문": "종로구", "상암": "마포구", "상암동": "마포구", "마곡": "강서구",
+    "문정": "송파구", "잠실": "송파구", "홍대": "마포구", "을지로": "중구", "센텀": "해운대구",
+}
+
+# ===== 직군 키워드 → bucket (여러 bucket이면 애매한 키워드) =====
+BUCKET_LEXICON: Dict[str, Tuple[str, ...]] = {}
+
+def _add_bucket_keywords(buckets: Tuple[str, ...], *words: str) -> None:
+    for w in words:
+        BUCKET_LEXICON[w] = buckets
+
+_add_bucket_keywords(("backend",),
+    "백엔드", "백앤드", "backend", "back-end", "서버", "서버개발", "spring", "스프링", "springboot",
+    "django", "장고", "nestjs", "node", "nodejs", "node.js", "노드", "java", "자바", "kotlin", "코틀린",
+    "go", "golang", "php", "rails", "fastapi", "jsp")
+_add_bucket_keywords(("frontend",),
+    "프론트", "프론트엔드", "프런트", "프런트엔드", "frontend", "front-end", "front", "react", "리액트",
+    "vue", "뷰", "angular", "javascript", "자바스크립트", "js", "typescript", "타입스크립트", "ts",
+    "nextjs", "next.js", "퍼블리셔", "웹퍼블리셔", "퍼블리싱")
+_add_bucket_keywords(("data",),
+    "데이터엔지니어", "데이터분석", "데이터분석가", "분석가", "sql", "빅데이터", "bi", "etl")
+_add_bucket_keywords(("ai_ml",),
+    "ai", "인공지능", "머신러닝", "딥러닝", "ml", "mlops", "llm", "nlp", "자연어처리", "컴퓨터비전", "비전")
+_add_bucket_keywords(("security",), "보안", "정보보안", "security", "모의해킹", "해킹", "침해대응")
+_add_bucket_keywords(("design",),
+    "디자인", "디자이너", "design", "ui", "ux", "uiux", "ui/ux", "그래픽", "브랜딩", "일러스트", "bx")
+_add_bucket_keywords(("product",),
+    "기획", "기획자", "서비스기획", "pm", "po", "프로덕트", "product", "프로덕트매니저")
+_add_bucket_keywords(("marketing",),
+    "마케팅", "마케터", "marketing", "광고", "퍼포먼스마케팅", "브랜드마케팅", "콘텐츠마케팅", "그로스")
+_add_bucket_keywords(("sales",), "영업", "세일즈", "sales", "영업관리", "b2b영업")
+_add_bucket_keywords(("cs",), "cs", "고객지원", "고객상담", "상담", "고객센터", "cx", "고객서비스")
+_add_bucket_keywords(("legal",), "법무", "변호사", "legal", "컴플라이언스", "특허")
+_add_bucket_keywords(("logistics",), "물류", "유통", "배송", "scm", "구매", "물류관리")
+_add_bucket_keywords(("hr",), "인사", "hr", "채용담당", "리크루터", "노무", "hrd", "hrm")
+_add_bucket_keywords(("manufacturing",), "생산", "제조", "품질", "공정", "생산관리", "설비", "품질관리")
+_add_bucket_keywords(("strategy_exec",),
+    "전략", "경영", "경영기획", "사업개발", "경영지원", "재무", "회계", "컨설팅", "사업전략", "전략기획")
+_add_bucket_keywords(("video_editing",),
+    "영상", "영상편집", "편집자", "유튜브", "모션", "모션그래픽", "촬영", "pd")
+# 애매한 키워드 → 여러 bucket ($in)
+_add_bucket_keywords(("data", "ai_ml"), "데이터", "data", "데이터사이언티스트", "데이터사이언스")
+_add_bucket_keywords(("backend", "data", "ai_ml"), "python", "파이썬")
+_add_bucket_keywords(("backend", "frontend"), "풀스택", "fullstack", "full-stack", "웹개발", "웹개발자")
+
+assert all(b in BUCKET_SET for bs in BUCKET_LEXICON.values() for b in bs)
+
+# ===== where 키를 만들지 않는 일반 단어 =====
+STOPWORDS: Set[str] = {
+    "공고", "채용", "채용공고", "구인", "추천", "추천해줘", "해줘", "알려줘", "보여줘", "찾아줘", "찾아",
+    "있어", "있나", "있니", "있는", "없어", "포지션", "자리", "일자리", "직무", "직군", "업무",
+    "개발", "개발자", "엔지니어", "엔지니어링", "engineer", "developer", "dev", "신입", "경력", "주니어",
+    "시니어", "인턴", "정규직", "계약직", "연봉", "급여", "회사", "기업", "스타트업", "일할", "만한", "하는",
+    "버는", "받는", "원하는", "싶어", "좋은", "근처", "일대", "쪽", "관련", "지역", "부근", "주변",
+    "또는", "혹은", "및", "이나", "나", "랑", "와", "과", "그리고", "에서", "분야",
+}
+
+# 토큰 끝의 조사/어미 (긴 것부터 떼어냄)
+_SUFFIXES = sorted(
+    ["이나", "에서", "으로", "이랑", "하고", "까지", "부터", "에는", "쪽", "나", "의", "에", "은", "는",
+     "이", "가", "을", "를", "랑", "와", "과", "도", "만", "로"],
+    key=len, reverse=True,
+)
+
+_token_re = re.compile(r"[0-9a-z][0-9a-z.+#/\-]*|[가-힣]+")
+_salary_range_re = re.compile(r"(\d{3,5})\s*만?\s*원?\s*[~\-]\s*(\d{3,5})\s*만\s*원?")
+# 금액 하나: 단위(만/원)가 붙었거나 검색어에 연봉/급여가 있을 때만 연봉으로 본다
+# ('2024', '서울 백엔드 1000'의 숫자는 연도/인원일 수 있음 → 모르는 토큰으로 남겨 LLM 폴백)
+_salary_unit_re = re.compile(r"(\d{3,4})\s*(?:만\s*원?|원)")
+_salary_keyword_re = re.compile(r"연봉|급여")
+# '4천', '3천6백만원' → '4000만', '3600만원'
+_cheon_re = re.compile(r"(?<!\d)(\d)\s*천\s*(?:(\d)\s*백)?\s*(?:만)?")
+
+# ===== 사전 인덱스 =====
+_LOCATION_BY_ALIAS: Dict[str, str] = {a: loc for loc, aliases in LOCATION_ALIASES.items() for a in aliases}
+_DISTRICT_BY_ALIAS: Dict[str, str] = {}
+_AMBIGUOUS_ALIASES: Set[str] = set()
+
+def _build_district_aliases() -> None:
+    names = {d for ds in DISTRICTS_BY_LOCATION.values() for d in ds}
+    stems: Dict[str, Set[str]] = {}
+    for name in names:
+        _DISTRICT_BY_ALIAS[name] = name
+        stem = name[:-1]
+        # '중', '동' 같은 한 글자 어간은 오탐이 많아 제외
+        if len(stem) >= 2:
+            stems.setdefault(stem, set()).add(name)
+    for stem, targets in stems.items():
+        if stem in _LOCATION_BY_ALIAS:
+            # '광주'(광역시) vs '광주시'(경기)처럼 시/도와 겹치면 시/도로 본다
+            continue
+        if len(targets) == 1:
+            _DISTRICT_BY_ALIAS[stem] = next(iter(targets))
+        else:
+            _AMBIGUOUS_ALIASES.add(stem)
+    for alias, name in DISTRICT_LANDMARKS.items():
+        _DISTRICT_BY_ALIAS.setdefault(alias, name)
+
+_build_district_aliases()
+
+_VOCAB: Set[str] = (
+    set(_LOCATION_BY_ALIAS) | set(_DISTRICT_BY_ALIAS) | set(BUCKET_LEXICON) | STOPWORDS | _AMBIGUOUS_ALIASES
+)
+_MAX_WORD = max(len(w) for w in _VOCAB)
+
+@dataclass
+class RuleResult:
+    where: dict
+    confidence: float                                   # 설명된 토큰 비율 (0~1)
+    unknown: List[str] = field(default_factory=list)    # 사전에 없는 토큰
+
+    @property
+    def confident(self) -> bool:
+        return self.confidence >= WHERE_RULES_MIN_CONFIDENCE
+
+# ===== 토큰 분해 =====
+def _segment(token: str) -> Optional[List[str]]:
+    """사전 단어들로 토큰을 완전히 나눌 수 있으면 단어 목록, 아니면 None (최장 일치)"""
+    if token in _VOCAB:
+        return [token]
+    if token in _SUFFIXES:
+        return []           # 'spring으로'처럼 영문 뒤에 떨어져 나온 조사
+    for suf in _SUFFIXES:
+        if token.endswith(suf) and token[:-len(suf)] in _VOCAB:
+            return [token[:-len(suf)]]
+    if not ("가" <= token[0] <= "힣"):
+        return None
+    # 붙여 쓴 합성어: '데이터엔지니어', '강남구백엔드'
+    out, i = [], 0
+    while i < len(token):
+        for j in range(min(len(token), i + _MAX_WORD), i, -1):
+            if token[i:j] in _VOCAB:
+                out.append(token[i:j])
+                i = j
+                break
+        else:
+            rest = token[i:]
+            if rest in _SUFFIXES and out:
+                return out
+            return None
+    return out
+
+def _salary_labels(text: str) -> Tuple[List[str], str]:
+    """연봉 표현을 200만원 단위 라벨로 바꾸고, 해당 구간을 지운 텍스트를 함께 반환"""
+    text = _cheon_re.sub(lambda c: f"{int(c.group(1)) * 1000 + int(c.group(2) or 0) * 100}만", text)
+    m = _salary_range_re.search(text)
+    if m:
+        lo, hi = int(m.group(1)) * 10_000, int(m.group(2)) * 10_000
+        return _labels_from_range(min(lo, hi), max(lo, hi)), text[:m.start()] + " " + text[m.end():]
+    unit = _salary_unit_re.search(text)
+    if unit is not None or _salary_keyword_re.search(text):
+        # 단위가 붙은 금액이 있으면 그 위치부터 (앞쪽의 다른 숫자를 금액으로 잡지 않도록)
+        m = _salary_re.search(text, unit.start() if unit is not None else 0)
+        if m:
+            return _labels_from_free_text(text[m.start():]), text[:m.start()] + " " + text[m.end():]
+    return [], text
+
+def _eq_or_in(key: str, values: List[str]) -> dict:
+    values = list(dict.fromkeys(values))
+    return {key: values[0]} if len(values) == 1 else {key: {"$in": values}}
+
+# ===== 추출기 =====
+def extract_where(query: str) -> RuleResult:
+    """
+    사전/정규식만으로 where 절을 만든다 (LLM 호출 없음).
+    build_where_from_llm과 같은 키(bucket, location, district, salary_bucket_2m_label)를 쓴다.
+    """
+    text = (query or "").lower()
+    labels, text = _salary_labels(text)
+
+    locations: List[str] = []
+    districts: List[str] = []
+    strong: List[str] = []     # 단일 bucket 키워드
+    weak: List[str] = []       # 애매한(복수 bucket) 키워드
+    unknown: List[str] = []
+    total = 1 if labels else 0
+    known = total
+
+    for tok in _token_re.findall(text):
+        total += 1
+        words = _segment(tok)
+        if words is None or any(w in _AMBIGUOUS_ALIASES for w in words):
+            unknown.append(tok)
+            continue
+        known += 1
+        for w in words:
+            if w in _LOCATION_BY_ALIAS:
+                locations.append(_LOCATION_BY_ALIAS[w])
+            elif w in _DISTRICT_BY_ALIAS:
+                districts.append(_DISTRICT_BY_ALIAS[w])
+            elif w in BUCKET_LEXICON:
+                bs = BUCKET_LEXICON[w]
+                (strong if len(bs) == 1 else weak).extend(bs)
+
+    conds = []
+    buckets = strong or weak
+    if buckets:
+        conds.append(_eq_or_in("bucket", buckets))
+    if locations:
+        conds.append(_eq_or_in("location", locations))
+    if districts:
+        conds.append(_eq_or_in("district", districts))
+    if labels:
+        conds.append(_eq_or_in("salary_bucket_2m_label", labels))
+
+    if not conds:
+        where = {}
+    elif len(conds) == 1:
+        where = conds[0]
+    else:
+        where = {"$and": conds}
+
+    confidence = (known / total) if total else 1.0
+    return RuleResult(where=where, confidence=confidence, unknown=unknown)
+
+# ===== 통계 (LLM 없이 해결한 비율) =====
+class WhereRuleStats:
+    def __init__(self):
+        self.local = 0       # 규칙으로 해결
+        self.llm = 0         # LLM 폴백
+        self.shadow = 0      # report 모드: 규칙이 확신한 쿼리 수
+        self.agree = 0       # report 모드: 그중 LLM 결과와 같았던 수
+
+    def snapshot(self) -> Dict[str, float]:
+        total = self.local + self.llm
+        return {
+            "mode": WHERE_EXTRACTOR_MODE,
+            "queries": total,
+            "local": self.local,
+            "llm": self.llm,
+            "local_ratio": (self.local / total) if total else 0.0,
+            "shadow_confident": self.shadow,
+            "shadow_agree_ratio": (self.agree / self.shadow) if self.shadow else 0.0,
+        }
+
+stats = WhereRuleStats()
+
+async def build_where(query: str) -> dict:
+    """
+    검색 경로의 where 빌더 (WHERE_EXTRACTOR_MODE)
+    - hybrid: 규칙 추출기 우선, 신뢰도가 낮을 때만 Gemini
+    - llm: 항상 Gemini (기존 동작)
+    - report: 항상 Gemini 결과를 쓰되, 규칙 추출기가 해결했을지/일치했을지를 집계
+    """
+    if WHERE_EXTRACTOR_MODE == "llm":
+        stats.llm += 1
+        return await build_where_from_llm_async(query)
+
+    res = extract_where(query)
+    if WHERE_EXTRACTOR_MODE == "report":
+        where = await build_where_from_llm_async(query)
+        stats.llm += 1
+        if res.confident:
+            stats.shadow += 1
+            stats.agree += int(res.where == where)
+        return where
+
+    if res.confident:
+        stats.local += 1
+        return res.where
+    stats.llm += 1
+    return await build_where_from_llm_async(query)
+
+# ===== report: 쿼리 로그(한 줄에 하나)에서 LLM 없이 해결되는 비율 =====
+# python -m utils.where_rules queries.txt   (파일 생략 시 stdin)
+if __name__ == "__main__":
+    src = open(sys.argv[1], encoding="utf-8") if len(sys.argv) > 1 else sys.stdin
+    n = resolved = 0
+    for line in src:
+        q = line.strip()
+        if not q:
+            continue
+        n += 1
+        r = extract_where(q)
+        resolved += int(r.confident)
+        mark = "LOCAL" if r.confident else "LLM  "
+        print(f"{mark} {r.confidence:.2f} {q} => {r.where} {r.unknown or ''}")
+    if n:
+        print(f"\nresolved without LLM: {resolved}/{n} ({resolved / n:.1%})")